@@ -0,0 +1,737 @@
+#!/usr/bin/env python3
+"""Benchmarks for the progress pipeline (scripts/generate_progress.py).
+
+Subcommands:
+  analyzer   Single-pass file analyzer vs the legacy multi-pass heuristics on large synthetic files.
+  scale      Build a synthetic practice tree (topics x slots x files) and time every pipeline phase;
+             also checks that a warm analysis cache matches --no-cache at every analysis level.
+  memory     Retained memory of the collected slots/file statuses vs the legacy dict-backed layout.
+  aggregate  Single-pass topic aggregation (and incremental updates) at 10k topics vs legacy per-topic rescans.
+  rewrite    Compiled single-pass migrate rewriter (serial and parallel) vs the legacy per-pattern split/join.
+  importtime Start-up cost of generate_progress (python -X importtime) and of a bare CLI invocation;
+             exits 1 when --budget-ms is exceeded or a deferred module is imported eagerly again
+             (profiling modules are also checked after a plain CLI run).
+
+Every subcommand prints a JSON document so results can be stored and compared across commits:
+
+  python scripts/benchmark_progress.py analyzer --functions 300 --depth 8 > bench.json
+  python scripts/benchmark_progress.py scale --topics 50 --slots 40 --files 2 --output scale.json
+  python scripts/benchmark_progress.py importtime --budget-ms 80
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import dataclasses
+import gc
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import generate_progress as gp  # noqa: E402
+import migrate_tests_to_practices as migrate  # noqa: E402
+from text_rewriter import map_files, read_text  # noqa: E402
+
+# ------------------------------ Synthetic Sources ---------------------------- #
+
+def synthetic_source(functions: int, depth: int, status: str = 'RESOLVED', branches: int = 3) -> str:
+    """Build a python file with `functions` top-level defs, each nesting `depth` inner defs."""
+    lines = [f'# {status}: synthetic benchmark file', '']
+    for f in range(functions):
+        indent = ''
+        for d in range(depth + 1):
+            name = f'fn_{f}' if d == 0 else f'inner_{f}_{d}'
+            lines.append(f'{indent}def {name}(x):')
+            indent += '    '
+            if d % 2 == 0:
+                lines.append(f'{indent}"""Docstring for {name}."""')
+            for b in range(branches):
+                lines.append(f'{indent}if x > {b} and x < {b + 10}:')
+                lines.append(f'{indent}    x = [y for y in range(x)][-1] if x else 0')
+            lines.append(f'{indent}# comment line')
+        lines.append(f'{indent}return x')
+        lines.append('')
+    return '\n'.join(lines) + '\n'
+
+STATUS_CHOICES = ('TODO', 'RESOLVED', 'VALIDATED', 'NONE')
+
+def parse_status_mix(spec: str) -> Dict[str, float]:
+    """Parse 'TODO=5,RESOLVED=3,VALIDATED=1,NONE=1' into normalized weights."""
+    weights: Dict[str, float] = {}
+    for part in spec.split(','):
+        key, _, value = part.partition('=')
+        key = key.strip().upper()
+        if key not in STATUS_CHOICES:
+            raise SystemExit(f'unknown status in --status-mix: {key}')
+        weights[key] = float(value)
+    total = sum(weights.values())
+    if total <= 0:
+        raise SystemExit('--status-mix weights must sum to a positive value')
+    return {k: v / total for k, v in weights.items()}
+
+def build_tree(root: str, topics: int, slots: int, files: int, functions: int, depth: int,
+               status_mix: Dict[str, float], fill: float = 0.9, seed: int = 0) -> Dict[str, int]:
+    """Materialize a synthetic practices tree; returns size statistics.
+
+    Each topic gets `slots` slot indices of which roughly `fill` are created
+    (the rest are gaps that count toward capacity). Every created slot has one
+    markdown file and `files` python files whose leading status line is drawn
+    from status_mix.
+    """
+    rng = random.Random(seed)
+    statuses, weights = zip(*status_mix.items())
+    stats = {"topics": topics, "slots": 0, "python_files": 0, "bytes": 0}
+    for t in range(topics):
+        topic = f'Topic{t:04d}'
+        for idx in range(1, slots + 1):
+            if idx != slots and rng.random() > fill:
+                continue
+            slot_dir = os.path.join(root, topic, str(idx))
+            os.makedirs(slot_dir)
+            with open(os.path.join(slot_dir, f'practice-topic{t}-{idx}.md'), 'w', encoding='utf-8') as mf:
+                mf.write(f'# {topic} Practice {idx}\n')
+            stats["slots"] += 1
+            for k in range(files):
+                status = rng.choices(statuses, weights)[0]
+                source = synthetic_source(functions, depth, status=status)
+                if status == 'NONE':
+                    source = source.split('\n', 1)[1]
+                name = f'practice-topic{t}-{idx}.py' if k == 0 else f'practice-topic{t}-{idx}-{k}.py'
+                with open(os.path.join(slot_dir, name), 'w', encoding='utf-8') as pf:
+                    pf.write(source)
+                stats["python_files"] += 1
+                stats["bytes"] += len(source.encode('utf-8'))
+    return stats
+
+# {T}/{Ts}/{t}/{ts} stand for the keyword the migration renames (filled in from its rule table at runtime), so
+# this file holds none of the phrases migrate_tests_to_practices rewrites when it scans scripts/
+REWRITE_LINE_TEMPLATES = (
+    '# {topic} {T} {n}',
+    '# {T} {n}: {Ts} Index and {T} Structure',
+    '## {T} Cases',
+    '- {T} Cases: see {Ts} Index and {T} Structure',
+    'Available {Ts} are listed below; {n} {ts} per topic.',
+    'How to Use These {Ts}: run each {T} once.',
+    'Read {ts}/{topic}/{n}/README.md before starting.',
+    'Plain narrative line without any keyword {n}.',
+    'pytest and unittest are left alone, as is lowercase {t} {n}.',
+    '',
+)
+
+def rewrite_keywords() -> Dict[str, str]:
+    word = re.sub(r'\\b', '', migrate.HEADING_WORD_RE.pattern)
+    return {"T": word, "Ts": word + 's', "t": word.lower(), "ts": word.lower() + 's'}
+
+def synthetic_markdown(lines: int, rng: random.Random, topic: str = 'Topic') -> str:
+    """Markdown mixing every migrate rule, 'Test Cases' lines and plain text.
+
+    No trailing newline: the legacy rewrite dropped it (the compiled one keeps it), so outputs only compare equal without one.
+    """
+    keywords = rewrite_keywords()
+    return '\n'.join(rng.choice(REWRITE_LINE_TEMPLATES).format(topic=topic, n=rng.randint(1, 40), **keywords)
+                     for _ in range(lines)).rstrip('\n')
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# Modules generate_progress imports only inside the modes that need them; none may be loaded by a bare import.
+DEFERRED_MODULES = ('argparse', 'concurrent.futures', 'cProfile', 'csv', 'email.utils', 'gzip', 'hashlib', 'heapq',
+                    'http.server', 'pstats', 'resolved_history', 'shutil', 'signal', 'sqlite3', 'subprocess', 'tempfile')
+# Loaded only by --profile/--profile-dump; a plain CLI invocation (main() -> execute()) must not import them either.
+PROFILING_MODULES = ('cProfile', 'pstats')
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+def parse_importtime(stderr: str, module: str) -> Tuple[int, Dict[str, int]]:
+    """Cumulative microseconds of `module` and of each of its direct imports from -X importtime output.
+
+    A module's line is printed once its import finishes, so its direct imports are the
+    lines one level deeper that precede it (back to the previous line at its own level).
+    """
+    entries = []
+    for line in stderr.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if m:
+            entries.append((len(m.group(3)) // 2, m.group(4), int(m.group(2))))
+    for i, (depth, name, cumulative) in enumerate(entries):
+        if name != module:
+            continue
+        children: Dict[str, int] = {}
+        for child_depth, child, child_cumulative in reversed(entries[:i]):
+            if child_depth <= depth:
+                break
+            if child_depth == depth + 1:
+                children[child] = child_cumulative
+        return cumulative, children
+    raise SystemExit(f'importtime: no entry for {module!r} in the -X importtime output')
+
+# ------------------------------ Legacy Reference ----------------------------- #
+
+def legacy_file_status(path: str, content: str) -> gp.FileStatus:
+    """Multi-pass heuristics as implemented before the single-pass analyzer (reference only)."""
+    leading = gp.first_non_empty_line(content)
+    match = gp.STATUS_PREFIX_RE.match(leading)
+    status = match.group(1) if match else "UNCATEGORIZED"
+    meaningful = gp.count_meaningful_lines(content)
+    warnings: List[str] = []
+    if status == "UNCATEGORIZED":
+        warnings.append("missing_status")
+    if status in {"RESOLVED", "VALIDATED"}:
+        if meaningful < 3:
+            warnings.append("low_implementation_loc")
+        if 'TODO' in content:
+            warnings.append("todo_leftover")
+        if re.search(r"^\s*pass\s*$", content, re.MULTILINE):
+            warnings.append("pass_leftover")
+        try:
+            tree = ast.parse(content, filename=path)
+            for node in ast.walk(tree):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    doc = ast.get_docstring(node)
+                    if gp.DOCSTRING_ENFORCE and not doc:
+                        warnings.append(f"missing_docstring:{node.name}")
+                    complexity = 1
+                    for child in ast.walk(node):
+                        if isinstance(child, (ast.If, ast.For, ast.While, ast.Try, ast.With, ast.IfExp)):
+                            complexity += 1
+                        elif isinstance(child, (ast.BoolOp, ast.ListComp, ast.DictComp, ast.SetComp, ast.GeneratorExp, ast.ExceptHandler)):
+                            complexity += 1
+                    if complexity > gp.COMPLEXITY_THRESHOLD:
+                        warnings.append(f"high_complexity:{node.name}:{complexity}")
+        except SyntaxError as e:
+            warnings.append(f"syntax_error:{e.lineno}")
+    return gp.FileStatus(path=path, status=status, meaningful_loc=meaningful, warnings=warnings)
+
+def legacy_aggregate(topics: List[str], test_slots: List[gp.TestSlot]) -> Tuple[Dict[str, gp.TopicStats], gp.Aggregate]:
+    """Per-topic rescans as implemented before StatsAccumulator: O(topics x slots) (reference only)."""
+    topic_stats: Dict[str, gp.TopicStats] = {}
+    for topic in topics:
+        topic_slots = [s for s in test_slots if s.topic == topic]
+        capacity = max(s.index for s in topic_slots) if topic_slots else 0
+        created_count = sum(1 for s in topic_slots if s.created)
+        python_file_count = sum(1 for s in topic_slots if s.python_files)
+        resolved_count = sum(1 for s in topic_slots if (s.file_status and s.file_status.status in {"RESOLVED", "VALIDATED"}))
+        validated_count = sum(1 for s in topic_slots if (s.file_status and s.file_status.status == "VALIDATED"))
+        topic_stats[topic] = gp.TopicStats(topic=topic, capacity=capacity, created=created_count, python_files=python_file_count,
+                                           resolved=resolved_count, validated=validated_count, remaining=max(capacity - created_count, 0))
+    agg = gp.Aggregate(
+        created=sum(t.created for t in topic_stats.values()),
+        python_files=sum(t.python_files for t in topic_stats.values()),
+        resolved=sum(t.resolved for t in topic_stats.values()),
+        validated=sum(t.validated for t in topic_stats.values()),
+    )
+    return topic_stats, agg
+
+def legacy_rewrite_text(original: str) -> str:
+    """migrate_tests_to_practices content rewrite before MultiRewriter: one split/join per rule (reference only)."""
+    lines = original.splitlines()
+    for i, line in enumerate(lines):
+        if migrate.HEADING_TEST_RE.match(line):
+            lines[i] = re.sub(r'\bTest\b', 'Practice', line, count=1)
+    updated = '\n'.join(lines)
+    for rx, repl in migrate.WORD_REPLACEMENTS:
+        updated = '\n'.join(ln if 'Test Cases' in ln else rx.sub(repl, ln) for ln in updated.splitlines())
+    for rx, repl in migrate.PATH_REPLACEMENTS:
+        updated = rx.sub(repl, updated)
+    return updated
+
+def check_rewrite_tree() -> Dict[str, int]:
+    """Compiled vs legacy rewrite of every text file the migration visits in this checkout.
+
+    The legacy script only wrote files a rule changed, and those lost their
+    final newline (split/join); that is the one difference accepted here, any
+    other line that differs aborts the benchmark.
+    """
+    counts = {"files": 0, "rewritten": 0, "identical": 0, "line_endings_only": 0}
+    for path in migrate.content_paths():
+        original = read_text(path) if migrate.is_text_file(path) else None
+        if original is None:
+            continue
+        compiled = migrate.rewrite_text(original)
+        legacy = legacy_rewrite_text(original)
+        if legacy.splitlines() == original.splitlines():
+            legacy = original  # no rule fired: the legacy script left the file alone
+        counts["files"] += 1
+        counts["rewritten"] += compiled != original
+        if compiled == legacy:
+            counts["identical"] += 1
+        elif compiled.splitlines() == legacy.splitlines():
+            counts["line_endings_only"] += 1
+        else:
+            raise SystemExit(f'rewrite mismatch on {path}: compiled rewriter differs from the legacy per-pattern passes')
+    return counts
+
+def check_cache_levels(paths: List[str]) -> Dict[str, int]:
+    """Warm-cache results at each analysis level vs an uncached analysis at that level (warnings per level).
+
+    The cache is filled at full first, so light and status are served from
+    deeper entries; any difference from --no-cache aborts the benchmark.
+    """
+    saved = gp.ANALYSIS_LEVEL
+    cache = gp.AnalysisCache(os.devnull)  # in memory only, never saved
+    counts: Dict[str, int] = {}
+    try:
+        gp.ANALYSIS_LEVEL = 'full'
+        gp.evaluate_files(paths, cache=cache)
+        for level in gp.ANALYSIS_LEVELS[::-1]:
+            gp.ANALYSIS_LEVEL = level
+            cache.begin_run()
+            cached = gp.evaluate_files(paths, cache=cache)
+            if cache.misses:
+                raise SystemExit(f'cache level check: {cache.misses} misses at {level} on a warm cache')
+            uncached = gp.evaluate_files(paths)
+            if cached != uncached:
+                raise SystemExit(f'cache level mismatch at {level}: warm-cache results differ from an uncached analysis')
+            counts[level] = sum(len(fs.warnings) for fs in uncached)
+    finally:
+        gp.ANALYSIS_LEVEL = saved
+    return counts
+
+@dataclasses.dataclass
+class LegacyFileStatus:
+    """FileStatus layout before slotted storage: per-instance __dict__ (reference only)."""
+    path: str
+    status: str
+    meaningful_loc: int
+    warnings: List[str]
+    smoke: Any = None
+
+@dataclasses.dataclass
+class LegacyTestSlot:
+    topic: str
+    index: int
+    created: bool
+    python_files: List[str]
+    file_status: Optional[LegacyFileStatus]
+    all_statuses: List[LegacyFileStatus]
+
+def fresh_str(s: str) -> str:
+    """An equal but distinct string object (what a regex group / f-string used to produce per file)."""
+    return (s + ' ')[:-1]
+
+def to_legacy(slots: List[gp.TestSlot], file_statuses: List[gp.FileStatus]) -> Tuple[List[LegacyTestSlot], List[LegacyFileStatus]]:
+    """Rebuild the pipeline result with the legacy layout: dict-backed instances, uninterned codes."""
+    mapped: Dict[int, LegacyFileStatus] = {}
+    for fs in file_statuses:
+        mapped[id(fs)] = LegacyFileStatus(
+            path=fs.path,
+            status=fresh_str(fs.status),
+            meaningful_loc=fs.meaningful_loc,
+            warnings=[fresh_str(w) if ':' in w else w for w in fs.warnings],
+        )
+    legacy_slots = [
+        LegacyTestSlot(
+            topic=slot.topic, index=slot.index, created=slot.created, python_files=slot.python_files,
+            file_status=mapped[id(slot.file_status)] if slot.file_status else None,
+            all_statuses=[mapped[id(fs)] for fs in slot.all_statuses],
+        )
+        for slot in slots
+    ]
+    return legacy_slots, [mapped[id(fs)] for fs in file_statuses]
+
+# ------------------------------ Timing Helpers ------------------------------- #
+
+class PhaseTimer:
+    """Accumulate wall-clock seconds per named phase."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    def run(self, name: str, fn: Callable[[], Any]) -> Any:
+        t0 = time.perf_counter()
+        result = fn()
+        self.phases[name] = round(self.phases.get(name, 0.0) + time.perf_counter() - t0, 6)
+        return result
+
+def traced(fn: Callable[[], Any]) -> Tuple[Any, int, int]:
+    """Run fn under tracemalloc; returns (result, retained bytes, peak bytes) relative to the start."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current - base, peak - base
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+# ------------------------------ Subcommands ---------------------------------- #
+
+def bench_analyzer(args: argparse.Namespace) -> Dict[str, Any]:
+    gp.DOCSTRING_ENFORCE = True
+    gp.COMPLEXITY_THRESHOLD = args.complexity_threshold
+    content = synthetic_source(args.functions, args.depth, branches=args.branches)
+    path = '<synthetic>'
+    legacy = legacy_file_status(path, content)
+    current = gp.analyze_source(path, content)
+    if legacy != current:
+        raise SystemExit('analyzer mismatch: single-pass result differs from legacy heuristics')
+    legacy_s = best_of(lambda: legacy_file_status(path, content), args.repeat)
+    current_s = best_of(lambda: gp.analyze_source(path, content), args.repeat)
+    return {
+        "benchmark": "analyzer",
+        "params": {"functions": args.functions, "depth": args.depth, "branches": args.branches, "repeat": args.repeat},
+        "file": {"bytes": len(content.encode('utf-8')), "lines": content.count('\n'), "warnings": len(current.warnings)},
+        "legacy_s": round(legacy_s, 6),
+        "single_pass_s": round(current_s, 6),
+        "speedup": round(legacy_s / current_s, 2) if current_s else None,
+    }
+
+def bench_scale(args: argparse.Namespace) -> Dict[str, Any]:
+    gp.DOCSTRING_ENFORCE = args.enforce_docstrings
+    gp.COMPLEXITY_THRESHOLD = args.complexity_threshold
+    workdir = tempfile.mkdtemp(prefix='progress-bench-')
+    cwd = os.getcwd()
+    try:
+        tests_root = os.path.join(workdir, 'practices')
+        t0 = time.perf_counter()
+        tree = build_tree(tests_root, args.topics, args.slots, args.files, args.functions, args.depth,
+                          parse_status_mix(args.status_mix), fill=args.fill, seed=args.seed)
+        build_s = time.perf_counter() - t0
+        os.chdir(workdir)
+        timer = PhaseTimer()
+
+        topics = timer.run('iter_topics', lambda: gp.iter_topics('practices'))
+        timer.run('iter_test_dirs', lambda: [gp.iter_test_dirs(os.path.join('practices', t)) for t in topics])
+        slots = timer.run('discover_slots', lambda: gp.discover_slots('practices', topics))
+        paths = [pf for slot in slots for pf in slot.python_files]
+        timer.run('determine_file_status', lambda: [gp.determine_file_status(p) for p in paths])
+        file_statuses = timer.run('evaluate_slots', lambda: gp.evaluate_slots(slots, jobs=args.jobs))
+        if args.smoke_sample:
+            targets = [s.file_status.path for s in slots
+                       if s.file_status and s.file_status.status in {'RESOLVED', 'VALIDATED'}][:args.smoke_sample]
+            timer.run('smoke_execute', lambda: gp.smoke_execute_many(targets, jobs=args.jobs))
+        topic_stats, agg = timer.run('aggregate', lambda: gp.aggregate(topics, slots))
+        timer.run('build_markdown', lambda: gp.build_markdown('01-01-2030', topic_stats, agg, file_statuses))
+        summary = timer.run('build_json', lambda: gp.build_json('01-01-2030', topic_stats, agg, file_statuses))
+        timer.run('json_dumps', lambda: json.dumps(summary, indent=2, ensure_ascii=False))
+        level_warnings = check_cache_levels(paths)
+        # Parsed by the real CLI so every flag emit_artifacts() reads has its default
+        history_only = gp.build_parser().parse_args(['--no-md', '--no-json', '--no-badges'])
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                timer.run('history_update', lambda: gp.emit_artifacts(history_only, '01-01-2030', slots, topic_stats, agg, file_statuses))
+            finally:
+                sys.stdout = stdout
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f'[kept] {workdir}', file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "benchmark": "scale",
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "params": {
+            "topics": args.topics, "slots": args.slots, "files": args.files, "functions": args.functions,
+            "depth": args.depth, "status_mix": args.status_mix, "fill": args.fill, "jobs": args.jobs,
+            "smoke_sample": args.smoke_sample, "seed": args.seed,
+        },
+        "tree": tree,
+        "warnings_by_level": level_warnings,
+        "build_tree_s": round(build_s, 6),
+        "phases": timer.phases,
+        "total_s": round(sum(timer.phases.values()), 6),
+    }
+
+def bench_memory(args: argparse.Namespace) -> Dict[str, Any]:
+    gp.DOCSTRING_ENFORCE = args.enforce_docstrings
+    gp.COMPLEXITY_THRESHOLD = args.complexity_threshold
+    workdir = tempfile.mkdtemp(prefix='progress-bench-')
+    cwd = os.getcwd()
+    try:
+        tests_root = os.path.join(workdir, 'practices')
+        tree = build_tree(tests_root, args.topics, args.slots, args.files, args.functions, args.depth,
+                          parse_status_mix(args.status_mix), fill=args.fill, seed=args.seed)
+        os.chdir(workdir)
+        topics = gp.iter_topics('practices')
+
+        def pipeline() -> Tuple[List[gp.TestSlot], List[gp.FileStatus]]:
+            slots = gp.discover_slots('practices', topics)
+            return slots, gp.evaluate_slots(slots, jobs=args.jobs)
+
+        # Warm-up, untraced: lazy imports, regex compiles, interned codes and other one-time
+        # allocations would otherwise be charged to whichever layout is traced first.
+        to_legacy(*pipeline())
+        (slots, file_statuses), current_bytes, current_peak = traced(pipeline)
+        warnings = sum(len(fs.warnings) for fs in file_statuses)
+        del slots, file_statuses
+        (legacy_slots, legacy_statuses), legacy_bytes, legacy_peak = traced(lambda: to_legacy(*pipeline()))
+        del legacy_slots, legacy_statuses
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    sample_fs = gp.FileStatus(path='p', status='TODO', meaningful_loc=0, warnings=[])
+    sample_legacy = LegacyFileStatus(path='p', status='TODO', meaningful_loc=0, warnings=[])
+    files = max(tree["python_files"], 1)
+    return {
+        "benchmark": "memory",
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "params": {
+            "topics": args.topics, "slots": args.slots, "files": args.files, "functions": args.functions,
+            "depth": args.depth, "status_mix": args.status_mix, "fill": args.fill, "jobs": args.jobs,
+            "enforce_docstrings": args.enforce_docstrings, "seed": args.seed,
+        },
+        "tree": dict(tree, warnings=warnings),
+        "instance_bytes": {
+            "file_status": sys.getsizeof(sample_fs),
+            "legacy_file_status": sys.getsizeof(sample_legacy) + sys.getsizeof(sample_legacy.__dict__),
+        },
+        "retained_bytes": {"current": current_bytes, "legacy": legacy_bytes},
+        "retained_bytes_per_file": {"current": round(current_bytes / files, 1), "legacy": round(legacy_bytes / files, 1)},
+        "peak_bytes": {"current": current_peak, "legacy": legacy_peak},
+        "saving_pct": round((1 - current_bytes / legacy_bytes) * 100, 1) if legacy_bytes else None,
+    }
+
+def synthetic_slots(topics: int, slots: int, status_mix: Dict[str, float], fill: float, seed: int) -> Tuple[List[str], List[gp.TestSlot]]:
+    """In-memory TestSlots (no files on disk) shaped like discover_slots() + evaluate_slots() output."""
+    rng = random.Random(seed)
+    statuses, weights = zip(*status_mix.items())
+    names = [f'Topic{t:05d}' for t in range(topics)]
+    test_slots: List[gp.TestSlot] = []
+    for topic in names:
+        for idx in range(1, slots + 1):
+            created = idx == slots or rng.random() <= fill
+            fs = None
+            if created:
+                status = rng.choices(statuses, weights)[0]
+                fs = gp.FileStatus(path=f'{topic}/{idx}.py', status='UNCATEGORIZED' if status == 'NONE' else status, meaningful_loc=1, warnings=[])
+            test_slots.append(gp.TestSlot(topic=topic, index=idx, created=created, python_files=[fs.path] if fs else [],
+                                          file_status=fs, all_statuses=[fs] if fs else []))
+    return names, test_slots
+
+def bench_aggregate(args: argparse.Namespace) -> Dict[str, Any]:
+    topics, slots = synthetic_slots(args.topics, args.slots, parse_status_mix(args.status_mix), args.fill, args.seed)
+    accumulator_s = best_of(lambda: gp.aggregate(topics, slots), args.repeat)
+    # Incremental: flip every slot's primary status once (remove, change, re-add)
+    topic_stats, agg = gp.aggregate(topics, slots)
+    stats = gp.StatsAccumulator(topic_stats, agg)
+    changing = [s for s in slots if s.file_status]
+    t0 = time.perf_counter()
+    for slot in changing:
+        stats.remove_slot(slot)
+        slot.file_status.status = 'VALIDATED' if slot.file_status.status != 'VALIDATED' else 'TODO'
+        stats.add_slot(slot)
+    update_s = time.perf_counter() - t0
+    if (stats.topic_stats, stats.totals) != gp.aggregate(topics, slots):
+        raise SystemExit('aggregate mismatch: incremental updates differ from a full pass')
+    legacy_topics = min(args.legacy_topics, args.topics)
+    sub_topics = topics[:legacy_topics]
+    wanted = set(sub_topics)
+    sub_slots = [s for s in slots if s.topic in wanted]
+    if legacy_aggregate(sub_topics, sub_slots) != gp.aggregate(sub_topics, sub_slots):
+        raise SystemExit('aggregate mismatch: accumulator differs from legacy per-topic rescans')
+    legacy_s = best_of(lambda: legacy_aggregate(sub_topics, sub_slots), 1)
+    subset_s = best_of(lambda: gp.aggregate(sub_topics, sub_slots), args.repeat)
+    return {
+        "benchmark": "aggregate",
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "params": {"topics": args.topics, "slots": args.slots, "status_mix": args.status_mix, "fill": args.fill,
+                   "repeat": args.repeat, "legacy_topics": legacy_topics, "seed": args.seed},
+        "slots": len(slots),
+        "accumulator_s": round(accumulator_s, 6),
+        "incremental_update_us_per_slot": round(update_s / max(len(changing), 1) * 1e6, 3),
+        "legacy_comparison": {
+            "topics": legacy_topics,
+            "slots": len(sub_slots),
+            "legacy_s": round(legacy_s, 6),
+            "accumulator_s": round(subset_s, 6),
+            "speedup": round(legacy_s / subset_s, 1) if subset_s else None,
+        },
+    }
+
+def bench_rewrite(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    texts = [synthetic_markdown(args.lines, rng, topic=f'Topic{i % 50}') for i in range(args.files)]
+    for text in texts:
+        if migrate.rewrite_text(text) != legacy_rewrite_text(text):
+            raise SystemExit('rewrite mismatch: compiled rewriter differs from the legacy per-pattern passes')
+    real_tree = check_rewrite_tree()
+    legacy_s = best_of(lambda: [legacy_rewrite_text(t) for t in texts], args.repeat)
+    compiled_s = best_of(lambda: [migrate.rewrite_text(t) for t in texts], args.repeat)
+    root = tempfile.mkdtemp(prefix='bench_rewrite_')
+    try:
+        paths = []
+        for i, text in enumerate(texts):
+            path = os.path.join(root, f'Topic{i % 50}', f'practice-{i}.md')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            paths.append(path)
+        serial_s = best_of(lambda: map_files(migrate._rewrite_dry, paths, jobs=1), args.repeat)
+        parallel_s = best_of(lambda: map_files(migrate._rewrite_dry, paths, jobs=args.jobs), args.repeat)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return {
+        "benchmark": "rewrite",
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "cpus": os.cpu_count(),
+        "params": {"files": args.files, "lines": args.lines, "jobs": args.jobs, "repeat": args.repeat, "seed": args.seed},
+        "rules": len(migrate.WORD_REPLACEMENTS),
+        "bytes": sum(len(t.encode('utf-8')) for t in texts),
+        "real_tree": real_tree,
+        "in_memory": {
+            "legacy_s": round(legacy_s, 6),
+            "compiled_s": round(compiled_s, 6),
+            "speedup": round(legacy_s / compiled_s, 2) if compiled_s else None,
+        },
+        "on_disk_dry_run": {
+            "serial_s": round(serial_s, 6),
+            "parallel_s": round(parallel_s, 6),
+            "speedup": round(serial_s / parallel_s, 2) if parallel_s else None,
+        },
+    }
+
+def bench_importtime(args: argparse.Namespace) -> Dict[str, Any]:
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    # Cached bytecode is what users get after the first run; without it every sample would time compilation.
+    env = {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'}
+    probe = f'import sys, generate_progress; print(" ".join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))'
+    cmd = [sys.executable, '-X', 'importtime', '-c', probe]
+    subprocess.run(cmd, cwd=scripts_dir, env=env, capture_output=True, check=True)  # warm-up, writes the .pyc
+    samples: List[int] = []
+    children: Dict[str, int] = {}
+    eager: List[str] = []
+    for _ in range(args.repeat):
+        proc = subprocess.run(cmd, cwd=scripts_dir, env=env, capture_output=True, text=True, check=True)
+        cumulative, direct = parse_importtime(proc.stderr, 'generate_progress')
+        samples.append(cumulative)
+        for name, us in direct.items():
+            children[name] = min(us, children.get(name, us))
+        eager = proc.stdout.split()
+    cli_probe = ('import contextlib, io, sys, generate_progress\n'
+                 'with contextlib.redirect_stdout(io.StringIO()):\n'
+                 '    generate_progress.main(["--list-topics"])\n'
+                 f'print(" ".join(m for m in {PROFILING_MODULES!r} if m in sys.modules))')
+    proc = subprocess.run([sys.executable, '-c', cli_probe], cwd=scripts_dir, env=env, capture_output=True, text=True, check=True)
+    eager += [m for m in proc.stdout.split() if m not in eager]
+    cli = [sys.executable, os.path.join(scripts_dir, 'generate_progress.py'), '--help']
+    cli_s = best_of(lambda: subprocess.run(cli, env=env, stdout=subprocess.DEVNULL, check=True), args.repeat)
+    best_ms = min(samples) / 1000
+    result: Dict[str, Any] = {
+        "benchmark": "importtime",
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "params": {"repeat": args.repeat, "budget_ms": args.budget_ms},
+        "import_ms": {
+            "best": round(best_ms, 2),
+            "median": round(statistics.median(samples) / 1000, 2),
+        },
+        "heaviest_imports_ms": {name: round(us / 1000, 2) for name, us in
+                                sorted(children.items(), key=lambda kv: -kv[1])[:args.top]},
+        "eager_deferred_modules": eager,
+        "cli_help_s": round(cli_s, 4),
+    }
+    if args.budget_ms is not None:
+        result["ok"] = best_ms <= args.budget_ms and not eager
+    return result
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the progress generation pipeline.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_an = sub.add_parser('analyzer', help='Single-pass analyzer vs legacy multi-pass heuristics')
+    p_an.add_argument('--functions', type=int, default=200, help='Top-level functions in the synthetic file (default: 200)')
+    p_an.add_argument('--depth', type=int, default=6, help='Nested inner functions per top-level function (default: 6)')
+    p_an.add_argument('--branches', type=int, default=3, help='Branch statements per function body (default: 3)')
+    p_an.add_argument('--complexity-threshold', type=int, default=15, help='Complexity threshold used for warnings (default: 15)')
+    p_an.add_argument('--repeat', type=int, default=5, help='Repetitions; best time is reported (default: 5)')
+    p_an.set_defaults(func=bench_analyzer)
+
+    p_sc = sub.add_parser('scale', help='Time each pipeline phase on a synthetic practice tree')
+    p_sc.add_argument('--topics', type=int, default=20, help='Number of topics (default: 20)')
+    p_sc.add_argument('--slots', type=int, default=20, help='Slot capacity per topic (default: 20)')
+    p_sc.add_argument('--files', type=int, default=1, help='Python files per created slot (default: 1)')
+    p_sc.add_argument('--functions', type=int, default=5, help='Top-level functions per python file; controls file size (default: 5)')
+    p_sc.add_argument('--depth', type=int, default=1, help='Nested function depth inside each function (default: 1)')
+    p_sc.add_argument('--status-mix', default='TODO=5,RESOLVED=3,VALIDATED=1,NONE=1', help='Relative weights of leading status lines (default: TODO=5,RESOLVED=3,VALIDATED=1,NONE=1)')
+    p_sc.add_argument('--fill', type=float, default=0.9, help='Fraction of slot indices that are created (default: 0.9)')
+    p_sc.add_argument('--jobs', type=int, default=1, help='Workers passed to evaluate_slots / smoke (default: 1)')
+    p_sc.add_argument('--smoke-sample', type=int, default=0, help='Smoke-execute up to N resolved primaries (default: 0, skip)')
+    p_sc.add_argument('--enforce-docstrings', action='store_true', help='Enable docstring enforcement during analysis')
+    p_sc.add_argument('--complexity-threshold', type=int, default=15, help='Complexity threshold used for warnings (default: 15)')
+    p_sc.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic tree (default: 0)')
+    p_sc.add_argument('--keep', action='store_true', help='Keep the synthetic tree on disk and print its location')
+    p_sc.set_defaults(func=bench_scale)
+
+    p_mem = sub.add_parser('memory', help='Retained memory of slots/file statuses vs the legacy dict-backed layout')
+    p_mem.add_argument('--topics', type=int, default=50, help='Number of topics (default: 50)')
+    p_mem.add_argument('--slots', type=int, default=40, help='Slot capacity per topic (default: 40)')
+    p_mem.add_argument('--files', type=int, default=2, help='Python files per created slot (default: 2)')
+    p_mem.add_argument('--functions', type=int, default=3, help='Top-level functions per python file (default: 3)')
+    p_mem.add_argument('--depth', type=int, default=1, help='Nested function depth inside each function (default: 1)')
+    p_mem.add_argument('--status-mix', default='TODO=5,RESOLVED=3,VALIDATED=1,NONE=1', help='Relative weights of leading status lines (default: TODO=5,RESOLVED=3,VALIDATED=1,NONE=1)')
+    p_mem.add_argument('--fill', type=float, default=0.9, help='Fraction of slot indices that are created (default: 0.9)')
+    p_mem.add_argument('--jobs', type=int, default=1, help='Workers passed to evaluate_slots (default: 1)')
+    p_mem.add_argument('--enforce-docstrings', action='store_true', help='Enable docstring enforcement (more warnings per file)')
+    p_mem.add_argument('--complexity-threshold', type=int, default=15, help='Complexity threshold used for warnings (default: 15)')
+    p_mem.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic tree (default: 0)')
+    p_mem.set_defaults(func=bench_memory)
+
+    p_ag = sub.add_parser('aggregate', help='Single-pass StatsAccumulator vs legacy per-topic rescans (in-memory slots)')
+    p_ag.add_argument('--topics', type=int, default=10000, help='Number of topics (default: 10000)')
+    p_ag.add_argument('--slots', type=int, default=20, help='Slot capacity per topic (default: 20)')
+    p_ag.add_argument('--status-mix', default='TODO=5,RESOLVED=3,VALIDATED=1,NONE=1', help='Relative weights of primary statuses (default: TODO=5,RESOLVED=3,VALIDATED=1,NONE=1)')
+    p_ag.add_argument('--fill', type=float, default=0.9, help='Fraction of slot indices that are created (default: 0.9)')
+    p_ag.add_argument('--legacy-topics', type=int, default=1000, help='Topics used for the quadratic legacy comparison (default: 1000)')
+    p_ag.add_argument('--repeat', type=int, default=5, help='Repetitions; best time is reported (default: 5)')
+    p_ag.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    p_ag.set_defaults(func=bench_aggregate)
+
+    p_rw = sub.add_parser('rewrite', help='Compiled single-pass migrate rewriter vs legacy per-pattern passes, serial and parallel')
+    p_rw.add_argument('--files', type=int, default=2000, help='Synthetic markdown files (default: 2000)')
+    p_rw.add_argument('--lines', type=int, default=200, help='Lines per file (default: 200)')
+    p_rw.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Processes for the parallel on-disk pass (default: CPU count)')
+    p_rw.add_argument('--repeat', type=int, default=3, help='Repetitions; best time is reported (default: 3)')
+    p_rw.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    p_rw.set_defaults(func=bench_rewrite)
+
+    p_it = sub.add_parser('importtime', help='Start-up cost of generate_progress (-X importtime) against an optional budget')
+    p_it.add_argument('--repeat', type=int, default=5, help='Fresh interpreters to sample; best and median are reported (default: 5)')
+    p_it.add_argument('--top', type=int, default=10, help='Heaviest direct imports to list (default: 10)')
+    p_it.add_argument('--budget-ms', type=float, default=None, help='Exit 1 when the best import time exceeds this (or a deferred module is imported eagerly)')
+    p_it.set_defaults(func=bench_importtime)
+
+    for sp in (p_an, p_sc, p_mem, p_ag, p_rw, p_it):
+        sp.add_argument('--output', default=None, help='Also write the JSON result to this path')
+
+    args = parser.parse_args(argv)
+    result = args.func(args)
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as of:
+            of.write(text + '\n')
+    return 1 if result.get('ok') is False else 0
+
+if __name__ == '__main__':  # pragma: no cover
+    raise SystemExit(main())
@@ -22,19 +22,43 @@ Heuristics (initial version):
   - missing_status: Python file missing a recognized leading keyword.
 
 Extendable: add smoke tests, complexity checks, docstring enforcement, etc.
+
+Library use (no subprocess, no report files):
+  from generate_progress import ProgressIndex
+  index = ProgressIndex('practices', enforce_docstrings=True)
+  index.topic('Arrays'); index.files(status='TODO'); index.with_warning('high_complexity')
+  index.refresh()  # re-collect; unchanged files are served from the analysis cache
+
+Dashboards can poll a local server instead (reports and badges from memory,
+with ETag/Last-Modified and gzip): python scripts/generate_progress.py --serve 8000
+
+Editors and hooks that call the CLI repeatedly can keep it resident instead:
+python scripts/generate_progress.py --daemon, then scripts/progress_client.py [ARGS...].
 """
 from __future__ import annotations
 
-import argparse
+import contextlib
 import dataclasses
 import datetime as _dt
 import json
+import io
 import os
 import re
 import sys
-import csv
+import threading
+import time
 import ast
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import IO, TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple, Any, Set, Union
+
+from practice_tree import SLOT_DIR_RE, PracticeTree, TopicDir, iter_tree, list_topic_entries, scan_tree
+
+# Start-up cost: everything a given mode needs beyond the scan itself (argparse,
+# process pools, subprocess, hashing, the HTTP server, SQLite history, cProfile)
+# is imported inside the functions that use it, so `import generate_progress`
+# and quick modes such as --list-topics do not pay for the others.
+if TYPE_CHECKING:
+    import argparse
+    from http.server import ThreadingHTTPServer
 
 # Historical default (kept for backward compatibility), but practice counts are now dynamic.
 DEFAULT_LEGACY_TOTAL_PER_TOPIC = 20
@@ -44,15 +68,24 @@ VALID_STATUS_SET = {"TODO", "RESOLVED", "VALIDATED"}
 # Configuration (set by CLI flags at runtime)
 DOCSTRING_ENFORCE = False
 COMPLEXITY_THRESHOLD = 15  # default cap; user can override
-
-@dataclasses.dataclass
+# How deep determine_file_status goes; each level includes the ones before it:
+#   status - leading status line only (badges, history, CSV; meaningful_loc is 0)
+#   light  - plus the line heuristics (LOC, todo/pass leftovers), no AST
+#   full   - plus ast.parse: docstrings, complexity, syntax errors (Markdown/JSON reports)
+ANALYSIS_LEVELS = ('status', 'light', 'full')
+ANALYSIS_LEVEL_RANK = {level: rank for rank, level in enumerate(ANALYSIS_LEVELS)}
+ANALYSIS_LEVEL = 'full'
+AST_WARNING_CODES = ('missing_docstring', 'high_complexity', 'syntax_error')  # produced at the full level only
+
+@dataclasses.dataclass(slots=True)
 class FileStatus:
     path: str
     status: str  # TODO | RESOLVED | VALIDATED | UNCATEGORIZED
     meaningful_loc: int
     warnings: List[str]
+    smoke: Optional["SmokeResult"] = None  # populated by --smoke for primary files
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class TestSlot:
     topic: str
     index: int
@@ -61,7 +94,7 @@ class TestSlot:
     file_status: Optional[FileStatus]  # primary status-bearing file (highest status)
     all_statuses: List[FileStatus]
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class TopicStats:
     topic: str
     capacity: int  # Highest numbered practice directory discovered (dynamic)
@@ -71,34 +104,107 @@ class TopicStats:
     validated: int
     remaining: int  # capacity - created
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Aggregate:
     created: int
     python_files: int
     resolved: int
     validated: int
 
+def compact_status(fs: FileStatus, path: Optional[str] = None) -> FileStatus:
+    """Share string storage across the retained results, in place.
+
+    Status and warning codes repeat across thousands of files, so they are
+    interned; results coming back from worker processes or the cache carry
+    fresh copies of the path, which is swapped for the caller's object.
+    """
+    fs.status = sys.intern(fs.status)
+    fs.warnings = [sys.intern(w) for w in fs.warnings]
+    if path is not None and path == fs.path:
+        fs.path = path
+    return fs
+
+# -------------------------------- Profiling --------------------------------- #
+
+class Profiler:
+    """Per-run timing and I/O counters collected when --profile is given."""
+
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.file_times: Dict[str, float] = {}
+        self.bytes_read = 0
+        self.listdir_calls = 0
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            entry = self.phases.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0})
+            entry["wall_s"] += time.perf_counter() - wall0
+            entry["cpu_s"] += time.process_time() - cpu0
+            entry["calls"] += 1
+
+    def record_file(self, path: str, seconds: float, nbytes: int) -> None:
+        self.file_times[path] = self.file_times.get(path, 0.0) + seconds
+        self.bytes_read += nbytes
+
+    def slowest_files(self) -> List[Tuple[str, float]]:
+        return sorted(self.file_times.items(), key=lambda kv: (-kv[1], kv[0]))[:self.top]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "phases": {
+                name: {"wall_s": round(v["wall_s"], 6), "cpu_s": round(v["cpu_s"], 6), "calls": int(v["calls"])}
+                for name, v in self.phases.items()
+            },
+            "analysis_level": ANALYSIS_LEVEL,
+            "files_analyzed": len(self.file_times),
+            "analyses_saved": ANALYSIS_STATS.deduplicated,
+            "analysis_s": round(sum(self.file_times.values()), 6),
+            "bytes_read": self.bytes_read,
+            "listdir_calls": self.listdir_calls,
+            "slowest_files": [{"path": p, "seconds": round(t, 6)} for p, t in self.slowest_files()],
+        }
+
+    def format_report(self) -> str:
+        lines = ["", "[profile] Phase                 Wall (s)    CPU (s)  Calls"]
+        for name, v in self.phases.items():
+            lines.append(f"[profile] {name:<20} {v['wall_s']:>9.4f} {v['cpu_s']:>10.4f} {int(v['calls']):>6}")
+        lines.append(f"[profile] files analyzed: {len(self.file_times)}, analyses saved by dedupe: {ANALYSIS_STATS.deduplicated}, "
+                     f"bytes read: {self.bytes_read}, directory listings: {self.listdir_calls}")
+        if self.file_times:
+            lines.append(f"[profile] slowest {min(self.top, len(self.file_times))} file(s):")
+            for path, seconds in self.slowest_files():
+                lines.append(f"[profile]   {seconds * 1000:9.2f} ms  {path}")
+        return "\n".join(lines)
+
+PROFILER: Optional[Profiler] = None  # set by --profile
+
+def profile_phase(name: str):
+    """Context manager timing `name` when profiling is active (no-op otherwise)."""
+    return PROFILER.phase(name) if PROFILER is not None else contextlib.nullcontext()
+
 # --------------------------------- Utility ---------------------------------- #
 
-def iter_topics(tests_root: str) -> List[str]:
-    topics: List[str] = []
-    for name in os.listdir(tests_root):
-        full = os.path.join(tests_root, name)
-        if not os.path.isdir(full):
-            continue
-        if name == 'README.md':
-            continue
-        topics.append(name)
-    return sorted(topics)
+def walk_tree(tests_root: str, topics: Optional[List[str]] = None, with_files: bool = True, stat_files: bool = False) -> PracticeTree:
+    """scan_tree() with its directory listings counted by the profiler."""
+    tree = scan_tree(tests_root, topics=topics, with_files=with_files, stat_files=stat_files)
+    if PROFILER is not None:
+        PROFILER.listdir_calls += tree.scandir_calls
+    return tree
 
-_digit_dir_re = re.compile(r"^\d+$")
+def iter_topics(tests_root: str) -> List[str]:
+    if PROFILER is not None:
+        PROFILER.listdir_calls += 1
+    return [e.name for e in list_topic_entries(tests_root)]
 
 def iter_test_dirs(topic_path: str) -> List[Tuple[int, str]]:
-    out = []
-    for name in os.listdir(topic_path):
-        if _digit_dir_re.match(name):
-            out.append((int(name), os.path.join(topic_path, name)))
-    return sorted(out, key=lambda x: x[0])
+    tree = walk_tree(os.path.dirname(topic_path) or '.', topics=[os.path.basename(topic_path)], with_files=False)
+    topic = tree.topics.get(os.path.basename(topic_path))
+    return [(idx, slot.path) for idx, slot in topic.slots.items()] if topic else []
 
 # ---------------------------- Status & Heuristics ---------------------------- #
 
@@ -121,17 +227,93 @@ def count_meaningful_lines(text: str) -> int:
 
 STATUS_PREFIX_RE = re.compile(r"^#\s*(TODO|RESOLVED|VALIDATED):")
 
+# Nodes that add a branch to the cyclomatic complexity approximation.
+COMPLEXITY_NODES = (
+    ast.If, ast.For, ast.While, ast.Try, ast.With, ast.IfExp,
+    ast.BoolOp, ast.ListComp, ast.DictComp, ast.SetComp, ast.GeneratorExp, ast.ExceptHandler,
+)
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+@dataclasses.dataclass
+class LineScan:
+    leading: str  # first non-empty line (right-stripped)
+    meaningful_loc: int  # non-blank, non-comment lines
+    has_todo: bool
+    pass_lines: int  # lines consisting solely of `pass`
+
+def scan_lines(text: str) -> LineScan:
+    """Collect every line-level heuristic in one sweep over the text."""
+    leading = ""
+    meaningful = 0
+    pass_lines = 0
+    has_todo = False
+    for line in text.splitlines():
+        s = line.strip()
+        if not s:
+            continue
+        if not leading:
+            leading = line.rstrip()
+        if not has_todo and 'TODO' in line:
+            has_todo = True
+        if s.startswith('#'):
+            continue
+        meaningful += 1
+        if s == 'pass':
+            pass_lines += 1
+    return LineScan(leading=leading, meaningful_loc=meaningful, has_todo=has_todo, pass_lines=pass_lines)
+
+def function_metrics(tree: ast.AST) -> List[Tuple[ast.AST, int]]:
+    """Return (function node, complexity) pairs in ast.walk order.
+
+    Complexity is 1 + the number of COMPLEXITY_NODES in the function's subtree
+    (nested functions included). Subtree counts are accumulated bottom-up over
+    a single breadth-first listing, so nesting depth no longer multiplies the
+    work the way a per-function ast.walk did.
+    """
+    order: List[ast.AST] = [tree]
+    parents: List[int] = [-1]
+    i = 0
+    while i < len(order):
+        for child in ast.iter_child_nodes(order[i]):
+            order.append(child)
+            parents.append(i)
+        i += 1
+    counts = [0] * len(order)
+    for j in range(len(order) - 1, 0, -1):
+        if isinstance(order[j], COMPLEXITY_NODES):
+            counts[j] += 1
+        counts[parents[j]] += counts[j]
+    return [(node, 1 + counts[j]) for j, node in enumerate(order) if isinstance(node, FUNCTION_NODES)]
+
 def determine_file_status(path: str) -> FileStatus:
     try:
         with open(path, 'r', encoding='utf-8') as f:
             content = f.read()
     except Exception as e:  # pragma: no cover - defensive
         return FileStatus(path=path, status="UNCATEGORIZED", meaningful_loc=0, warnings=[f"read_error:{e}"])
+    return analyze_source(path, content)
+
+def analyze_file(path: str, data: Optional[bytes] = None) -> FileStatus:
+    """determine_file_status, or the same analysis of bytes already read from path (no second read)."""
+    if data is None:
+        return determine_file_status(path)
+    try:
+        content = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8').read()  # decoded exactly like open(path, 'r')
+    except Exception as e:  # pragma: no cover - defensive
+        return FileStatus(path=path, status="UNCATEGORIZED", meaningful_loc=0, warnings=[f"read_error:{e}"])
+    return analyze_source(path, content)
 
-    leading = first_non_empty_line(content)
-    match = STATUS_PREFIX_RE.match(leading)
+def analyze_source(path: str, content: str) -> FileStatus:
+    if ANALYSIS_LEVEL == 'status':
+        match = STATUS_PREFIX_RE.match(first_non_empty_line(content))
+        if match:
+            return FileStatus(path=path, status=match.group(1), meaningful_loc=0, warnings=[])
+        return FileStatus(path=path, status="UNCATEGORIZED", meaningful_loc=0, warnings=["missing_status"])
+
+    scan = scan_lines(content)
+    match = STATUS_PREFIX_RE.match(scan.leading)
     status = match.group(1) if match else "UNCATEGORIZED"
-    meaningful = count_meaningful_lines(content)
+    meaningful = scan.meaningful_loc
 
     warnings: List[str] = []
     if status == "UNCATEGORIZED":
@@ -140,144 +322,707 @@ def determine_file_status(path: str) -> FileStatus:
     if status in {"RESOLVED", "VALIDATED"}:
         if meaningful < 3:
             warnings.append("low_implementation_loc")
-        if 'TODO' in content:
+        if scan.has_todo:
             warnings.append("todo_leftover")
         # Lone 'pass' statements (not part of larger code) - simple heuristic
-        if re.search(r"^\s*pass\s*$", content, re.MULTILINE):
+        if scan.pass_lines:
             warnings.append("pass_leftover")
 
-        # Optional docstring + complexity analysis
-        try:
-            tree = ast.parse(content, filename=path)
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    doc = ast.get_docstring(node)
-                    fn_name = node.name
-                    if DOCSTRING_ENFORCE and not doc:
+        # Optional docstring + complexity analysis (full level only)
+        if ANALYSIS_LEVEL == 'full':
+            try:
+                tree = ast.parse(content, filename=path)
+                for node, complexity in function_metrics(tree):
+                    fn_name = node.name  # type: ignore[attr-defined]
+                    if DOCSTRING_ENFORCE and not ast.get_docstring(node):  # type: ignore[arg-type]
                         warnings.append(f"missing_docstring:{fn_name}")
-                    # Cyclomatic complexity approximation
-                    complexity = 1
-                    for child in ast.walk(node):
-                        if isinstance(child, (ast.If, ast.For, ast.While, ast.Try, ast.With, ast.IfExp)):
-                            complexity += 1
-                        elif isinstance(child, (ast.BoolOp, ast.ListComp, ast.DictComp, ast.SetComp, ast.GeneratorExp, ast.ExceptHandler)):
-                            complexity += 1
                     if complexity > COMPLEXITY_THRESHOLD:
                         warnings.append(f"high_complexity:{fn_name}:{complexity}")
-        except SyntaxError as e:  # pragma: no cover
-            warnings.append(f"syntax_error:{e.lineno}")
+            except SyntaxError as e:  # pragma: no cover
+                warnings.append(f"syntax_error:{e.lineno}")
 
     return FileStatus(path=path, status=status, meaningful_loc=meaningful, warnings=warnings)
 
+# ------------------------------ Smoke Execution ----------------------------- #
+
+# Limits applied to every sandboxed smoke run (set by CLI flags at runtime)
+SMOKE_TIMEOUT = 10.0  # seconds of wall-clock time per file
+# Address-space cap per file (RLIMIT_AS; 0 disables, POSIX only). It limits virtual memory, not RSS:
+# numpy/pandas/BLAS reserve large virtual mappings at import, so the default leaves room for them.
+SMOKE_MEMORY_MB = 4096
+SMOKE_JOBS = 0  # concurrent smoke subprocesses; 0 = CPU count (independent of --jobs)
+
+SMOKE_RESULT_MARKER = '__progress_smoke_result__'
+
+# Executed by a fresh interpreter per file: argv = [path, memory_mb, marker].
+# Module-level code runs with __name__ set to a sentinel so that any
+# `if __name__ == "__main__":` blocks are skipped; stdin is closed so input()
+# fails fast instead of blocking.
+SMOKE_RUNNER = r"""
+import io, json, os, sys, time
+path, memory_mb = sys.argv[1], int(sys.argv[2])
+try:
+    import resource
+except ImportError:
+    resource = None
+if resource is not None and memory_mb > 0:
+    limit = memory_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+out = sys.stdout
+sys.stdout = io.StringIO()
+result = {"error_type": None, "error": None}
+t0 = time.perf_counter()
+try:
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    code = compile(content, path, 'exec')
+    exec(code, {"__name__": "progress_smoke"}, {})
+except BaseException as e:
+    result["error_type"] = type(e).__name__
+    result["error"] = str(e)
+result["duration_s"] = time.perf_counter() - t0
+if resource is not None:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result["peak_rss_kb"] = rss // 1024 if sys.platform == 'darwin' else rss
+out.write("\n%s%s\n" % (sys.argv[3], json.dumps(result)))
+out.flush()
+"""
+
+@dataclasses.dataclass(slots=True)
+class SmokeResult:
+    path: str
+    ok: bool
+    duration_s: float
+    peak_rss_kb: Optional[int]
+    error_type: Optional[str]  # exception name | Timeout | Killed | WorkerError
+    error: Optional[str]
+
+    def warning(self) -> Optional[str]:
+        """FileStatus warning for a failed run (None when the smoke run passed)."""
+        if self.ok:
+            return None
+        if self.error_type == 'Timeout':
+            return f"smoke_timeout:{self.error}"
+        if self.error_type in {'Killed', 'WorkerError'}:
+            return f"smoke_{self.error_type.lower()}:{self.error}"
+        return f"runtime_error:{self.error_type}:{self.error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "duration_s": round(self.duration_s, 4),
+            "peak_rss_kb": self.peak_rss_kb,
+            "error_type": self.error_type,
+        }
+
+def run_smoke(path: str) -> SmokeResult:
+    """Execute one file in a separate interpreter under SMOKE_TIMEOUT / SMOKE_MEMORY_MB."""
+    import signal
+    import subprocess
+    cmd = [sys.executable, '-c', SMOKE_RUNNER, path, str(SMOKE_MEMORY_MB), SMOKE_RESULT_MARKER]
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=SMOKE_TIMEOUT,
+        )
+    except subprocess.TimeoutExpired:
+        return SmokeResult(path, False, time.perf_counter() - t0, None, 'Timeout', f"{SMOKE_TIMEOUT:g}s")
+    except OSError as e:  # pragma: no cover - interpreter could not be spawned
+        return SmokeResult(path, False, time.perf_counter() - t0, None, 'WorkerError', str(e))
+    elapsed = time.perf_counter() - t0
+    payload = None
+    for line in reversed(proc.stdout.decode('utf-8', 'replace').splitlines()):
+        if line.startswith(SMOKE_RESULT_MARKER):
+            payload = json.loads(line[len(SMOKE_RESULT_MARKER):])
+            break
+    if payload is None:
+        # No report: the child was killed (e.g. by the memory cap) or exited hard.
+        if proc.returncode < 0:
+            try:
+                reason = signal.Signals(-proc.returncode).name
+            except ValueError:
+                reason = f"signal{-proc.returncode}"
+        else:
+            reason = f"exit{proc.returncode}"
+        return SmokeResult(path, False, elapsed, None, 'Killed', reason)
+    error_type = payload.get("error_type")
+    return SmokeResult(
+        path=path,
+        ok=error_type is None,
+        duration_s=payload.get("duration_s", elapsed),
+        peak_rss_kb=payload.get("peak_rss_kb"),
+        error_type=error_type,
+        error=payload.get("error"),
+    )
+
+def smoke_execute_many(paths: List[str], jobs: Optional[int] = None) -> List[SmokeResult]:
+    """Run smoke checks concurrently (one subprocess per file), preserving input order.
+
+    jobs defaults to SMOKE_JOBS (0: one subprocess per CPU); each run mostly
+    waits on its child process, so this is independent of the analysis --jobs.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    if jobs is None:
+        jobs = SMOKE_JOBS or os.cpu_count() or 1
+    if jobs <= 1 or len(paths) < 2:
+        return [run_smoke(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+        return list(pool.map(run_smoke, paths))
+
 def smoke_execute(path: str) -> Optional[str]:
-    """Attempt to import/execute a python file in isolation without running its __main__ guard.
+    """Smoke-execute a single file in the sandbox; returns a warning string on failure, or None on success."""
+    return run_smoke(path).warning()
 
-    We simulate module execution by setting __name__ to a sentinel so that any
-    `if __name__ == "__main__":` blocks are skipped.
-    Returns an error string on failure, or None on success.
+# ------------------------------ Analysis Cache ------------------------------ #
+
+ANALYSIS_CACHE_VERSION = 1
+ANALYSIS_CACHE_PATH = os.path.join('.progress_state', 'analysis_cache.json')
+
+def heuristic_config() -> Dict[str, Any]:
+    """Settings that influence determine_file_status output (cache invalidation key)."""
+    return {
+        "version": ANALYSIS_CACHE_VERSION,
+        "complexity_threshold": COMPLEXITY_THRESHOLD,
+        "docstring_enforce": DOCSTRING_ENFORCE,
+    }
+
+class AnalysisCache:
+    """Persistent FileStatus cache keyed by path, mtime, size and content hash.
+
+    A lookup whose mtime and size still match is served from a single stat()
+    call. If either changed, the file is hashed; an identical sha256 (e.g. after
+    a checkout that only touched timestamps) is still a hit. Entries produced
+    under a different heuristic_config() are discarded on load. Entries record
+    the ANALYSIS_LEVEL they were produced at and only serve runs at the same or
+    a lower level, reduced to what that level reports (entries from before
+    levels existed are full analyses).
+    """
+
+    def __init__(self, path: str = ANALYSIS_CACHE_PATH):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self.shared_hits = 0  # misses served from another path with identical content
+        self._seen: Set[str] = set()
+        self._pending: Dict[str, Tuple[int, int, str]] = {}
+        self._pending_data: Dict[str, bytes] = {}  # bytes a miss read for hashing, handed to the analysis once
+        self._by_digest: Dict[str, str] = {}  # sha256 -> a path whose entry has that content
+        self._smoke: Dict[str, Tuple[Tuple[str, float, int], SmokeResult]] = {}  # in memory only, see smoke_result()
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as cf:
+                data = json.load(cf)
+        except Exception as e:  # pragma: no cover - corrupt cache is rebuilt
+            print(f'[warn] Could not read analysis cache: {e}', file=sys.stderr)
+            self._dirty = True
+            return
+        if data.get("config") != heuristic_config():
+            self._dirty = True
+            return
+        self.entries = data.get("files", {})
+        self._by_digest = {entry["sha256"]: p for p, entry in self.entries.items()}
+
+    def lookup(self, path: str) -> Optional[FileStatus]:
+        import hashlib
+        self._seen.add(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        entry = self.entries.get(path)
+        if entry and not self._covers(entry):
+            entry = None  # analyzed at a lower level: redo
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            self.hits += 1
+            return self._to_status(path, entry)
+        try:
+            with open(path, 'rb') as bf:
+                data = bf.read()
+            digest = hashlib.sha256(data).hexdigest()
+            if PROFILER is not None:
+                PROFILER.bytes_read += len(data)
+        except OSError:
+            return None
+        if entry and entry["sha256"] == digest:
+            entry["mtime_ns"] = st.st_mtime_ns
+            entry["size"] = st.st_size
+            self._dirty = True
+            self.hits += 1
+            return self._to_status(path, entry)
+        twin = self.entries.get(self._by_digest.get(digest, ''))
+        if twin is not None and twin["sha256"] == digest and self._covers(twin):
+            # Same content already analyzed under another path (e.g. a shared starter file)
+            self.entries[path] = dict(twin, mtime_ns=st.st_mtime_ns, size=st.st_size, warnings=list(twin["warnings"]))
+            self._dirty = True
+            self.hits += 1
+            self.shared_hits += 1
+            return self._to_status(path, twin)
+        self._pending[path] = (st.st_mtime_ns, st.st_size, digest)
+        self._pending_data[path] = data
+        self.misses += 1
+        return None
+
+    def pending_digest(self, path: str) -> Optional[str]:
+        """sha256 computed for a path that missed (None if it was not looked up or not readable)."""
+        key = self._pending.get(path)
+        return key[2] if key else None
+
+    def pending_source(self, path: str) -> Optional[bytes]:
+        """Bytes read while hashing a path that missed; handed over once so the analysis does not re-read the file."""
+        return self._pending_data.pop(path, None)
+
+    def smoke_result(self, path: str) -> Optional[SmokeResult]:
+        """Smoke result remembered for path while its cached analysis still matches (same content and limits).
+
+        Kept in memory only, for long-lived caches (--serve, --watch, --daemon):
+        a refresh re-runs smoke checks for changed files alone.
+        """
+        remembered = self._smoke.get(path)
+        if remembered is None or path in self._pending:
+            return None
+        key, result = remembered
+        return result if key == self._smoke_key(path) else None
+
+    def remember_smoke(self, path: str, result: SmokeResult) -> None:
+        key = self._smoke_key(path)
+        if key is not None:
+            self._smoke[path] = (key, result)
+
+    def _smoke_key(self, path: str) -> Optional[Tuple[str, float, int]]:
+        entry = self.entries.get(path)
+        return (entry["sha256"], SMOKE_TIMEOUT, SMOKE_MEMORY_MB) if entry else None
+
+    def store(self, fs: FileStatus) -> None:
+        key = self._pending.pop(fs.path, None)
+        if key is None:
+            return
+        if any(w.startswith('read_error:') for w in fs.warnings):
+            return
+        mtime_ns, size, digest = key
+        self.entries[fs.path] = {
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "sha256": digest,
+            "level": ANALYSIS_LEVEL,
+            "status": fs.status,
+            "meaningful_loc": fs.meaningful_loc,
+            # copy: collect() appends slot-level warnings to the live object later
+            "warnings": list(fs.warnings),
+        }
+        self._by_digest.setdefault(digest, fs.path)
+        self._dirty = True
+
+    def save(self, prune: bool = False) -> None:
+        """Persist the cache; with prune=True drop entries not looked up this run."""
+        if prune:
+            stale = [p for p in self.entries if p not in self._seen]
+            for p in stale:
+                del self.entries[p]
+            self._dirty = self._dirty or bool(stale)
+        if not self._dirty:
+            return
+        data = {"config": heuristic_config(), "files": self.entries}
+        write_file(self.path, json.dumps(data, separators=(',', ':'), sort_keys=True) + '\n')
+        self._dirty = False
+
+    def begin_run(self) -> None:
+        """Reset the per-run bookkeeping (counters, seen paths) of a cache kept across runs."""
+        self.hits = self.misses = self.shared_hits = 0
+        self._seen.clear()
+        self._pending.clear()
+        self._pending_data.clear()
+
+    @staticmethod
+    def _covers(entry: Dict[str, Any]) -> bool:
+        return ANALYSIS_LEVEL_RANK[entry.get("level", "full")] >= ANALYSIS_LEVEL_RANK[ANALYSIS_LEVEL]
+
+    @staticmethod
+    def _to_status(path: str, entry: Dict[str, Any]) -> FileStatus:
+        """The entry as ANALYSIS_LEVEL would have produced it (a deeper entry is cut down, not served as is)."""
+        warnings = list(entry["warnings"])
+        if ANALYSIS_LEVEL == 'status':
+            return FileStatus(path=path, status=entry["status"], meaningful_loc=0,
+                              warnings=[w for w in warnings if w == 'missing_status'])
+        if ANALYSIS_LEVEL != 'full':
+            warnings = [w for w in warnings if warning_code(w) not in AST_WARNING_CODES]
+        return FileStatus(path=path, status=entry["status"], meaningful_loc=entry["meaningful_loc"], warnings=warnings)
+
+# ------------------------------ Parallel Scan ------------------------------- #
+
+DEDUPE_ANALYSIS = True  # analyze each distinct file content once (--no-dedupe disables)
+
+@dataclasses.dataclass(slots=True)
+class AnalysisStats:
+    """Where file results came from during this process (reported after a run and by --profile)."""
+    analyzed: int = 0  # files actually read and parsed
+    cached: int = 0  # unchanged files served from the analysis cache
+    deduplicated: int = 0  # files that reused the analysis of an identical file (analyses saved)
+
+    def format(self) -> str:
+        return (f'[dedupe] {self.deduplicated} analyses saved: identical content reused '
+                f'({self.analyzed} analyzed, {self.cached} from cache)')
+
+ANALYSIS_STATS = AnalysisStats()
+
+def _init_scan_worker(docstring_enforce: bool, complexity_threshold: int, analysis_level: str) -> None:
+    """Propagate heuristic configuration into pool workers (spawn-safe)."""
+    global DOCSTRING_ENFORCE, COMPLEXITY_THRESHOLD, ANALYSIS_LEVEL
+    DOCSTRING_ENFORCE = docstring_enforce
+    COMPLEXITY_THRESHOLD = complexity_threshold
+    ANALYSIS_LEVEL = analysis_level
+
+def evaluate_files(paths: List[str], jobs: int = 1, cache: Optional[AnalysisCache] = None, dedupe: Optional[bool] = None) -> List[FileStatus]:
+    """Run determine_file_status over paths, preserving input order.
+
+    With jobs > 1 the work is fanned out to a process pool; results come back in
+    the same order as a serial run so downstream output stays byte-identical.
+    When a cache is given, unchanged files are served from it and only misses
+    are analyzed. With dedupe (default: DEDUPE_ANALYSIS) files are grouped by
+    content hash and each distinct content is analyzed once - generated starter
+    stubs, or many checkouts of the same code. Counts go to ANALYSIS_STATS.
     """
+    if dedupe is None:
+        dedupe = DEDUPE_ANALYSIS
+    if cache is None:
+        if dedupe:
+            return [compact_status(fs, p) for fs, p in zip(_evaluate_deduped(paths, jobs), paths)]
+        ANALYSIS_STATS.analyzed += len(paths)
+        return [compact_status(fs, p) for fs, p in zip(_evaluate_uncached(paths, jobs), paths)]
+    hits, shared_hits = cache.hits, cache.shared_hits
+    results: List[Optional[FileStatus]] = [cache.lookup(p) for p in paths]
+    missing = [i for i, fs in enumerate(results) if fs is None]
+    ANALYSIS_STATS.cached += (cache.hits - hits) - (cache.shared_hits - shared_hits)
+    ANALYSIS_STATS.deduplicated += cache.shared_hits - shared_hits
+    missing_paths = [paths[i] for i in missing]
+    sources = [cache.pending_source(p) for p in missing_paths]
+    if dedupe:
+        fresh = _evaluate_deduped(missing_paths, jobs, digests={p: cache.pending_digest(p) for p in missing_paths},
+                                  blobs={p: data for p, data in zip(missing_paths, sources) if data is not None})
+    else:
+        ANALYSIS_STATS.analyzed += len(missing)
+        fresh = _evaluate_uncached(missing_paths, jobs, sources)
+    for i, fs in zip(missing, fresh):
+        cache.store(fs)
+        results[i] = fs
+    return [compact_status(fs, p) for fs, p in zip(results, paths)]  # type: ignore[arg-type]
+
+def read_blob(path: str) -> Optional[bytes]:
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        code = compile(content, path, 'exec')
-        g: Dict[str, Any] = {"__name__": "progress_smoke"}
-        l: Dict[str, Any] = {}
-        exec(code, g, l)  # noqa: S102 (explicit exec for controlled evaluation)
-    except Exception as e:  # pragma: no cover - runtime dependent
-        return f"runtime_error:{type(e).__name__}:{e}"
-    return None
+        with open(path, 'rb') as bf:
+            data = bf.read()
+    except OSError:
+        return None
+    if PROFILER is not None:
+        PROFILER.bytes_read += len(data)
+    return data
+
+def _evaluate_deduped(paths: List[str], jobs: int, digests: Optional[Dict[str, Optional[str]]] = None,
+                      blobs: Optional[Dict[str, bytes]] = None) -> List[FileStatus]:
+    """Analyze one representative per distinct content; copies reuse its result under their own path.
+
+    digests and blobs come from the analysis cache's misses (the bytes it read
+    to hash them). Without them every file is read once here. Either way the
+    representatives are analyzed from those bytes, not read a second time.
+    """
+    import hashlib
+    from concurrent.futures import ThreadPoolExecutor
+    if blobs is None:
+        blobs = {}
+    if digests is None:
+        with ThreadPoolExecutor(max_workers=max(4, jobs)) as pool:
+            blobs = {p: data for p, data in zip(paths, pool.map(read_blob, paths)) if data is not None}
+        digests = {p: hashlib.sha256(data).hexdigest() for p, data in blobs.items()}
+    representative: Dict[str, str] = {}
+    for p in paths:
+        digest = digests.get(p)
+        if digest is not None:
+            representative.setdefault(digest, p)
+    unique = [p for p in paths if digests.get(p) is None or representative[digests[p]] == p]  # type: ignore[index]
+    ANALYSIS_STATS.analyzed += len(unique)
+    ANALYSIS_STATS.deduplicated += len(paths) - len(unique)
+    sources = [blobs.get(p) for p in unique] if blobs else None
+    blobs.clear()  # duplicates' bytes are not needed for the analysis
+    analyzed = dict(zip(unique, _evaluate_uncached(unique, jobs, sources)))
+    results: List[FileStatus] = []
+    for p in paths:
+        fs = analyzed.get(p)
+        if fs is None:
+            rep = analyzed[representative[digests[p]]]  # type: ignore[index]
+            fs = FileStatus(path=p, status=rep.status, meaningful_loc=rep.meaningful_loc, warnings=list(rep.warnings))
+        results.append(fs)
+    return results
+
+def _profiled_status(path: str, data: Optional[bytes] = None) -> Tuple[FileStatus, float, int]:
+    """analyze_file plus its wall time and the bytes it read (for --profile)."""
+    t0 = time.perf_counter()
+    fs = analyze_file(path, data)
+    elapsed = time.perf_counter() - t0
+    try:
+        nbytes = os.path.getsize(path) if data is None else 0  # pre-read bytes were counted by read_blob()
+    except OSError:
+        nbytes = 0
+    return fs, elapsed, nbytes
+
+def _evaluate_uncached(paths: List[str], jobs: int, sources: Optional[List[Optional[bytes]]] = None) -> List[FileStatus]:
+    """Analyze paths (from the given pre-read bytes where available; None entries are read from disk)."""
+    from concurrent.futures import ProcessPoolExecutor
+    func = analyze_file if PROFILER is None else _profiled_status
+    columns = (paths,) if sources is None else (paths, sources)
+    if jobs <= 1 or len(paths) < 2:
+        results = [func(*args) for args in zip(*columns)]
+    else:
+        workers = min(jobs, len(paths))
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_scan_worker,
+            initargs=(DOCSTRING_ENFORCE, COMPLEXITY_THRESHOLD, ANALYSIS_LEVEL),
+        ) as pool:
+            results = list(pool.map(func, *columns, chunksize=chunksize))
+    if PROFILER is None:
+        return results  # type: ignore[return-value]
+    for fs, elapsed, nbytes in results:  # type: ignore[misc]
+        PROFILER.record_file(fs.path, elapsed, nbytes)
+    return [r[0] for r in results]  # type: ignore[index]
 
 # ------------------------------ Collection Core ------------------------------ #
 
 STATUS_RANK = {"UNCATEGORIZED": 0, "TODO": 1, "RESOLVED": 2, "VALIDATED": 3}
 
-def collect(tests_root: str, do_smoke: bool = False, only_topic: Optional[str] = None) -> Tuple[List[TestSlot], Dict[str, TopicStats], Aggregate, List[FileStatus]]:
+def discover_slots(tests_root: str, topics: List[str]) -> List[TestSlot]:
+    """List slot folders and their python files for the given topics (no file reads)."""
+    return slots_from_tree(walk_tree(tests_root, topics=topics))
+
+def slots_from_tree(tree: PracticeTree) -> List[TestSlot]:
+    """One TestSlot per index 1..capacity of every topic; gaps are not created."""
+    return [slot for topic in tree.topics.values() for slot in slots_from_topic(topic)]
+
+def slots_from_topic(topic: TopicDir) -> List[TestSlot]:
     test_slots: List[TestSlot] = []
+    for idx in range(1, topic.capacity + 1):
+        slot_dir = topic.slots.get(idx)
+        python_files: List[str] = []
+        if slot_dir is not None:
+            python_files = [os.path.join(slot_dir.path, f) for f in slot_dir.files_with_suffix('.py')]
+        test_slots.append(TestSlot(
+            topic=topic.name,
+            index=idx,
+            created=slot_dir is not None,
+            python_files=python_files,
+            file_status=None,
+            all_statuses=[]
+        ))
+    return test_slots
+
+def evaluate_slots(test_slots: List[TestSlot], do_smoke: bool = False, jobs: int = 1, cache: Optional[AnalysisCache] = None,
+                   dedupe: Optional[bool] = None) -> List[FileStatus]:
+    """Evaluate the python files of the given slots in place; returns their FileStatus records in order."""
     file_statuses: List[FileStatus] = []
 
-    topics_iter = iter_topics(tests_root)
-    if only_topic:
-        topics_iter = [t for t in topics_iter if t == only_topic]
-    for topic in topics_iter:
-        topic_path = os.path.join(tests_root, topic)
-        test_dirs = iter_test_dirs(topic_path)
-        created_set = {idx for idx, _ in test_dirs}
-        if created_set:
-            capacity = max(created_set)
-        else:
-            capacity = 0
-
-        for idx in range(1, capacity + 1):
-            created = idx in created_set
-            python_files: List[str] = []
-            status_obj: Optional[FileStatus] = None
-            statuses: List[FileStatus] = []
-            if created:
-                td_path = os.path.join(topic_path, str(idx))
-                # gather python files
-                for fname in sorted(os.listdir(td_path)):
-                    if fname.endswith('.py'):
-                        fpath = os.path.join(td_path, fname)
-                        python_files.append(fpath)
-                # evaluate all python files and choose highest status
-                if python_files:
-                    for pf in python_files:
-                        fs = determine_file_status(pf)
-                        statuses.append(fs)
-                    # choose highest rank
-                    if statuses:
-                        status_obj = max(statuses, key=lambda s: STATUS_RANK.get(s.status, 0))
-                        # conflicts: differing statuses across files
-                        unique_statuses = {s.status for s in statuses if s.status != 'UNCATEGORIZED'}
-                        if len(unique_statuses) > 1:
-                            status_obj.warnings.append('multi_status_conflict')
-                        # smoke only on chosen primary
-                        if do_smoke and status_obj.status in {"RESOLVED", "VALIDATED"}:
-                            smoke_issue = smoke_execute(status_obj.path)
-                            if smoke_issue:
-                                status_obj.warnings.append(smoke_issue)
-                        # record all statuses for breakdown
-                        file_statuses.extend(statuses)
-
-            test_slots.append(TestSlot(
-                topic=topic,
-                index=idx,
-                created=created,
-                python_files=python_files,
-                file_status=status_obj,
-                all_statuses=statuses
-            ))
-
-    # Aggregate per topic
-    topic_stats: Dict[str, TopicStats] = {}
-    for topic in topics_iter:
-        topic_slots = [s for s in test_slots if s.topic == topic]
-        if topic_slots:
-            capacity = max(s.index for s in topic_slots)
-        else:
-            capacity = 0
-        created_count = sum(1 for s in topic_slots if s.created)
-        python_file_count = sum(1 for s in topic_slots if s.python_files)
-        resolved_count = sum(1 for s in topic_slots if (s.file_status and s.file_status.status in {"RESOLVED", "VALIDATED"}))
-        validated_count = sum(1 for s in topic_slots if (s.file_status and s.file_status.status == "VALIDATED"))
-        remaining = max(capacity - created_count, 0)
-        topic_stats[topic] = TopicStats(
-            topic=topic,
-            capacity=capacity,
-            created=created_count,
-            python_files=python_file_count,
-            resolved=resolved_count,
-            validated=validated_count,
-            remaining=remaining,
-        )
+    # Evaluate every python file (serial or process pool)
+    all_paths = [pf for slot in test_slots for pf in slot.python_files]
+    with profile_phase('analysis'):
+        evaluated = iter(evaluate_files(all_paths, jobs=jobs, cache=cache, dedupe=dedupe))
 
-    agg = Aggregate(
-        created=sum(t.created for t in topic_stats.values()),
-        python_files=sum(t.python_files for t in topic_stats.values()),
-        resolved=sum(t.resolved for t in topic_stats.values()),
-        validated=sum(t.validated for t in topic_stats.values()),
-    )
+    # Merge results back into slots in discovery order
+    for slot in test_slots:
+        if not slot.python_files:
+            continue
+        statuses = [next(evaluated) for _ in slot.python_files]
+        finalize_slot(slot, statuses)
+        # record all statuses for breakdown
+        file_statuses.extend(statuses)
+
+    if do_smoke:
+        smoke_primaries(test_slots, cache)
+
+    return file_statuses
+
+def primary_status(statuses: List[FileStatus]) -> FileStatus:
+    """The status-bearing file of a slot: highest rank, first file on ties."""
+    return max(statuses, key=lambda s: STATUS_RANK.get(s.status, 0))
+
+def finalize_slot(slot: TestSlot, statuses: List[FileStatus]) -> None:
+    """Attach a slot's evaluated statuses, pick its primary and flag conflicts."""
+    slot.all_statuses = statuses
+    status_obj = primary_status(statuses)
+    slot.file_status = status_obj
+    # conflicts: differing statuses across files
+    unique_statuses = {s.status for s in statuses if s.status != 'UNCATEGORIZED'}
+    if len(unique_statuses) > 1:
+        status_obj.warnings.append('multi_status_conflict')
+
+def smoke_primaries(test_slots: List[TestSlot], cache: Optional[AnalysisCache] = None) -> None:
+    """Smoke-execute resolved primaries that have no result yet (sandboxed and concurrent).
+
+    With a cache, files whose analysis it served unchanged reuse the result it
+    remembered from an earlier run of the same process.
+    """
+    targets = [slot.file_status for slot in test_slots
+               if slot.file_status and slot.file_status.status in {"RESOLVED", "VALIDATED"} and slot.file_status.smoke is None]
+    if not targets:
+        return
+    results: Dict[str, SmokeResult] = {}
+    if cache is not None:
+        for fs in targets:
+            reused = cache.smoke_result(fs.path)
+            if reused is not None:
+                results[fs.path] = reused
+    pending = [fs.path for fs in targets if fs.path not in results]
+    if pending:
+        with profile_phase('smoke'):
+            for path, result in zip(pending, smoke_execute_many(pending)):
+                results[path] = result
+                if cache is not None:
+                    cache.remember_smoke(path, result)
+    for fs in targets:
+        result = results[fs.path]
+        fs.smoke = result
+        smoke_issue = result.warning()
+        if smoke_issue:
+            fs.warnings.append(smoke_issue)
+
+def reevaluate_slots(slots: List[TestSlot], paths: List[str], file_statuses: List[FileStatus],
+                     topic_stats: Dict[str, TopicStats], agg: Aggregate, do_smoke: bool = False,
+                     jobs: int = 1, cache: Optional[AnalysisCache] = None) -> None:
+    """Re-analyze changed files and patch their slots, file_statuses and counters in place.
+
+    Only `paths` are read again; the other files of the given slots keep their
+    results (slot-level conflict/smoke annotations are re-derived), so the end
+    state matches a fresh collect() without touching the rest of the tree.
+    """
+    with profile_phase('analysis'):
+        fresh = {fs.path: fs for fs in evaluate_files(paths, jobs=jobs, cache=cache)}
+    positions = {fs.path: i for i, fs in enumerate(file_statuses) if fs.path in fresh}
+    for path, i in positions.items():
+        file_statuses[i] = fresh[path]
+    stats = StatsAccumulator(topic_stats, agg)
+    for slot in slots:
+        stats.remove_slot(slot)
+    kept_smoke: Dict[str, SmokeResult] = {}
+    for slot in slots:
+        statuses: List[FileStatus] = []
+        for fs in slot.all_statuses:
+            if fs.path in fresh:
+                statuses.append(fresh[fs.path])
+                continue
+            # Strip slot-level annotations; they are re-applied below
+            drop = {'multi_status_conflict'}
+            if fs.smoke is not None:
+                kept_smoke[fs.path] = fs.smoke
+                drop.add(fs.smoke.warning())
+                fs.smoke = None
+            fs.warnings = [w for w in fs.warnings if w not in drop]
+            statuses.append(fs)
+        finalize_slot(slot, statuses)
+        primary = slot.file_status
+        if primary is not None and primary.path in kept_smoke and primary.status in {"RESOLVED", "VALIDATED"}:
+            primary.smoke = kept_smoke[primary.path]
+            smoke_issue = primary.smoke.warning()
+            if smoke_issue:
+                primary.warnings.append(smoke_issue)
+    if do_smoke:
+        smoke_primaries(slots, cache)
+    for slot in slots:
+        stats.add_slot(slot)
+
+class StatsAccumulator:
+    """Per-topic and overall counters maintained in a single pass over slots.
+
+    Slots can be added as they are discovered (streaming) and removed/re-added
+    around an in-place status change (promotion, watch), so totals never need
+    a rescan. The TopicStats/Aggregate objects are updated live; passing
+    existing ones in patches them in place. Capacity is the highest slot index
+    seen and is not lowered by remove_slot(); drop_topic() resets a topic.
+    """
 
+    def __init__(self, topic_stats: Optional[Dict[str, TopicStats]] = None, totals: Optional[Aggregate] = None):
+        self.topic_stats: Dict[str, TopicStats] = topic_stats if topic_stats is not None else {}
+        self.totals = totals if totals is not None else Aggregate(created=0, python_files=0, resolved=0, validated=0)
+
+    def add_topic(self, topic: str) -> TopicStats:
+        t = self.topic_stats.get(topic)
+        if t is None:
+            t = self.topic_stats[topic] = TopicStats(topic=topic, capacity=0, created=0, python_files=0, resolved=0, validated=0, remaining=0)
+        return t
+
+    def drop_topic(self, topic: str) -> None:
+        t = self.topic_stats.pop(topic, None)
+        if t is not None:
+            self.totals.created -= t.created
+            self.totals.python_files -= t.python_files
+            self.totals.resolved -= t.resolved
+            self.totals.validated -= t.validated
+
+    def add_slot(self, slot: TestSlot, sign: int = 1) -> None:
+        t = self.add_topic(slot.topic)
+        if sign > 0 and slot.index > t.capacity:
+            t.capacity = slot.index
+        status = slot.file_status.status if slot.file_status else None
+        created = sign if slot.created else 0
+        python_files = sign if slot.python_files else 0
+        resolved = sign if status in {"RESOLVED", "VALIDATED"} else 0
+        validated = sign if status == "VALIDATED" else 0
+        t.created += created
+        t.python_files += python_files
+        t.resolved += resolved
+        t.validated += validated
+        t.remaining = max(t.capacity - t.created, 0)
+        agg = self.totals
+        agg.created += created
+        agg.python_files += python_files
+        agg.resolved += resolved
+        agg.validated += validated
+
+    def remove_slot(self, slot: TestSlot) -> None:
+        self.add_slot(slot, sign=-1)
+
+    def add_stats(self, other: TopicStats) -> None:
+        """Sum another tree's stats for the same topic (combined multi-root report)."""
+        t = self.add_topic(other.topic)
+        t.capacity += other.capacity
+        t.created += other.created
+        t.python_files += other.python_files
+        t.resolved += other.resolved
+        t.validated += other.validated
+        t.remaining += other.remaining
+        agg = self.totals
+        agg.created += other.created
+        agg.python_files += other.python_files
+        agg.resolved += other.resolved
+        agg.validated += other.validated
+
+def aggregate(topics: List[str], test_slots: List[TestSlot]) -> Tuple[Dict[str, TopicStats], Aggregate]:
+    """Per-topic stats for `topics` (slots of other topics are ignored) plus overall totals."""
+    stats = StatsAccumulator()
+    for topic in topics:
+        stats.add_topic(topic)
+    for slot in test_slots:
+        if slot.topic in stats.topic_stats:
+            stats.add_slot(slot)
+    return stats.topic_stats, stats.totals
+
+def collect(tests_root: str, do_smoke: bool = False, only_topic: Optional[str] = None, jobs: int = 1, cache: Optional[AnalysisCache] = None) -> Tuple[List[TestSlot], Dict[str, TopicStats], Aggregate, List[FileStatus]]:
+    with profile_phase('listing'):
+        tree = walk_tree(tests_root, topics=[only_topic] if only_topic else None)
+        topics_iter = list(tree.topics)
+        test_slots = slots_from_tree(tree)
+    file_statuses = evaluate_slots(test_slots, do_smoke=do_smoke, jobs=jobs, cache=cache)
+    with profile_phase('aggregate'):
+        topic_stats, agg = aggregate(topics_iter, test_slots)
     return test_slots, topic_stats, agg, file_statuses
 
 # ------------------------------ Formatting ---------------------------------- #
@@ -294,12 +1039,15 @@ MD_HEADER = """# Study Progress Report ({date})\n\nGenerated automatically by `g
 
 MD_DEFINITIONS = """Definitions:\n\n- Created Practice: Folder with markdown created (counts toward curriculum build-out)\n- Python File: At least one `*.py` file exists for that practice (implementation started)\n- Status Keywords (first non-empty line of primary `.py` file):\n    - `# TODO:` → Implementation not started / placeholder\n    - `# RESOLVED:` → Implementation written but not yet validated\n    - `# VALIDATED:` → Implementation written & validated\n- Resolved Practice: Leading keyword is `# RESOLVED:` or `# VALIDATED:` (Validated is a subset)\n- Validated Practice: Leading keyword is `# VALIDATED:` and passes heuristic checks (in future)\n"""
 
-def build_markdown(date_str: str, topic_stats: Dict[str, TopicStats], agg: Aggregate, file_statuses: List[FileStatus]) -> str:
-    total_possible = sum(t.capacity for t in topic_stats.values()) or 0
-    # Status breakdown counts
+def status_breakdown(file_statuses: List[FileStatus]) -> Dict[str, int]:
     counts = {"TODO":0, "RESOLVED":0, "VALIDATED":0, "UNCATEGORIZED":0}
     for fs in file_statuses:
         counts[fs.status] = counts.get(fs.status, 0) + 1
+    return counts
+
+def markdown_summary_lines(date_str: str, topic_stats: Dict[str, TopicStats], agg: Aggregate, counts: Dict[str, int]) -> List[str]:
+    """Report lines up to (and including) the transition funnel."""
+    total_possible = sum(t.capacity for t in topic_stats.values()) or 0
 
     lines: List[str] = []
     lines.append(MD_HEADER.format(date=date_str))
@@ -330,28 +1078,48 @@ def build_markdown(date_str: str, topic_stats: Dict[str, TopicStats], agg: Aggre
     lines.append(
         f"\nTransition Funnel (files): Created → Python File ({agg.python_files}) → Resolved ({agg.resolved}) → Validated ({agg.validated})\n"
     )
+    return lines
+
+MD_WARNINGS_HEADER = ["\n### Heuristic Warnings\n", "| File | Status | Warnings | Meaningful LOC |", "|------|--------|----------|----------------|"]
+MD_NO_WARNINGS = "\n_No heuristic warnings._\n"
+MD_FOOTER = "\n---\n\n*End of automated report.*\n"
+
+def issue_sort_key(fs: FileStatus) -> Tuple[int, str]:
+    """Warnings table order (applied with reverse=True): most warnings first, then path."""
+    return (len(fs.warnings), fs.path)
+
+def markdown_issue_row(fs: FileStatus) -> str:
+    return f"| {fs.path} | {fs.status} | {', '.join(fs.warnings)} | {fs.meaningful_loc} |"
+
+def build_markdown(date_str: str, topic_stats: Dict[str, TopicStats], agg: Aggregate, file_statuses: List[FileStatus]) -> str:
+    lines = markdown_summary_lines(date_str, topic_stats, agg, status_breakdown(file_statuses))
 
     # Heuristic issues summary
     issues = [fs for fs in file_statuses if fs.warnings]
     if issues:
-        lines.append("\n### Heuristic Warnings\n")
-        lines.append("| File | Status | Warnings | Meaningful LOC |")
-        lines.append("|------|--------|----------|----------------|")
-        for fs in sorted(issues, key=lambda x: (len(x.warnings), x.path), reverse=True):
-            lines.append(f"| {fs.path} | {fs.status} | {', '.join(fs.warnings)} | {fs.meaningful_loc} |")
+        lines.extend(MD_WARNINGS_HEADER)
+        for fs in sorted(issues, key=issue_sort_key, reverse=True):
+            lines.append(markdown_issue_row(fs))
     else:
-        lines.append("\n_No heuristic warnings._\n")
+        lines.append(MD_NO_WARNINGS)
 
-    lines.append("\n---\n\n*End of automated report.*\n")
+    lines.append(MD_FOOTER)
     return "\n".join(lines)
 
 # ------------------------------ JSON Output --------------------------------- #
 
-def build_json(date_str: str, topic_stats: Dict[str, TopicStats], agg: Aggregate, file_statuses: List[FileStatus]) -> Dict:
+def file_record(fs: FileStatus) -> Dict[str, Any]:
+    return {
+        "path": fs.path,
+        "status": fs.status,
+        "meaningful_loc": fs.meaningful_loc,
+        "warnings": fs.warnings,
+        **({"smoke": fs.smoke.to_dict()} if fs.smoke else {}),
+    }
+
+def build_json_summary(date_str: str, topic_stats: Dict[str, TopicStats], agg: Aggregate, status_counts: Dict[str, int]) -> Dict:
+    """JSON summary without the per-file records (see build_json)."""
     total_possible = sum(t.capacity for t in topic_stats.values()) or 0
-    status_counts = {"TODO":0, "RESOLVED":0, "VALIDATED":0, "UNCATEGORIZED":0}
-    for fs in file_statuses:
-        status_counts[fs.status] = status_counts.get(fs.status, 0) + 1
 
     data = {
         "date": date_str,
@@ -373,15 +1141,6 @@ def build_json(date_str: str, topic_stats: Dict[str, TopicStats], agg: Aggregate
         },
         "topics": [],
         "status_breakdown": status_counts,
-        "files": [
-            {
-                "path": fs.path,
-                "status": fs.status,
-                "meaningful_loc": fs.meaningful_loc,
-                "warnings": fs.warnings,
-            }
-            for fs in file_statuses
-        ],
     }
 
     for topic in sorted(topic_stats):
@@ -403,6 +1162,206 @@ def build_json(date_str: str, topic_stats: Dict[str, TopicStats], agg: Aggregate
 
     return data
 
+def build_json(date_str: str, topic_stats: Dict[str, TopicStats], agg: Aggregate, file_statuses: List[FileStatus]) -> Dict:
+    data = build_json_summary(date_str, topic_stats, agg, status_breakdown(file_statuses))
+    data["files"] = [file_record(fs) for fs in file_statuses]
+
+    if PROFILER is not None:
+        # Timing up to report generation (artifact writes happen after this snapshot)
+        data["profile"] = PROFILER.summary()
+
+    return data
+
+# ------------------------------ Streaming Reports --------------------------- #
+
+STREAM_BATCH_FILES = 2000  # python files evaluated per batch in --stream mode
+STREAM_SPILL_ROWS = 50000  # warning rows kept in memory before spilling a sorted run to disk
+
+def iter_collect(tests_root: str, only_topic: Optional[str] = None, do_smoke: bool = False, jobs: int = 1,
+                 cache: Optional[AnalysisCache] = None, batch_files: int = STREAM_BATCH_FILES
+                 ) -> Iterator[Tuple[List[str], List[TestSlot], List[FileStatus]]]:
+    """Streaming counterpart of collect(): yield (topics, slots, file_statuses) batches.
+
+    Topics are walked lazily and evaluated once roughly batch_files python files
+    have accumulated, so only one batch of slots is alive at a time. Batches
+    follow collect() order (topic name, slot index, file name).
+    """
+    if PROFILER is not None:
+        PROFILER.listdir_calls += 1
+    topics: List[str] = []
+    slots: List[TestSlot] = []
+    pending_files = 0
+    for topic_dir in iter_tree(tests_root, topics=[only_topic] if only_topic else None):
+        if PROFILER is not None:
+            PROFILER.listdir_calls += topic_dir.scandir_calls
+        topic_slots = slots_from_topic(topic_dir)
+        topics.append(topic_dir.name)
+        slots.extend(topic_slots)
+        pending_files += sum(len(slot.python_files) for slot in topic_slots)
+        if pending_files >= batch_files:
+            yield topics, slots, evaluate_slots(slots, do_smoke=do_smoke, jobs=jobs, cache=cache)
+            topics, slots, pending_files = [], [], 0
+    if topics:
+        yield topics, slots, evaluate_slots(slots, do_smoke=do_smoke, jobs=jobs, cache=cache)
+
+class StreamingReport:
+    """Build the Markdown and JSON reports incrementally with bounded memory.
+
+    Only per-topic counters, status counts and resolved identifiers are kept in
+    memory. JSON file records are appended to a spool file as slots arrive, and
+    warning-table rows are spilled to disk in sorted runs that are k-way merged
+    when the Markdown is written. The output is byte-identical to
+    build_markdown() / build_json().
+    """
+
+    def __init__(self, want_md: bool, want_json: bool, workdir: Optional[str] = None, spill_rows: int = STREAM_SPILL_ROWS):
+        import tempfile
+        self.status_counts = status_breakdown([])
+        self.stats = StatsAccumulator()
+        self.topic_stats = self.stats.topic_stats
+        self.resolved_ids: Set[str] = set()
+        self._tmpdir = tempfile.mkdtemp(prefix='.progress-stream-', dir=workdir)
+        self._want_md = want_md
+        self._records = open(os.path.join(self._tmpdir, 'files.json'), 'w', encoding='utf-8') if want_json else None
+        self._record_count = 0
+        self._spill_rows = spill_rows
+        self._rows: List[Tuple[int, str, str]] = []
+        self._runs: List[str] = []
+
+    def __enter__(self) -> 'StreamingReport':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        import shutil
+        if self._records is not None:
+            self._records.close()
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def add_topic(self, topic: str) -> TopicStats:
+        return self.stats.add_topic(topic)
+
+    def add(self, test_slots: List[TestSlot], file_statuses: List[FileStatus]) -> None:
+        for slot in test_slots:
+            self.stats.add_slot(slot)
+            if slot.file_status and slot.file_status.status in {"RESOLVED", "VALIDATED"}:
+                self.resolved_ids.add(f"{slot.topic}/{slot.index}")
+        for fs in file_statuses:
+            self.status_counts[fs.status] = self.status_counts.get(fs.status, 0) + 1
+            if self._records is not None:
+                record = json.dumps(file_record(fs), indent=2, ensure_ascii=False).replace('\n', '\n    ')
+                self._records.write((',' if self._record_count else '') + '\n    ' + record)
+                self._record_count += 1
+            if self._want_md and fs.warnings:
+                self._rows.append((*issue_sort_key(fs), markdown_issue_row(fs)))
+                if len(self._rows) >= self._spill_rows:
+                    self._spill()
+
+    def aggregate(self) -> Aggregate:
+        return self.stats.totals
+
+    def _spill(self) -> None:
+        self._rows.sort(reverse=True)
+        run_path = os.path.join(self._tmpdir, f'issues{len(self._runs)}.jsonl')
+        with open(run_path, 'w', encoding='utf-8') as rf:
+            for row in self._rows:
+                rf.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self._runs.append(run_path)
+        self._rows = []
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[Tuple[int, str, str]]:
+        with open(path, 'r', encoding='utf-8') as rf:
+            for line in rf:
+                yield tuple(json.loads(line))  # type: ignore[misc]
+
+    def _issue_rows(self) -> Iterator[str]:
+        import heapq
+        self._rows.sort(reverse=True)
+        runs = [self._read_run(p) for p in self._runs] + [iter(self._rows)]
+        for _, _, row in heapq.merge(*runs, reverse=True):
+            yield row
+
+    def write_markdown(self, out: IO[str], date_str: str) -> None:
+        out.write("\n".join(markdown_summary_lines(date_str, self.topic_stats, self.aggregate(), self.status_counts)))
+        rows = self._issue_rows()
+        first = next(rows, None)
+        if first is None:
+            out.write("\n" + MD_NO_WARNINGS)
+        else:
+            for line in MD_WARNINGS_HEADER:
+                out.write("\n" + line)
+            out.write("\n" + first)
+            for row in rows:
+                out.write("\n" + row)
+        out.write("\n" + MD_FOOTER)
+
+    def write_json(self, out: IO[str], date_str: str) -> None:
+        import shutil
+        summary = build_json_summary(date_str, self.topic_stats, self.aggregate(), self.status_counts)
+        head = json.dumps(summary, indent=2, ensure_ascii=False)
+        out.write(head[:-2])  # drop the closing "\n}"
+        if self._records is not None and self._record_count:
+            self._records.flush()
+            out.write(',\n  "files": [')
+            with open(self._records.name, 'r', encoding='utf-8') as rf:
+                shutil.copyfileobj(rf, out)
+            out.write('\n  ]')
+        else:
+            out.write(',\n  "files": []')
+        if PROFILER is not None:
+            out.write(',\n  "profile": ' + json.dumps(PROFILER.summary(), indent=2, ensure_ascii=False).replace('\n', '\n  '))
+        out.write('\n}\n')
+
+def write_streamed(path: str, writer: Callable[[IO[str]], None]) -> None:
+    """Write through a temp file in the target directory, then atomically replace."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = temp_path(path)
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            writer(f)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+def run_streaming(args: argparse.Namespace, date_str: str, cache: Optional[AnalysisCache]) -> int:
+    """--stream: collect in batches and write reports incrementally (bounded memory)."""
+    import argparse
+    date_token = date_str.replace('-', '_')
+    progress_dir = 'progress'
+    os.makedirs(progress_dir, exist_ok=True)
+    with StreamingReport(want_md=not args.no_md or args.stdout, want_json=not args.no_json, workdir=progress_dir) as report:
+        for topics, slots, statuses in iter_collect(args.tests_root, only_topic=args.only_topic, do_smoke=args.smoke, jobs=args.jobs, cache=cache):
+            for topic in topics:
+                report.add_topic(topic)
+            with profile_phase('stream_aggregate'):
+                report.add(slots, statuses)
+        if cache is not None:
+            with profile_phase('cache_save'):
+                cache.save(prune=not args.only_topic)
+        if not args.no_md:
+            md_path = os.path.join(progress_dir, f'progress{date_token}.md')
+            with profile_phase('build_markdown'):
+                write_streamed(md_path, lambda f: report.write_markdown(f, date_str))
+            print(f'[written] {md_path}')
+        if not args.no_json:
+            json_path = os.path.join(progress_dir, f'progress{date_token}.json')
+            with profile_phase('build_json'):
+                write_streamed(json_path, lambda f: report.write_json(f, date_str))
+            print(f'[written] {json_path}')
+        # CSV, history and badges only need the aggregates
+        rest = argparse.Namespace(**{**vars(args), 'no_md': True, 'no_json': True, 'stdout': False})
+        emit_artifacts(rest, date_str, [], report.topic_stats, report.aggregate(), [], resolved_ids=report.resolved_ids)
+        if args.stdout:
+            sys.stdout.write('\n')
+            report.write_markdown(sys.stdout, date_str)
+            sys.stdout.write('\n')
+    return 0
+
 # ------------------------------ Badges --------------------------------------- #
 
 def badge_color(pct_value: float) -> str:
@@ -426,16 +1385,1069 @@ def build_badge(label: str, message: str, pct_value: float) -> Dict:
         "color": badge_color(pct_value),
     }
 
-# ------------------------------ Main CLI ------------------------------------- #
+def build_badges(topic_stats: Dict[str, TopicStats], agg: Aggregate) -> Dict[str, Dict]:
+    """The validated/resolved badges, keyed by badge name (badges/<name>.json)."""
+    totals = build_json_summary('', topic_stats, agg, {})['totals']
+    validated_pct = totals['percent_validated']
+    resolved_pct = totals['percent_resolved']
+    return {
+        'validated': build_badge('validated', f"{agg.validated}/{totals['possible']} ({validated_pct:.1f}%)", validated_pct),
+        'resolved': build_badge('resolved', f"{agg.resolved}/{totals['possible']} ({resolved_pct:.1f}%)", resolved_pct),
+    }
 
-def write_file(path: str, content: str, binary: bool = False):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    mode = 'wb' if binary else 'w'
-    with open(path, mode, encoding=None if binary else 'utf-8') as f:
-        f.write(content)
+# ------------------------------ Artifacts ----------------------------------- #
 
+ARTIFACT_WRITE_WORKERS = 4  # threads used to flush independent artifacts
 
-def main(argv: Optional[List[str]] = None) -> int:
+def temp_path(path: str) -> str:
+    """Per-process/thread temp name next to path (same filesystem, so os.replace is atomic)."""
+    return f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+def encode_text(content: str, newline: Optional[str] = None) -> bytes:
+    """The bytes a UTF-8 text-mode write with this newline setting would produce."""
+    target = os.linesep if newline is None else newline
+    if target not in ('', '\n'):
+        content = content.replace('\n', target)
+    return content.encode('utf-8')
+
+def write_bytes_atomic(path: str, data: bytes) -> None:
+    """Write data to a temp file beside path, then os.replace it into place."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = temp_path(path)
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+def write_file(path: str, content: str, binary: bool = False, newline: Optional[str] = None):
+    write_bytes_atomic(path, content if binary else encode_text(content, newline))  # type: ignore[arg-type]
+
+def file_matches(path: str, data: bytes) -> bool:
+    """True if path already holds exactly data (size check, then SHA-256 of the file)."""
+    import hashlib
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return False
+    return digest.digest() == hashlib.sha256(data).digest()
+
+@dataclasses.dataclass(slots=True)
+class Artifact:
+    path: str
+    data: bytes
+    label: str
+    note: str
+    changed: bool = False
+
+class ArtifactWriter:
+    """Queue the artifacts of one run and flush them concurrently.
+
+    An artifact whose on-disk bytes already match (by content hash) is not
+    rewritten, so unchanged reports keep their mtime and do not wake file
+    watchers or show up in git. Changed artifacts are written atomically
+    (temp file + os.replace) on a small thread pool.
+    """
+
+    def __init__(self, quiet_unchanged: bool = False, workers: int = ARTIFACT_WRITE_WORKERS):
+        self.quiet_unchanged = quiet_unchanged
+        self.workers = workers
+        self.pending: List[Artifact] = []
+
+    def add(self, path: str, content: Union[str, bytes], label: str = '[written]', note: str = '', newline: Optional[str] = None) -> None:
+        data = content if isinstance(content, bytes) else encode_text(content, newline)
+        self.pending.append(Artifact(path=path, data=data, label=label, note=note))
+
+    @staticmethod
+    def _write(artifact: Artifact) -> None:
+        if not file_matches(artifact.path, artifact.data):
+            write_bytes_atomic(artifact.path, artifact.data)
+            artifact.changed = True
+
+    def flush(self) -> List[Artifact]:
+        """Write all queued artifacts; report them in the order they were added."""
+        from concurrent.futures import ThreadPoolExecutor
+        artifacts, self.pending = self.pending, []
+        with profile_phase('write_artifacts'):
+            if self.workers > 1 and len(artifacts) > 1:
+                with ThreadPoolExecutor(max_workers=min(self.workers, len(artifacts))) as pool:
+                    list(pool.map(self._write, artifacts))
+            else:
+                for artifact in artifacts:
+                    self._write(artifact)
+        for artifact in artifacts:
+            if artifact.changed:
+                print(f'{artifact.label} {artifact.path}{artifact.note}')
+            elif not self.quiet_unchanged:
+                print(f'[unchanged] {artifact.path}{artifact.note}')
+        return artifacts
+
+def build_csv(topic_stats: Dict[str, TopicStats]) -> str:
+    import csv
+    buf = io.StringIO(newline='')
+    writer = csv.writer(buf)
+    writer.writerow(['Topic','Capacity','Created','PythonFiles','Resolved','Validated','Remaining','Created%','PythonFile%','Resolved%','Validated%'])
+    for topic in sorted(topic_stats):
+        t = topic_stats[topic]
+        cap = t.capacity or 0
+        def fmt(val):
+            return f"{pct_float(val, cap):.1f}" if cap else '0.0'
+        writer.writerow([
+            t.topic, t.capacity, t.created, t.python_files, t.resolved, t.validated, t.remaining,
+            fmt(t.created), fmt(t.python_files), fmt(t.resolved), fmt(t.validated)
+        ])
+    return buf.getvalue()
+
+def emit_artifacts(args: argparse.Namespace, date_str: str, test_slots: List[TestSlot], topic_stats: Dict[str, TopicStats],
+                   agg: Aggregate, file_statuses: List[FileStatus], only_changed: bool = False,
+                   resolved_ids: Optional[Set[str]] = None, out_dir: str = '', extra_json: Optional[Dict[str, Any]] = None) -> str:
+    """Write the Markdown/JSON/CSV reports, history/delta files and badges selected by args.
+
+    Artifacts are flushed together through an ArtifactWriter: files whose
+    content is unchanged are left untouched (reported as [unchanged], or not at
+    all with only_changed=True as in watch mode). resolved_ids overrides the
+    resolved slot identifiers derived from test_slots (streaming mode keeps
+    only the identifiers). out_dir prefixes the progress/ and badges/
+    directories and extra_json adds top-level keys to the JSON summary
+    (multi-root mode). Returns the Markdown report.
+    """
+    writer = ArtifactWriter(quiet_unchanged=only_changed)
+    emit = writer.add
+
+    md = ''
+    if not args.no_md or args.stdout:
+        with profile_phase('build_markdown'):
+            md = build_markdown(date_str, topic_stats, agg, file_statuses)
+
+    date_token = date_str.replace('-', '_')
+
+    # Output directory (updated): store progress artifacts under root-level progress/
+    progress_dir = os.path.join(out_dir, 'progress')
+    if not args.no_md:
+        md_path = os.path.join(progress_dir, f'progress{date_token}.md')
+        emit(md_path, md)
+    if not args.no_json or args.export_snapshot:
+        json_path = os.path.join(progress_dir, f'progress{date_token}.json')
+        with profile_phase('build_json'):
+            summary_json = build_json(date_str, topic_stats, agg, file_statuses)
+            if extra_json:
+                summary_json.update(extra_json)
+        if not args.no_json:
+            emit(json_path, json.dumps(summary_json, indent=2, ensure_ascii=False) + '\n')
+        if args.export_snapshot:
+            import progress_snapshot
+            with profile_phase('build_snapshot'):
+                emit(progress_snapshot.snapshot_path(json_path), progress_snapshot.encode(summary_json))
+    if args.export_csv:
+        csv_path = os.path.join(progress_dir, f'progress{date_token}.csv')
+        emit(csv_path, build_csv(topic_stats), newline='')
+
+    # -------------------- Resolved History / Delta Generation -------------------- #
+    if not args.no_history:
+        with profile_phase('history'):
+            # Current resolved identifiers
+            current_resolved: Set[str] = resolved_ids if resolved_ids is not None else set(
+                f"{slot.topic}/{slot.index}" for slot in test_slots
+                if slot.file_status and slot.file_status.status in {"RESOLVED", "VALIDATED"}
+            )
+            from resolved_history import LEGACY_HISTORY_PATH, ResolvedHistory
+            with ResolvedHistory() as history:
+                try:
+                    migrated = history.migrate_json()
+                    if migrated is not None:
+                        print(f'[info] Migrated {migrated} entries from {LEGACY_HISTORY_PATH} to {history.path}')
+                except (OSError, ValueError) as e:  # pragma: no cover
+                    print(f'[warn] Could not read history file: {e}', file=sys.stderr)
+                # Append items not seen before with first-seen date
+                new_items = history.record(current_resolved, date_str)
+                print(f'[updated] {history.path} (+{len(new_items)} new, total resolved tracked: {len(history)})')
+
+                # Delta markdown (only if there are new items)
+                delta_path = os.path.join(progress_dir, f'completed_delta_{date_token}.md')
+                if new_items:
+                    delta_md_lines = [
+                        f"# Newly Completed Practices ({date_str})\n",
+                        "Generated by generate_progress.py\n",
+                        "",
+                        "## New Resolved / Validated",
+                        "",
+                    ]
+                    for ident in new_items:
+                        delta_md_lines.append(f"- {ident}")
+                    delta_md_lines.append("")
+                    emit(delta_path, "\n".join(delta_md_lines))
+                else:
+                    # Always materialize a delta file so downstream tooling can rely on its presence.
+                    empty_delta = [
+                        f"# Newly Completed Practices ({date_str})\n",
+                        "Generated by generate_progress.py\n",
+                        "",
+                        "## New Resolved / Validated",
+                        "",
+                        "_No new resolved or validated practices in this run._\n",
+                    ]
+                    emit(delta_path, "\n".join(empty_delta), label='[written-empty]', note=' (no new items)')
+
+                # Cumulative markdown, read in report order straight from the index
+                cumulative_lines = ["# All Completed (Resolved or Validated) Practices\n", "| Practice | First Seen |", "|------|------------|"]
+                cumulative_lines.extend(f"| {ident} | {first_seen} |" for ident, first_seen in history.iter_report_order())
+                cumulative_lines.append("")
+            cumulative_path = os.path.join(progress_dir, 'completed_all.md')
+            emit(cumulative_path, "\n".join(cumulative_lines))
+    if not args.no_badges:
+        # Build badges directory
+        for name, badge in build_badges(topic_stats, agg).items():
+            emit(os.path.join(out_dir, 'badges', f'{name}.json'), json.dumps(badge, indent=2) + '\n')
+
+    writer.flush()
+    return md
+
+# ------------------------------ Watch Mode ----------------------------------- #
+
+SlotKey = Tuple[str, int]
+TOPIC_KEY = -1  # SlotKey index of a topic folder's own entry in slot_signatures()
+
+def slot_signatures(tests_root: str, topics: List[str]) -> Dict[SlotKey, Tuple[Any, ...]]:
+    """Map every topic and slot folder to its mtime plus the (name, mtime_ns, size) of its python files.
+
+    Folder mtimes catch changes that leave the python files alone: a new
+    (still empty) topic or slot folder, or files added to a slot without a
+    .py file yet. Topic folders are keyed (topic, TOPIC_KEY).
+    """
+    tree = walk_tree(tests_root, topics=topics, stat_files=True)
+    sigs: Dict[SlotKey, Tuple[Any, ...]] = {}
+    for topic in tree.topics.values():
+        sigs[(topic.name, TOPIC_KEY)] = (topic.mtime_ns,)
+    for topic, slot in tree.iter_slots():
+        stats = slot.file_stats or {}
+        sigs[(topic.name, slot.index)] = (slot.mtime_ns, *((name, *stats[name]) for name in slot.files_with_suffix('.py') if name in stats))
+    return sigs
+
+def watch(args: argparse.Namespace, test_slots: List[TestSlot], cache: Optional[AnalysisCache]) -> int:
+    """Poll the practices tree and regenerate artifacts when slots change.
+
+    Only slots whose python files were added, removed or modified are
+    re-evaluated; untouched slots keep their previous TestSlot. Artifacts are
+    rewritten only when their content changes.
+    """
+    def scope() -> List[str]:
+        topics = iter_topics(args.tests_root)
+        return [t for t in topics if t == args.only_topic] if args.only_topic else topics
+
+    def regenerate() -> None:
+        file_statuses = [fs for slot in test_slots for fs in slot.all_statuses]
+        emit_artifacts(args, args.date or _dt.datetime.now().strftime('%d-%m-%Y'), test_slots, stats.topic_stats, stats.totals, file_statuses, only_changed=True)
+
+    stats = StatsAccumulator(*aggregate(scope(), test_slots))
+    sigs = slot_signatures(args.tests_root, scope())
+    regenerate()
+    print(f'[watch] Watching {args.tests_root}/ (interval {args.watch_interval:g}s, Ctrl+C to stop)')
+    try:
+        while True:
+            time.sleep(args.watch_interval)
+            t0 = time.perf_counter()
+            topics = scope()
+            new_sigs = slot_signatures(args.tests_root, topics)
+            if new_sigs == sigs:
+                continue
+            changed = {k for k in sigs.keys() | new_sigs.keys() if sigs.get(k) != new_sigs.get(k)}
+            changed_topics = {topic for topic, _ in changed}
+            previous = {(s.topic, s.index): s for s in test_slots}
+            refreshed = discover_slots(args.tests_root, [t for t in topics if t in changed_topics])
+            stale = [s for s in refreshed if (s.topic, s.index) in changed]
+            evaluate_slots(stale, do_smoke=args.smoke, jobs=args.jobs, cache=cache)
+            refreshed = [s if (s.topic, s.index) in changed else previous.get((s.topic, s.index), s) for s in refreshed]
+            kept = [s for s in test_slots if s.topic in topics and s.topic not in changed_topics]
+            test_slots[:] = sorted(kept + refreshed, key=lambda s: (s.topic, s.index))
+            # Counters: rebuild only the changed topics
+            in_scope = set(topics)
+            for topic in [t for t in stats.topic_stats if t in changed_topics or t not in in_scope]:
+                stats.drop_topic(topic)
+            for topic in topics:
+                stats.add_topic(topic)
+            for slot in refreshed:
+                stats.add_slot(slot)
+            regenerate()
+            if cache is not None:
+                cache.save()
+            sigs = new_sigs
+            print(f'[watch] {len(stale)} slot(s) re-evaluated in {(time.perf_counter() - t0) * 1000:.0f} ms')
+    except KeyboardInterrupt:
+        print('\n[watch] stopped')
+    return 0
+
+# ------------------------------ Incremental Mode ----------------------------- #
+
+def slot_key(path: str, tests_root: str) -> Optional[Tuple[str, Optional[int]]]:
+    """(topic, slot index) a path under tests_root belongs to; index None for topic-level paths."""
+    rel = os.path.relpath(os.path.normpath(path), os.path.normpath(tests_root))
+    if rel == '.' or rel == '..' or rel.startswith('..' + os.sep):
+        return None
+    parts = rel.split(os.sep)
+    if len(parts) > 2 and SLOT_DIR_RE.match(parts[1]):
+        return parts[0], int(parts[1])
+    return parts[0], None
+
+def read_changed_paths(source: str) -> List[str]:
+    """Changed paths, one per line (e.g. `git diff --name-only`), from a file or '-' for stdin."""
+    if source == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as cf:
+            lines = cf.read().splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+def status_from_record(rec: Dict[str, Any]) -> FileStatus:
+    """Rebuild a FileStatus from a JSON 'files' record (inverse of file_record)."""
+    smoke = rec.get("smoke")
+    return FileStatus(
+        path=rec["path"],
+        status=rec["status"],
+        meaningful_loc=rec["meaningful_loc"],
+        warnings=list(rec["warnings"]),
+        smoke=SmokeResult(path=rec["path"], error=None, **smoke) if smoke else None,
+    )
+
+def run_incremental(args: argparse.Namespace, date_str: str, cache: Optional[AnalysisCache]) -> int:
+    """--since-json/--changed: patch the previous run's summary instead of rescanning.
+
+    Only topics containing a changed path are listed again and only the slots
+    holding a changed path are re-evaluated; every other slot, file record and
+    topic row is taken from the previous JSON summary. The previous summary must
+    come from a full run (no --only-topic) with the same heuristic flags.
+    """
+    with open(args.since_json, 'r', encoding='utf-8') as pf:
+        previous = json.load(pf)
+    changed_topics: Set[str] = set()
+    changed_slots: Set[SlotKey] = set()
+    for path in read_changed_paths(args.changed):
+        key = slot_key(path, args.tests_root)
+        if key is None or (args.only_topic and key[0] != args.only_topic):
+            continue
+        changed_topics.add(key[0])
+        if key[1] is not None:
+            changed_slots.add((key[0], key[1]))
+
+    # Previous per-slot file records, in report order
+    records: Dict[SlotKey, List[FileStatus]] = {}
+    for rec in previous.get("files", []):
+        key = slot_key(rec["path"], args.tests_root)
+        if key is not None and key[1] is not None:
+            records.setdefault((key[0], key[1]), []).append(compact_status(status_from_record(rec)))
+
+    stats = StatsAccumulator()
+    test_slots: List[TestSlot] = []
+    for t in previous.get("topics", []):
+        if t["topic"] in changed_topics or (args.only_topic and t["topic"] != args.only_topic):
+            continue
+        stats.add_stats(TopicStats(topic=t["topic"], capacity=t["capacity"], created=t["created"], python_files=t["python_files"],
+                                   resolved=t["resolved"], validated=t["validated"], remaining=t["remaining"]))
+    for (topic, idx), statuses in records.items():
+        if topic in stats.topic_stats:
+            test_slots.append(TestSlot(topic=topic, index=idx, created=True, python_files=[fs.path for fs in statuses],
+                                       file_status=primary_status(statuses), all_statuses=statuses))
+
+    # Touched topics: list again, re-evaluate changed slots, reuse the rest
+    with profile_phase('listing'):
+        tree = walk_tree(args.tests_root, topics=sorted(changed_topics))
+        fresh = slots_from_tree(tree)
+    stale: List[TestSlot] = []
+    for slot in fresh:
+        statuses = records.get((slot.topic, slot.index), [])
+        if (slot.topic, slot.index) in changed_slots or [fs.path for fs in statuses] != slot.python_files:
+            stale.append(slot)
+        elif statuses:
+            slot.all_statuses = statuses
+            slot.file_status = primary_status(statuses)
+    evaluate_slots(stale, do_smoke=args.smoke, jobs=args.jobs, cache=cache)
+    if cache is not None:
+        with profile_phase('cache_save'):
+            cache.save()
+    with profile_phase('aggregate'):
+        for topic in tree.topics:
+            stats.add_topic(topic)
+        for slot in fresh:
+            stats.add_slot(slot)
+    test_slots.extend(fresh)
+    test_slots.sort(key=lambda s: (s.topic, s.index))
+    file_statuses = [fs for slot in test_slots for fs in slot.all_statuses]
+    print(f'[incremental] {len(changed_topics)} topic(s) relisted, {len(stale)} slot(s) re-evaluated')
+
+    md = emit_artifacts(args, date_str, test_slots, stats.topic_stats, stats.totals, file_statuses)
+    if args.stdout:
+        print('\n' + md)
+    return 0
+
+# ------------------------------ Multi-Root Aggregation ----------------------- #
+
+@dataclasses.dataclass
+class RootScan:
+    root: str  # learner checkout as given on the command line
+    label: str  # output directory name under <roots-out>/roots/
+    topics: List[str]
+    slots: List[TestSlot]
+
+def root_labels(roots: List[str]) -> List[str]:
+    """Output names for the roots: the directory basename, suffixed on clashes."""
+    labels: List[str] = []
+    seen: Dict[str, int] = {}
+    for root in roots:
+        base = os.path.basename(os.path.abspath(root)) or 'root'
+        seen[base] = seen.get(base, 0) + 1
+        labels.append(base if seen[base] == 1 else f'{base}-{seen[base]}')
+    return labels
+
+def read_roots(args: argparse.Namespace) -> List[str]:
+    roots = list(args.roots or [])
+    if args.roots_file:
+        with open(args.roots_file, 'r', encoding='utf-8') as rf:
+            roots.extend(line.strip() for line in rf if line.strip() and not line.lstrip().startswith('#'))
+    return roots
+
+def scan_root(root: str, tests_dir: str, only_topic: Optional[str]) -> Optional[PracticeTree]:
+    """Walk <root>/<tests_dir> (falling back to the legacy tests/ folder); None if absent."""
+    tests_root = os.path.join(root, tests_dir)
+    if not os.path.isdir(tests_root) and tests_dir == 'practices' and os.path.isdir(os.path.join(root, 'tests')):
+        tests_root = os.path.join(root, 'tests')
+    if not os.path.isdir(tests_root):
+        return None
+    return scan_tree(tests_root, topics=[only_topic] if only_topic else None)
+
+def run_multi_root(args: argparse.Namespace, date_str: str, cache: Optional[AnalysisCache]) -> int:
+    """--roots: scan many checkouts and write per-root plus combined reports/badges.
+
+    Trees are walked concurrently, then every python file from every root is
+    evaluated in one batch (process pool, shared cache) with identical contents
+    analyzed once, so adding roots scales with the available cores.
+    """
+    import argparse
+    from concurrent.futures import ThreadPoolExecutor
+    roots = read_roots(args)
+    workers = min(32, max(4, args.jobs * 2), max(1, len(roots)))
+    with profile_phase('listing'):
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            trees = list(pool.map(lambda r: scan_root(r, args.tests_root, args.only_topic), roots))
+    scans: List[RootScan] = []
+    for root, label, tree in zip(roots, root_labels(roots), trees):
+        if tree is None:
+            print(f'[warn] {root}: no {args.tests_root}/ directory, skipped', file=sys.stderr)
+            continue
+        if PROFILER is not None:
+            PROFILER.listdir_calls += tree.scandir_calls
+        scans.append(RootScan(root=root, label=label, topics=list(tree.topics), slots=slots_from_tree(tree)))
+    if not scans:
+        print('[error] None of the given roots contain a practices tree', file=sys.stderr)
+        return 1
+
+    all_slots = [slot for scan in scans for slot in scan.slots]
+    evaluate_slots(all_slots, do_smoke=args.smoke, jobs=args.jobs, cache=cache)
+    if cache is not None:
+        with profile_phase('cache_save'):
+            cache.save(prune=not args.only_topic)
+
+    # Resolved history is per learner checkout; aggregation does not track it
+    root_args = argparse.Namespace(**{**vars(args), 'no_history': True, 'stdout': False})
+    combined = StatsAccumulator()
+    combined_files: List[FileStatus] = []
+    roots_summary: List[Dict[str, Any]] = []
+    for scan in scans:
+        with profile_phase('aggregate'):
+            topic_stats, agg = aggregate(scan.topics, scan.slots)
+            for t in topic_stats.values():
+                combined.add_stats(t)
+        file_statuses = [fs for slot in scan.slots for fs in slot.all_statuses]
+        combined_files.extend(file_statuses)
+        emit_artifacts(root_args, date_str, scan.slots, topic_stats, agg, file_statuses,
+                       out_dir=os.path.join(args.roots_out, 'roots', scan.label))
+        roots_summary.append({"root": scan.root, "label": scan.label, "totals": build_json_summary(date_str, topic_stats, agg, {})["totals"]})
+
+    combined_args = argparse.Namespace(**{**vars(args), 'no_history': True})
+    md = emit_artifacts(combined_args, date_str, all_slots, combined.topic_stats, combined.totals, combined_files,
+                        out_dir=args.roots_out, extra_json={"roots": roots_summary})
+    print(f'[roots] {len(scans)} root(s), {len(combined_files)} files -> {args.roots_out}/')
+    if args.stdout:
+        print('\n' + md)
+    return 0
+
+# ------------------------------ Library API --------------------------------- #
+
+def warning_code(warning: str) -> str:
+    """'high_complexity:solve:12' -> 'high_complexity'."""
+    return warning.split(':', 1)[0]
+
+@dataclasses.dataclass
+class _IndexSnapshot:
+    collected_at: float
+    test_slots: List[TestSlot]
+    topic_stats: Dict[str, TopicStats]
+    totals: Aggregate
+    file_statuses: List[FileStatus]
+    slots_by_topic: Dict[str, List[TestSlot]]
+    files_by_path: Dict[str, FileStatus]
+    files_by_status: Dict[str, List[FileStatus]]
+    files_by_warning: Dict[str, List[FileStatus]]
+    topic_of: Dict[str, str]  # file path -> topic
+
+class ProgressIndex:
+    """Query-ready, in-memory view of a practices tree for in-process consumers.
+
+    The tree is collected once (through the same collect() the CLI uses) and
+    indexed by topic, status and warning code; queries never touch the disk.
+    refresh() re-collects - unchanged files are served from an in-memory
+    AnalysisCache with a single stat() each - and swaps the snapshot
+    atomically, so concurrent readers always see a consistent state.
+    max_age (seconds) makes ensure_fresh() refresh lazily, and
+    refresh_if_changed() re-collects only when the tree's mtime signature
+    moved (long-running consumers such as --serve poll it). version counts
+    refreshes. Heuristic settings are module globals, so they are applied for
+    the duration of each refresh.
+    """
+
+    def __init__(self, tests_root: str = 'practices', *, only_topic: Optional[str] = None, jobs: int = 1,
+                 smoke: bool = False, use_cache: bool = True, persist_cache: bool = False,
+                 enforce_docstrings: bool = False, complexity_threshold: int = 15,
+                 max_age: Optional[float] = None, lazy: bool = False, level: str = 'full'):
+        self.tests_root = tests_root
+        self.only_topic = only_topic
+        self.jobs = jobs
+        self.smoke = smoke
+        self.persist_cache = persist_cache
+        self.enforce_docstrings = enforce_docstrings
+        self.complexity_threshold = complexity_threshold
+        self.level = level  # ANALYSIS_LEVEL; 'status' skips parsing (no warnings/LOC to query)
+        self.max_age = max_age
+        self._cache: Optional[AnalysisCache] = None
+        self._use_cache = use_cache
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_IndexSnapshot] = None
+        self._signature: Optional[Tuple[Any, ...]] = None
+        self.version = 0
+        self.changed_at: Optional[float] = None  # wall-clock time of the last refresh
+        if not lazy:
+            self.refresh()
+
+    # -- lifecycle -------------------------------------------------------------
+
+    def refresh(self) -> None:
+        """Re-collect the tree and rebuild the indexes."""
+        global DOCSTRING_ENFORCE, COMPLEXITY_THRESHOLD, ANALYSIS_LEVEL
+        with self._lock:
+            signature = self.tree_signature()  # taken first: edits made during the collect show up next poll
+            saved = (DOCSTRING_ENFORCE, COMPLEXITY_THRESHOLD, ANALYSIS_LEVEL)
+            DOCSTRING_ENFORCE, COMPLEXITY_THRESHOLD, ANALYSIS_LEVEL = self.enforce_docstrings, self.complexity_threshold, self.level
+            try:
+                if self._use_cache and self._cache is None:
+                    self._cache = AnalysisCache()
+                    if self.persist_cache:
+                        self._cache.load()
+                test_slots, topic_stats, totals, file_statuses = collect(
+                    self.tests_root, do_smoke=self.smoke, only_topic=self.only_topic, jobs=self.jobs, cache=self._cache)
+                if self._cache is not None and self.persist_cache:
+                    self._cache.save(prune=not self.only_topic)
+            finally:
+                DOCSTRING_ENFORCE, COMPLEXITY_THRESHOLD, ANALYSIS_LEVEL = saved
+            self._snapshot = self._build(test_slots, topic_stats, totals, file_statuses)
+            self._signature = signature
+            self.version += 1
+            self.changed_at = time.time()
+
+    def tree_signature(self) -> Tuple[Any, ...]:
+        """Topics plus folder mtimes and (name, mtime_ns, size) of every slot's python files; a cheap stat-only walk."""
+        topics = iter_topics(self.tests_root)
+        if self.only_topic:
+            topics = [t for t in topics if t == self.only_topic]
+        return tuple(topics), slot_signatures(self.tests_root, topics)
+
+    def refresh_if_changed(self) -> bool:
+        """Refresh when files, slots or topics changed since the last refresh; True if it did."""
+        if self._snapshot is not None and self.tree_signature() == self._signature:
+            return False
+        self.refresh()
+        return True
+
+    def ensure_fresh(self) -> None:
+        """Refresh if never collected or older than max_age seconds."""
+        snap = self._snapshot
+        if snap is None or (self.max_age is not None and time.monotonic() - snap.collected_at > self.max_age):
+            self.refresh()
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last refresh (None before the first one)."""
+        snap = self._snapshot
+        return None if snap is None else time.monotonic() - snap.collected_at
+
+    @staticmethod
+    def _build(test_slots: List[TestSlot], topic_stats: Dict[str, TopicStats], totals: Aggregate,
+               file_statuses: List[FileStatus]) -> _IndexSnapshot:
+        slots_by_topic: Dict[str, List[TestSlot]] = {topic: [] for topic in topic_stats}
+        topic_of: Dict[str, str] = {}
+        for slot in test_slots:
+            slots_by_topic.setdefault(slot.topic, []).append(slot)
+            for fs in slot.all_statuses:
+                topic_of[fs.path] = slot.topic
+        files_by_status: Dict[str, List[FileStatus]] = {}
+        files_by_warning: Dict[str, List[FileStatus]] = {}
+        for fs in file_statuses:
+            files_by_status.setdefault(fs.status, []).append(fs)
+            for code in dict.fromkeys(warning_code(w) for w in fs.warnings):
+                files_by_warning.setdefault(code, []).append(fs)
+        return _IndexSnapshot(
+            collected_at=time.monotonic(),
+            test_slots=test_slots,
+            topic_stats=topic_stats,
+            totals=totals,
+            file_statuses=file_statuses,
+            slots_by_topic=slots_by_topic,
+            files_by_path={fs.path: fs for fs in file_statuses},
+            files_by_status=files_by_status,
+            files_by_warning=files_by_warning,
+            topic_of=topic_of,
+        )
+
+    def _snap(self) -> _IndexSnapshot:
+        self.ensure_fresh()
+        return self._snapshot  # type: ignore[return-value]
+
+    # -- queries -----------------------------------------------------------------
+
+    @property
+    def topics(self) -> List[str]:
+        return sorted(self._snap().topic_stats)
+
+    @property
+    def totals(self) -> Aggregate:
+        return self._snap().totals
+
+    def topic(self, name: str) -> Optional[TopicStats]:
+        return self._snap().topic_stats.get(name)
+
+    def slots(self, topic: str) -> List[TestSlot]:
+        return list(self._snap().slots_by_topic.get(topic, []))
+
+    def file(self, path: str) -> Optional[FileStatus]:
+        return self._snap().files_by_path.get(path)
+
+    def files(self, status: Optional[str] = None, topic: Optional[str] = None, warning: Optional[str] = None) -> List[FileStatus]:
+        """Files matching every given filter (status keyword, topic name, warning code), in report order."""
+        snap = self._snap()
+        if warning is not None:
+            candidates = snap.files_by_warning.get(warning, [])
+        elif status is not None:
+            candidates = snap.files_by_status.get(status, [])
+        elif topic is not None:
+            candidates = [fs for slot in snap.slots_by_topic.get(topic, []) for fs in slot.all_statuses]
+        else:
+            candidates = snap.file_statuses
+        return [fs for fs in candidates
+                if (status is None or fs.status == status) and (topic is None or snap.topic_of.get(fs.path) == topic)]
+
+    def with_warning(self, code: str) -> List[FileStatus]:
+        return list(self._snap().files_by_warning.get(code, []))
+
+    def status_counts(self) -> Dict[str, int]:
+        return status_breakdown(self._snap().file_statuses)
+
+    def warning_counts(self) -> Dict[str, int]:
+        return {code: len(files) for code, files in sorted(self._snap().files_by_warning.items())}
+
+    # -- report builders -----------------------------------------------------------
+
+    def summary(self, date_str: Optional[str] = None) -> Dict[str, Any]:
+        """The JSON summary (without per-file records) as a dict."""
+        snap = self._snap()
+        return build_json_summary(date_str or _dt.datetime.now().strftime('%d-%m-%Y'), snap.topic_stats, snap.totals, status_breakdown(snap.file_statuses))
+
+    def to_json(self, date_str: Optional[str] = None) -> Dict[str, Any]:
+        snap = self._snap()
+        return build_json(date_str or _dt.datetime.now().strftime('%d-%m-%Y'), snap.topic_stats, snap.totals, snap.file_statuses)
+
+    def markdown(self, date_str: Optional[str] = None) -> str:
+        snap = self._snap()
+        return build_markdown(date_str or _dt.datetime.now().strftime('%d-%m-%Y'), snap.topic_stats, snap.totals, snap.file_statuses)
+
+# ------------------------------ Progress Server ------------------------------ #
+
+SERVE_GZIP_MIN_BYTES = 256  # smaller bodies are not worth compressing
+
+@dataclasses.dataclass(slots=True)
+class Payload:
+    body: bytes
+    gzipped: Optional[bytes]
+    content_type: str
+    etag: str
+    modified: float  # epoch seconds the body last changed (Last-Modified)
+
+class ProgressServer:
+    """HTTP front-end for a live ProgressIndex (stdlib ThreadingHTTPServer).
+
+    Every endpoint is rendered at most once per index version and kept as
+    ready-to-send bytes plus a gzip copy. The ETag is a hash of the body and
+    Last-Modified only moves when that endpoint's body actually changes, so a
+    poll that finds nothing new costs one dictionary lookup and a 304. A
+    background thread polls the tree's mtimes and refreshes the index when
+    something changed.
+    """
+
+    def __init__(self, index: ProgressIndex, date_str: Optional[str] = None, poll_interval: float = 1.0):
+        self.index = index
+        self.date_str = date_str
+        self.poll_interval = poll_interval
+        self._payloads: Dict[str, Tuple[Tuple[int, str], Payload]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.routes: Dict[str, Tuple[str, Callable[[str], bytes]]] = {
+            '/progress.json': ('application/json', lambda d: self._json(index.to_json(d))),
+            '/summary.json': ('application/json', lambda d: self._json(index.summary(d))),
+            '/progress.md': ('text/markdown; charset=utf-8', lambda d: index.markdown(d).encode('utf-8')),
+            '/progress.csv': ('text/csv; charset=utf-8', lambda d: build_csv(index._snap().topic_stats).encode('utf-8')),
+            '/badges/validated.json': ('application/json', lambda d: self._badge('validated')),
+            '/badges/resolved.json': ('application/json', lambda d: self._badge('resolved')),
+        }
+
+    @staticmethod
+    def _json(data: Any) -> bytes:
+        return (json.dumps(data, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+    def _badge(self, name: str) -> bytes:
+        snap = self.index._snap()
+        return (json.dumps(build_badges(snap.topic_stats, snap.totals)[name], indent=2) + '\n').encode('utf-8')
+
+    def payload(self, path: str) -> Optional[Payload]:
+        """Rendered response for an endpoint (None for unknown paths)."""
+        import gzip
+        import hashlib
+        route = self.routes.get(path)
+        if route is None:
+            return None
+        date_str = self.date_str or _dt.datetime.now().strftime('%d-%m-%Y')
+        key = (self.index.version, date_str)
+        with self._lock:
+            cached = self._payloads.get(path)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            content_type, render = route
+            body = render(date_str)
+            etag = 'W/"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+            if cached is not None and cached[1].etag == etag:
+                current = cached[1]  # re-rendered but identical: keep Last-Modified
+            else:
+                gzipped = gzip.compress(body, mtime=0) if len(body) >= SERVE_GZIP_MIN_BYTES else None
+                current = Payload(body=body, gzipped=gzipped, content_type=content_type, etag=etag, modified=self.index.changed_at or time.time())
+            self._payloads[path] = (key, current)
+            return current
+
+    def poll(self) -> None:
+        """Refresh the index whenever the tree changes (runs until stop())."""
+        while not self._stop.wait(self.poll_interval):
+            t0 = time.perf_counter()
+            try:
+                if self.index.refresh_if_changed():
+                    print(f'[serve] refreshed (version {self.index.version}) in {(time.perf_counter() - t0) * 1000:.0f} ms')
+            except Exception as e:  # pragma: no cover - keep serving the last good snapshot
+                print(f'[warn] refresh failed: {e}', file=sys.stderr)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def make_server(self, host: str, port: int) -> ThreadingHTTPServer:
+        from http.server import ThreadingHTTPServer
+        return ThreadingHTTPServer((host, port), _make_handler(self))
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    return any((tag.strip()[2:] if tag.strip().startswith('W/') else tag.strip()) == opaque for tag in header.split(','))
+
+def _accepts_gzip(header: str) -> bool:
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding.strip().lower() in ('gzip', '*'):
+            return params.replace(' ', '').lower() not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+def _make_handler(server: ProgressServer) -> type:
+    import email.utils
+    from http.server import BaseHTTPRequestHandler
+
+    class ProgressRequestHandler(BaseHTTPRequestHandler):
+        server_version = 'generate_progress'
+
+        def do_GET(self) -> None:
+            self._respond(head=False)
+
+        def do_HEAD(self) -> None:
+            self._respond(head=True)
+
+        def _respond(self, head: bool) -> None:
+            path = self.path.split('?', 1)[0].rstrip('/') or '/'
+            if path == '/':
+                body = server._json({"endpoints": sorted(server.routes)})
+                self._send(200, body, 'application/json', head=head)
+                return
+            payload = server.payload(path)
+            if payload is None:
+                self._send(404, b'not found\n', 'text/plain; charset=utf-8', head=head)
+                return
+            headers = {
+                'ETag': payload.etag,
+                'Last-Modified': email.utils.formatdate(payload.modified, usegmt=True),
+                'Cache-Control': 'no-cache',
+                'Vary': 'Accept-Encoding',
+            }
+            if_none_match = self.headers.get('If-None-Match')
+            if if_none_match is not None:
+                not_modified = _etag_matches(if_none_match, payload.etag)
+            else:
+                not_modified = False
+                ims = self.headers.get('If-Modified-Since')
+                if ims:
+                    try:
+                        not_modified = int(payload.modified) <= email.utils.parsedate_to_datetime(ims).timestamp()
+                    except (TypeError, ValueError):
+                        pass
+            if not_modified:
+                self._send(304, b'', None, headers, head=True)
+                return
+            body = payload.body
+            if payload.gzipped is not None and _accepts_gzip(self.headers.get('Accept-Encoding', '')):
+                body = payload.gzipped
+                headers['Content-Encoding'] = 'gzip'
+            self._send(200, body, payload.content_type, headers, head=head)
+
+        def _send(self, code: int, body: bytes, content_type: Optional[str], headers: Optional[Dict[str, str]] = None,
+                  head: bool = False) -> None:
+            self.send_response(code)
+            if content_type:
+                self.send_header('Content-Type', content_type)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            if code != 304:
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if not head:
+                self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - BaseHTTPRequestHandler signature
+            pass  # polling dashboards would flood the console
+
+    return ProgressRequestHandler
+
+def serve(args: argparse.Namespace) -> int:
+    """--serve: keep a live ProgressIndex and answer HTTP requests until Ctrl+C."""
+    index = ProgressIndex(args.tests_root, only_topic=args.only_topic, jobs=args.jobs, smoke=args.smoke,
+                          persist_cache=not args.no_cache,
+                          enforce_docstrings=args.enforce_docstrings, complexity_threshold=args.complexity_threshold)
+    app = ProgressServer(index, date_str=args.date, poll_interval=args.watch_interval)
+    try:
+        httpd = app.make_server(args.serve_host, args.serve)
+    except OSError as e:
+        print(f'[error] Cannot listen on {args.serve_host}:{args.serve}: {e}', file=sys.stderr)
+        return 2
+    poller = threading.Thread(target=app.poll, name='progress-poll', daemon=True)
+    poller.start()
+    host, port = httpd.server_address[:2]
+    print(f'[serve] http://{host}:{port}/ ({", ".join(sorted(app.routes))}); polling every {args.watch_interval:g}s, Ctrl+C to stop')
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print('\n[serve] stopped')
+    finally:
+        app.stop()
+        httpd.server_close()
+    return 0
+
+# ------------------------------ Daemon --------------------------------------- #
+
+DAEMON_SOCKET_PATH = os.path.join('.progress_state', 'daemon.sock')
+# Modes that run until interrupted (or start another daemon) are refused over the socket.
+DAEMON_REFUSED = ('daemon', 'serve', 'watch')
+
+# Resident analysis caches (one per heuristic_config()) while --daemon is running; open_cache() hands
+# these out instead of loading the JSON cache from disk on every invocation.
+RESIDENT_CACHES: Optional[Dict[str, AnalysisCache]] = None
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that forwards complete lines to the client as {"<channel>": text} JSON frames."""
+
+    def __init__(self, sock_file: IO[bytes], channel: str):
+        self._file = sock_file
+        self._channel = channel
+        self._buf = ''
+        self.closed_by_peer = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self._buf += s
+        if '\n' in self._buf:
+            text, _, self._buf = self._buf.rpartition('\n')
+            self._send(text + '\n')
+        return len(s)
+
+    def flush(self) -> None:
+        if self._buf:
+            text, self._buf = self._buf, ''
+            self._send(text)
+
+    def _send(self, text: str) -> None:
+        send_frame(self._file, {self._channel: text})
+
+def send_frame(sock_file: IO[bytes], frame: Dict[str, Any]) -> None:
+    """One newline-delimited JSON frame; a client that hung up is ignored so the run still completes."""
+    try:
+        sock_file.write(json.dumps(frame).encode('utf-8') + b'\n')
+        sock_file.flush()
+    except OSError:
+        pass
+
+def daemon_execute(argv: List[str]) -> int:
+    """One forwarded invocation inside the daemon (output goes to the redirected stdout/stderr)."""
+    global ANALYSIS_STATS
+    try:
+        args = build_parser().parse_args(argv)
+    except SystemExit as e:  # usage errors were already printed to the redirected stderr
+        return e.code if isinstance(e.code, int) else 2
+    refused = [f'--{name}' for name in DAEMON_REFUSED if getattr(args, name) not in (None, False)]
+    if refused:
+        print(f'[error] {", ".join(refused)} cannot run through the daemon; invoke generate_progress.py directly', file=sys.stderr)
+        return 2
+    ANALYSIS_STATS = AnalysisStats()
+    try:
+        return execute(args)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    except Exception:  # keep serving; the traceback goes to the client
+        import traceback
+        traceback.print_exc()
+        return 1
+
+def _make_daemon_handler(stop: threading.Event) -> type:
+    import socketserver
+
+    class DaemonRequestHandler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            line = self.rfile.readline()
+            if not line.strip():
+                return  # connect-and-close liveness probe (e.g. a second --daemon checking the socket)
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = None
+            command = request.get("command", "run") if isinstance(request, dict) else None
+            argv, cwd = (request.get("argv"), request.get("cwd")) if command == 'run' else ([], '')
+            if command not in ('run', 'ping', 'stop') or not isinstance(argv, list) or not isinstance(cwd, str):
+                send_frame(self.wfile, {"err": '[error] Malformed daemon request\n', "exit": 2})
+                return
+            if command == 'ping':
+                send_frame(self.wfile, {"out": f'[daemon] pid {os.getpid()} serving {os.getcwd()}\n', "exit": 0})
+                return
+            if command == 'stop':
+                stop.set()
+                send_frame(self.wfile, {"out": '[daemon] stopping\n', "exit": 0})
+                return
+            if os.path.realpath(cwd) != os.path.realpath(os.getcwd()):
+                send_frame(self.wfile, {"err": f'[error] This daemon serves {os.getcwd()}; start one in {cwd}\n', "exit": 2})
+                return
+            out, err = _FrameWriter(self.wfile, 'out'), _FrameWriter(self.wfile, 'err')
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                code = daemon_execute([str(a) for a in argv])
+                out.flush()
+                err.flush()
+            send_frame(self.wfile, {"exit": code})
+
+    return DaemonRequestHandler
+
+def daemon(args: argparse.Namespace) -> int:
+    """--daemon: answer forwarded CLI invocations on a Unix socket, keeping analysis caches in memory.
+
+    Requests are handled one at a time (the heuristic settings are module globals),
+    each with the working directory the daemon was started in. The tree itself is
+    re-walked per request (a directory listing is cheap; stale trees are not), and
+    unchanged files are answered from the resident cache without touching disk.
+    """
+    global RESIDENT_CACHES
+    import signal
+    import socket
+    import socketserver
+    if not hasattr(socket, 'AF_UNIX'):
+        print('[error] --daemon needs Unix domain sockets, which this platform does not provide', file=sys.stderr)
+        return 2
+    path = args.daemon_socket
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)  # left behind by a daemon that did not shut down cleanly
+        else:
+            print(f'[error] A daemon is already listening on {path}', file=sys.stderr)
+            return 2
+        finally:
+            probe.close()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    stop = threading.Event()
+    server = socketserver.UnixStreamServer(path, _make_daemon_handler(stop))
+    server.timeout = 0.5  # how quickly a --stop or SIGTERM is noticed between requests
+    previous = signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    RESIDENT_CACHES = {}
+    print(f'[daemon] pid {os.getpid()} listening on {path}; run scripts/progress_client.py [ARGS...], --stop to shut down')
+    try:
+        while not stop.is_set():
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+        signal.signal(signal.SIGTERM, previous)
+        RESIDENT_CACHES = None
+    print('[daemon] stopped')
+    return 0
+
+# ------------------------------ History Queries ------------------------------ #
+
+def history_query(args: argparse.Namespace) -> int:
+    """Answer --history-between / --history-velocity from the resolved history index."""
+    from resolved_history import HISTORY_LOG_PATH, LEGACY_HISTORY_PATH, ResolvedHistory
+    if not os.path.exists(HISTORY_LOG_PATH) and not os.path.exists(LEGACY_HISTORY_PATH):
+        print(f'[error] No resolved history found ({HISTORY_LOG_PATH})', file=sys.stderr)
+        return 1
+    start, end = args.history_between or (None, None)
+    with ResolvedHistory() as history:
+        migrated = history.migrate_json()
+        if migrated is not None:
+            print(f'[info] Migrated {migrated} entries from {LEGACY_HISTORY_PATH} to {history.path}', file=sys.stderr)
+        if args.history_velocity:
+            rows = history.velocity(start, end)
+            print("| Topic | Resolved | First | Last | Per Week |")
+            print("|-------|----------|-------|------|----------|")
+            for row in rows:
+                print(f"| {row['topic']} | {row['resolved']} | {row['first']} | {row['last']} | {row['per_week']:.2f} |")
+        else:
+            print("| Practice | First Seen |")
+            print("|------|------------|")
+            for ident, first_seen in history.between(start, end):
+                print(f"| {ident} | {first_seen} |")
+    return 0
+
+# ------------------------------ Main CLI ------------------------------------- #
+
+def build_parser() -> argparse.ArgumentParser:
+    import argparse
     parser = argparse.ArgumentParser(description="Generate progress markdown, JSON summary, and badges (practices).")
     parser.add_argument('--tests-root', default='practices', help='Root directory containing topic folders (default: practices)')
     parser.add_argument('--date', default=None, help='Override date (format DD-MM-YYYY); default: today')
@@ -444,10 +2456,16 @@ def main(argv: Optional[List[str]] = None) -> int:
     parser.add_argument('--no-badges', action='store_true', help='Skip writing badge files')
     parser.add_argument('--stdout', action='store_true', help='Print markdown to stdout')
     parser.add_argument('--smoke', action='store_true', help='Run smoke execution for RESOLVED/VALIDATED primary files')
+    parser.add_argument('--smoke-timeout', type=float, default=SMOKE_TIMEOUT, help=f'Wall-clock limit per smoke-executed file in seconds (default: {SMOKE_TIMEOUT:g})')
+    parser.add_argument('--smoke-memory-mb', type=int, default=SMOKE_MEMORY_MB, help=f'Address-space (virtual memory, RLIMIT_AS) limit per smoke-executed file in MB, 0 = unlimited (default: {SMOKE_MEMORY_MB}). Imports such as numpy/pandas reserve large virtual mappings; raise this or use 0 if they fail with MemoryError/smoke_killed')
+    parser.add_argument('--smoke-jobs', type=int, default=SMOKE_JOBS, help='Concurrent smoke subprocesses (default: 0 = CPU count, independent of --jobs)')
     parser.add_argument('--only-topic', default=None, help='Limit scan to a single topic (speeds up incremental work)')
     parser.add_argument('--list-topics', action='store_true', help='List available topics and exit')
     parser.add_argument('--no-history', action='store_true', help='Skip resolved history tracking/delta generation')
+    parser.add_argument('--history-between', nargs=2, metavar=('START', 'END'), default=None, help='List practices first resolved between two dates (DD-MM-YYYY, inclusive) and exit')
+    parser.add_argument('--history-velocity', action='store_true', help='Print per-topic resolved counts and items/week from the history and exit (bounded by --history-between if given)')
     parser.add_argument('--export-csv', action='store_true', help='Also export a CSV summary file')
+    parser.add_argument('--export-snapshot', action='store_true', help='Also write the JSON summary as a compact binary snapshot (progress/progressDD_MM_YYYY.snap, see progress_snapshot.py)')
     parser.add_argument('--promote', action='store_true', help='Promote eligible TODO files to RESOLVED based on heuristics')
     parser.add_argument('--promote-threshold', type=int, default=3, help='Meaningful LOC threshold for promotion (default: 3)')
     parser.add_argument('--promote-allow-pass', type=int, default=0, help='Allow up to N pass statements during promotion (default: 0)')
@@ -456,20 +2474,119 @@ def main(argv: Optional[List[str]] = None) -> int:
     parser.add_argument('--complexity-threshold', type=int, default=15, help='Cyclomatic complexity threshold (default: 15)')
     parser.add_argument('--create-missing', action='store_true', help='Create missing test folders with starter markdown (and optional .py)')
     parser.add_argument('--create-with-py', action='store_true', help='When creating missing tests also add a starter .py file')
-    args = parser.parse_args(argv)
+    parser.add_argument('--jobs', type=int, default=1, help='Evaluate python files with N parallel workers (default: 1, serial; see --smoke-jobs for smoke runs)')
+    parser.add_argument('--watch', action='store_true', help='Keep running: poll the practices tree and regenerate artifacts when files change')
+    parser.add_argument('--watch-interval', type=float, default=0.5, help='Polling interval for --watch/--serve in seconds (default: 0.5)')
+    parser.add_argument('--serve', type=int, default=None, metavar='PORT', help='Serve the JSON/Markdown/CSV reports and badges over HTTP from a live in-memory index (no files written)')
+    parser.add_argument('--serve-host', default='127.0.0.1', help='Interface for --serve (default: 127.0.0.1)')
+    parser.add_argument('--daemon', action='store_true', help='Stay resident and answer scripts/progress_client.py invocations over a Unix socket (analysis caches kept in memory)')
+    parser.add_argument('--daemon-socket', default=DAEMON_SOCKET_PATH, help=f'Socket path for --daemon (default: {DAEMON_SOCKET_PATH})')
+    parser.add_argument('--since-json', default=None, help="Previous run's JSON summary to update incrementally (requires --changed)")
+    parser.add_argument('--changed', default=None, help="File listing changed paths, one per line (e.g. git diff --name-only); '-' reads stdin")
+    parser.add_argument('--roots', nargs='+', metavar='ROOT', default=None, help='Aggregate many learner checkouts (each containing the tests root); writes per-root and combined reports under --roots-out')
+    parser.add_argument('--roots-file', default=None, help='File listing one checkout root per line (combined with --roots)')
+    parser.add_argument('--roots-out', default='aggregate', help='Output directory for --roots reports and badges (default: aggregate)')
+    parser.add_argument('--stream', action='store_true', help='Write the Markdown/JSON reports incrementally while scanning (bounded memory for huge trees; same output)')
+    parser.add_argument('--analysis-level', choices=('auto',) + ANALYSIS_LEVELS, default='auto',
+                        help='status: leading status line only; light: plus line heuristics; full: plus AST checks. '
+                             'auto (default) uses status when no Markdown/JSON report is produced (e.g. badge-only runs), else full')
+    parser.add_argument('--no-dedupe', action='store_true', help='Analyze every file separately even when contents are identical (default: identical contents are analyzed once)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not update the analysis cache (.progress_state/analysis_cache.json)')
+    parser.add_argument('--profile', action='store_true', help='Record per-phase wall/CPU time, per-file analysis time and I/O counters; print a report and embed it in the JSON summary')
+    parser.add_argument('--profile-top', type=int, default=10, help='Number of slowest files listed by --profile (default: 10)')
+    parser.add_argument('--profile-dump', default=None, help='Also write cProfile statistics (pstats format) to this path')
+    return parser
 
+
+def main(argv: Optional[List[str]] = None) -> int:
+    return execute(build_parser().parse_args(argv))
+
+def execute(args: argparse.Namespace) -> int:
+    """Run one parsed invocation (the CLI and requests forwarded to --daemon)."""
+    global PROFILER
+    if not (args.profile or args.profile_dump):
+        return report_analysis(run(args))
+
+    import cProfile
+    PROFILER = Profiler(top=args.profile_top)
+    cprof = cProfile.Profile() if args.profile_dump else None
+    if cprof is not None:
+        cprof.enable()
+    try:
+        with profile_phase('total'):
+            return report_analysis(run(args))
+    finally:
+        if cprof is not None:
+            cprof.disable()
+            cprof.dump_stats(args.profile_dump)
+            print(f'[written] {args.profile_dump}')
+        print(PROFILER.format_report())
+        PROFILER = None
+
+
+def analysis_level(args: argparse.Namespace) -> str:
+    """--analysis-level, resolving auto from what the run will write."""
+    if args.analysis_level != 'auto':
+        return args.analysis_level
+    if args.serve is not None or not args.no_md or not args.no_json or args.export_snapshot or args.stdout:
+        return 'full'
+    return 'status'  # badges, history and CSV only need each slot's status
+
+def report_analysis(code: int) -> int:
+    """Print the dedupe line when identical contents were analyzed once; passes the exit code through."""
+    if ANALYSIS_STATS.deduplicated:
+        print(ANALYSIS_STATS.format())
+    return code
+
+def open_cache(args: argparse.Namespace, path: str = ANALYSIS_CACHE_PATH) -> Optional[AnalysisCache]:
+    """Analysis cache: unchanged files are served without re-reading/re-parsing."""
+    if args.no_cache:
+        return None
+    key = json.dumps([path, heuristic_config()], sort_keys=True)
+    if RESIDENT_CACHES is not None and key in RESIDENT_CACHES:
+        cache = RESIDENT_CACHES[key]
+        cache.begin_run()
+        return cache
+    cache = AnalysisCache(path)
+    with profile_phase('cache_load'):
+        cache.load()
+    if RESIDENT_CACHES is not None:
+        RESIDENT_CACHES[key] = cache
+    return cache
+
+def run(args: argparse.Namespace) -> int:
+    global DOCSTRING_ENFORCE, COMPLEXITY_THRESHOLD, SMOKE_TIMEOUT, SMOKE_MEMORY_MB, SMOKE_JOBS, DEDUPE_ANALYSIS, ANALYSIS_LEVEL
     date_str = args.date or _dt.datetime.now().strftime('%d-%m-%Y')
 
+    if args.daemon:
+        return daemon(args)
+
     # Topic list support
     if args.list_topics:
         for t in iter_topics(args.tests_root):
             print(t)
         return 0
 
+    # History queries (read-only; no scan)
+    if args.history_between or args.history_velocity:
+        return history_query(args)
+
     # Apply config
-    global DOCSTRING_ENFORCE, COMPLEXITY_THRESHOLD
     DOCSTRING_ENFORCE = args.enforce_docstrings
     COMPLEXITY_THRESHOLD = args.complexity_threshold
+    SMOKE_TIMEOUT = args.smoke_timeout
+    SMOKE_MEMORY_MB = args.smoke_memory_mb
+    SMOKE_JOBS = args.smoke_jobs
+    DEDUPE_ANALYSIS = not args.no_dedupe
+    ANALYSIS_LEVEL = analysis_level(args)
+
+    # Multi-root aggregation: roots are resolved per checkout, nothing local is scanned
+    if args.roots or args.roots_file:
+        if args.stream or args.watch or args.promote or args.generate_harness or args.create_missing or args.serve is not None:
+            print('[error] --roots cannot be combined with --stream, --watch, --serve, --promote, --generate-harness or --create-missing', file=sys.stderr)
+            return 2
+        # Own cache file: pruning by this run's lookups must not evict the local tree's entries (or vice versa)
+        return run_multi_root(args, date_str, open_cache(args, os.path.join(args.roots_out, ANALYSIS_CACHE_PATH)))
 
     # Resolve root (support legacy 'tests' directory if 'practices' not present)
     if not os.path.isdir(args.tests_root):
@@ -486,12 +2603,10 @@ def main(argv: Optional[List[str]] = None) -> int:
     if args.create_missing:
         def slugify(topic: str) -> str:
             return re.sub(r'([a-z0-9])([A-Z])', r'\1-\2', topic).lower()
-        topics_scope = iter_topics(args.tests_root)
-        if args.only_topic:
-            topics_scope = [t for t in topics_scope if t == args.only_topic]
-        for topic in topics_scope:
-            topic_path = os.path.join(args.tests_root, topic)
-            existing_indices = {int(d) for d in os.listdir(topic_path) if d.isdigit()}
+        scope_tree = walk_tree(args.tests_root, topics=[args.only_topic] if args.only_topic else None, with_files=False)
+        for topic, topic_dir in scope_tree.topics.items():
+            topic_path = topic_dir.path
+            existing_indices = set(topic_dir.slots)
             existing_max = max(existing_indices) if existing_indices else 0
             target_upper = max(existing_max, DEFAULT_LEGACY_TOTAL_PER_TOPIC)
             for idx in range(1, target_upper + 1):
@@ -522,8 +2637,30 @@ def main(argv: Optional[List[str]] = None) -> int:
                         with open(py_path, 'w', encoding='utf-8') as pf:
                             pf.write("# TODO: Implement solution for this practice\n\n")
         print('[created] Missing practice folders initialized.')
+    if args.serve is not None:
+        if args.stream or args.watch or args.promote or args.generate_harness or args.since_json or args.changed:
+            print('[error] --serve cannot be combined with --stream, --watch, --promote, --generate-harness or --since-json', file=sys.stderr)
+            return 2
+        return serve(args)
+    cache = open_cache(args)
+    if args.since_json or args.changed:
+        if not (args.since_json and args.changed):
+            print('[error] --since-json and --changed must be given together', file=sys.stderr)
+            return 2
+        if args.stream or args.watch or args.promote or args.generate_harness:
+            print('[error] --since-json cannot be combined with --stream, --watch, --promote or --generate-harness', file=sys.stderr)
+            return 2
+        return run_incremental(args, date_str, cache)
+    if args.stream:
+        if args.watch or args.promote or args.generate_harness or args.export_snapshot:
+            print('[error] --stream cannot be combined with --watch, --promote, --generate-harness or --export-snapshot', file=sys.stderr)
+            return 2
+        return run_streaming(args, date_str, cache)
     # Initial collection after potential creation (or fallback)
-    test_slots, topic_stats, agg, file_statuses = collect(args.tests_root, do_smoke=args.smoke, only_topic=args.only_topic)
+    test_slots, topic_stats, agg, file_statuses = collect(args.tests_root, do_smoke=args.smoke, only_topic=args.only_topic, jobs=args.jobs, cache=cache)
+    if cache is not None:
+        with profile_phase('cache_save'):
+            cache.save(prune=not args.only_topic)
     # Harness generation (listing functions/classes) for a topic
     if args.generate_harness:
         harness_topic = args.generate_harness
@@ -552,6 +2689,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     # Promotion phase BEFORE writing artifacts if requested
     if args.promote:
         promoted: List[str] = []
+        promoted_slots: List[TestSlot] = []
         for slot in test_slots:
             fs = slot.file_status
             if not fs or fs.status != 'TODO':
@@ -598,125 +2736,27 @@ def main(argv: Optional[List[str]] = None) -> int:
                 with open(fs.path, 'w', encoding='utf-8') as wf:
                     wf.write(new_content)
                 promoted.append(fs.path)
+                promoted_slots.append(slot)
             except Exception:
                 continue
         if promoted:
             print(f"[promoted] {len(promoted)} files -> RESOLVED")
-            # Re-collect to update stats
-            test_slots, topic_stats, agg, file_statuses = collect(args.tests_root, do_smoke=args.smoke, only_topic=args.only_topic)
+            # Re-evaluate only the promoted files; slots and stats are patched in place
+            reevaluate_slots(promoted_slots, promoted, file_statuses, topic_stats, agg, do_smoke=args.smoke, jobs=args.jobs, cache=cache)
+            if cache is not None:
+                cache.save()
         else:
             print('[info] No eligible TODO files for promotion.')
 
-    md = build_markdown(date_str, topic_stats, agg, file_statuses)
-    summary_json = build_json(date_str, topic_stats, agg, file_statuses)
-
-    date_token = date_str.replace('-', '_')
-
-    # Output directory (updated): store progress artifacts under root-level progress/
-    # Backward compatibility: previously these lived under docs/progress/
-    progress_dir = 'progress'
-    legacy_progress_dir = os.path.join('docs', 'progress')
-    if os.path.isdir(legacy_progress_dir) and not os.path.isdir(progress_dir):
+    # Backward compatibility: progress artifacts previously lived under docs/progress/
+    if os.path.isdir(os.path.join('docs', 'progress')) and not os.path.isdir('progress'):
         # We do NOT auto-move to avoid accidental git history churn; just inform.
         print('[info] Legacy directory docs/progress/ detected; new artifacts now write to progress/. Consider migrating or cleaning up old files.')
-    if not args.no_md:
-        md_path = os.path.join(progress_dir, f'progress{date_token}.md')
-        write_file(md_path, md)
-        print(f'[written] {md_path}')
-    if not args.no_json:
-        json_path = os.path.join(progress_dir, f'progress{date_token}.json')
-        write_file(json_path, json.dumps(summary_json, indent=2, ensure_ascii=False) + '\n')
-        print(f'[written] {json_path}')
-    if args.export_csv:
-        csv_path = os.path.join(progress_dir, f'progress{date_token}.csv')
-        with open(csv_path, 'w', newline='', encoding='utf-8') as cf:
-            writer = csv.writer(cf)
-            writer.writerow(['Topic','Capacity','Created','PythonFiles','Resolved','Validated','Remaining','Created%','PythonFile%','Resolved%','Validated%'])
-            for topic in sorted(topic_stats):
-                t = topic_stats[topic]
-                cap = t.capacity or 0
-                def fmt(val):
-                    return f"{pct_float(val, cap):.1f}" if cap else '0.0'
-                writer.writerow([
-                    t.topic, t.capacity, t.created, t.python_files, t.resolved, t.validated, t.remaining,
-                    fmt(t.created), fmt(t.python_files), fmt(t.resolved), fmt(t.validated)
-                ])
-        print(f'[written] {csv_path}')
 
-    # -------------------- Resolved History / Delta Generation -------------------- #
-    if not args.no_history:
-        history_dir = os.path.join('.progress_state')
-        os.makedirs(history_dir, exist_ok=True)
-        history_path = os.path.join(history_dir, 'resolved_history.json')
-        # Current resolved identifiers
-        current_resolved: Set[str] = set(
-            f"{slot.topic}/{slot.index}" for slot in test_slots
-            if slot.file_status and slot.file_status.status in {"RESOLVED", "VALIDATED"}
-        )
-        # Load existing history
-        history_data: Dict[str, str] = {}
-        if os.path.exists(history_path):
-            try:
-                with open(history_path, 'r', encoding='utf-8') as hf:
-                    history_data = json.load(hf)
-            except Exception as e:  # pragma: no cover
-                print(f'[warn] Could not read history file: {e}', file=sys.stderr)
-        previous_set = set(history_data.keys())
-        new_items = sorted(current_resolved - previous_set)
-        # Add new items with first-seen date
-        for ident in new_items:
-            history_data[ident] = date_str
-        # Write updated history
-        write_file(history_path, json.dumps(history_data, indent=2, ensure_ascii=False) + '\n')
-        print(f'[updated] {history_path} (total resolved tracked: {len(history_data)})')
-
-        # Delta markdown (only if there are new items)
-        delta_path = os.path.join(progress_dir, f'completed_delta_{date_token}.md')
-        if new_items:
-            delta_md_lines = [
-                f"# Newly Completed Practices ({date_str})\n",
-                "Generated by generate_progress.py\n",
-                "",
-                "## New Resolved / Validated",
-                "",
-            ]
-            for ident in new_items:
-                delta_md_lines.append(f"- {ident}")
-            delta_md_lines.append("")
-            write_file(delta_path, "\n".join(delta_md_lines))
-            print(f'[written] {delta_path}')
-        else:
-            # Always materialize a delta file so downstream tooling can rely on its presence.
-            empty_delta = [
-                f"# Newly Completed Practices ({date_str})\n",
-                "Generated by generate_progress.py\n",
-                "",
-                "## New Resolved / Validated",
-                "",
-                "_No new resolved or validated practices in this run._\n",
-            ]
-            write_file(delta_path, "\n".join(empty_delta))
-            print(f'[written-empty] {delta_path} (no new items)')
-
-        # Cumulative markdown (always overwrite)
-        cumulative_lines = ["# All Completed (Resolved or Validated) Practices\n", "| Practice | First Seen |", "|------|------------|"]
-        for ident in sorted(history_data.keys(), key=lambda k: (history_data[k], k)):
-            cumulative_lines.append(f"| {ident} | {history_data[ident]} |")
-        cumulative_lines.append("")
-        cumulative_path = os.path.join(progress_dir, 'completed_all.md')
-        write_file(cumulative_path, "\n".join(cumulative_lines))
-        print(f'[written] {cumulative_path}')
-    if not args.no_badges:
-        # Build badges directory
-        validated_pct = summary_json['totals']['percent_validated']
-        resolved_pct = summary_json['totals']['percent_resolved']
-        badge_validated = build_badge('validated', f"{agg.validated}/{summary_json['totals']['possible']} ({validated_pct:.1f}%)", validated_pct)
-        badge_resolved = build_badge('resolved', f"{agg.resolved}/{summary_json['totals']['possible']} ({resolved_pct:.1f}%)", resolved_pct)
-        write_file(os.path.join('badges', 'validated.json'), json.dumps(badge_validated, indent=2) + '\n')
-        write_file(os.path.join('badges', 'resolved.json'), json.dumps(badge_resolved, indent=2) + '\n')
-        print('[written] badges/validated.json')
-        print('[written] badges/resolved.json')
+    if args.watch:
+        return watch(args, test_slots, cache)
 
+    md = emit_artifacts(args, date_str, test_slots, topic_stats, agg, file_statuses)
     if args.stdout:
         print('\n' + md)
 
@@ -18,6 +18,8 @@ Usage:
 Notes:
   - Designed for this repo's current structure (topics numeric subfolders 1..20 under tests/).
   - Does not attempt to modify words like 'unittest', 'pytest', or lowercase 'test' inside code logic beyond specific patterns.
+  - Each replacement table is compiled into a single alternation (text_rewriter.MultiRewriter), so every
+    line is scanned once; files are rewritten in parallel with --jobs.
 """
 from __future__ import annotations
 
@@ -27,6 +29,8 @@ import argparse
 import shutil
 from typing import List, Tuple
 
+from text_rewriter import MultiRewriter, map_files, read_text, write_text
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
 # Patterns & replacements (ordered)
@@ -50,6 +54,10 @@ PATH_REPLACEMENTS = [
     (re.compile(r'tests/'), 'tests/'),
 ]
 
+WORD_REWRITER = MultiRewriter(WORD_REPLACEMENTS)
+PATH_REWRITER = MultiRewriter(PATH_REPLACEMENTS)
+HEADING_WORD_RE = re.compile(r'\bTest\b')
+
 EXCLUDE_FILE_EXTS = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.zip', '.gz'}
 TEXT_FILE_EXTS = {'.md', '.py', '.txt', '.json', '.yml', '.yaml', '.csv'}
 
@@ -96,94 +104,87 @@ def rename_files(dry_run: bool, actions: List[str]):
                 os.replace(path, new_path)
 
 
-def update_file_content(path: str, dry_run: bool, actions: List[str]):
-    if not is_text_file(path):
-        return
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            original = f.read()
-    except Exception:
-        return
-    updated = original
-
+def rewrite_heading(line: str) -> str:
     # Section replacements
-    lines = updated.splitlines()
-    changed = False
-    for i, line in enumerate(lines):
-        for pat, repl in SECTION_REPLACEMENTS:
-            if re.search(pat, line):
-                new_line = re.sub(pat, repl, line)
-                if new_line != line:
-                    lines[i] = new_line
-                    changed = True
-        # Heading substitution (# ... Test ...)
-        m = HEADING_TEST_RE.match(line)
-        if m:
-            # Replace only the first isolated word 'Test'
-            new_line = re.sub(r'\bTest\b', 'Practice', line, count=1)
-            if new_line != line:
-                lines[i] = new_line
-                changed = True
-    updated = '\n'.join(lines)
-
-    # Whole word replacements (apply after heading logic to catch remaining narrative)
-    for rx, repl in WORD_REPLACEMENTS:
-        new_lines = []
-        line_changed = False
-        for ln in updated.splitlines():
-            if 'Test Cases' in ln:  # preserve phrase exactly
-                new_lines.append(ln)
-                continue
-            new_ln = rx.sub(repl, ln)
-            if new_ln != ln:
-                line_changed = True
-            new_lines.append(new_ln)
-        if line_changed:
-            changed = True
-        updated = '\n'.join(new_lines)
+    for pat, repl in SECTION_REPLACEMENTS:
+        if re.search(pat, line):
+            line = re.sub(pat, repl, line)
+    # Heading substitution (# ... Test ...): replace only the first isolated word 'Test'
+    if HEADING_TEST_RE.match(line):
+        line = HEADING_WORD_RE.sub('Practice', line, count=1)
+    return line
+
+
+def rewrite_text(original: str) -> str:
+    # Whole word replacements run after the heading logic to catch remaining narrative;
+    # lines containing 'Test Cases' keep the phrase exactly
+    updated = WORD_REWRITER.rewrite_lines(original, skip='Test Cases', before=rewrite_heading)
     # Path replacements
-    for rx, repl in PATH_REPLACEMENTS:
-        new_upd = rx.sub(repl, updated)
-        if new_upd != updated:
-            updated = new_upd
-            changed = True
+    return PATH_REWRITER.sub(updated)
+
+
+def rewrite_file(path: str, dry_run: bool = True) -> bool:
+    """Rewrite one file's content; True if it changes (written unless dry_run)."""
+    if not is_text_file(path):
+        return False
+    original = read_text(path)
+    if original is None:
+        return False
+    updated = rewrite_text(original)
+    if updated == original:
+        return False
+    if not dry_run:
+        write_text(path, updated)
+    return True
 
-    if changed and updated != original:
+
+def _rewrite_dry(path: str) -> bool:
+    return rewrite_file(path, dry_run=True)
+
+
+def _rewrite_apply(path: str) -> bool:
+    return rewrite_file(path, dry_run=False)
+
+
+def update_file_content(path: str, dry_run: bool, actions: List[str]):
+    if rewrite_file(path, dry_run):
         actions.append(f'UPDATE content {path}')
-        if not dry_run:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(updated)
 
 
-def update_all_contents(dry_run: bool, actions: List[str]):
-    for path in walk_practices():
-        update_file_content(path, dry_run, actions)
+def content_paths() -> List[str]:
+    paths = walk_practices()
     # Also update key docs outside practices
     doc_dir = os.path.join(ROOT, 'doc')
     if os.path.isdir(doc_dir):
         for dirpath, _, filenames in os.walk(doc_dir):
             for fn in filenames:
-                path = os.path.join(dirpath, fn)
-                update_file_content(path, dry_run, actions)
+                paths.append(os.path.join(dirpath, fn))
     # Update scripts referencing tests/ (excluding this migration script and generate_progress which already supports both)
     scripts_dir = os.path.join(ROOT, 'scripts')
     for dirpath, _, filenames in os.walk(scripts_dir):
         for fn in filenames:
-            path = os.path.join(dirpath, fn)
             if fn == os.path.basename(__file__):
                 continue
-            update_file_content(path, dry_run, actions)
+            paths.append(os.path.join(dirpath, fn))
+    return paths
+
+
+def update_all_contents(dry_run: bool, actions: List[str], jobs: int = 1):
+    paths = [p for p in content_paths() if is_text_file(p)]
+    changed = map_files(_rewrite_dry if dry_run else _rewrite_apply, paths, jobs=jobs)
+    actions.extend(f'UPDATE content {path}' for path, did_change in zip(paths, changed) if did_change)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Migrate repository terminology from tests to practices.')
     parser.add_argument('--dry-run', action='store_true', help='Preview actions without applying changes')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Processes used to rewrite file contents (default: CPU count)')
     args = parser.parse_args()
 
     actions: List[str] = []
     rename_root(args.dry_run, actions)
     rename_files(args.dry_run, actions)
-    update_all_contents(args.dry_run, actions)
+    update_all_contents(args.dry_run, actions, jobs=args.jobs)
 
     print('\nMigration Plan:' if args.dry_run else '\nMigration Actions:')
     for act in actions:
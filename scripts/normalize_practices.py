@@ -9,27 +9,41 @@ Goals:
       * Multiple practice-*.md files in a single numeric folder
       * Missing markdown or python
       * Unexpected leftover 'test-' filenames
+      * Slot folders sharing a number (e.g. '1' and '01'), reported as conflicts
   - Provide a --fix mode to rename inconsistent slugs (converting camel / concatenated to dash-separated where possible).
 
 This script is conservative: it prints a plan first unless --apply is given.
+The tree is listed once and the full plan (renames, stub creations) is built
+before anything is touched; actions that would overwrite an existing file or
+each other are reported as conflicts and skipped. --plan-json saves the plan
+for review and --from-plan applies a saved plan without rescanning.
 """
 from __future__ import annotations
 
+import dataclasses
+import json
 import os
 import re
+import sys
+import threading
 import argparse
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Set, Tuple
+
+from practice_tree import PracticeTree, list_topic_entries, scan_tree
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 PRACTICES_DIR = os.path.join(ROOT, 'practices')
 SLUG_RE = re.compile(r'^practice-(?P<slug>.+?)-(\d+)\.(md|py)$')
 DASH_NORMALIZE_RE = re.compile(r'[^a-z0-9]+')
+STUB_CONTENT = '# TODO: Implement solution for this practice\n\n'
+APPLY_WORKERS = 8  # renames/creates are independent syscalls; a small pool hides filesystem latency
 
 
 def list_topic_dirs() -> List[str]:
     if not os.path.isdir(PRACTICES_DIR):
         return []
-    return [d for d in sorted(os.listdir(PRACTICES_DIR)) if os.path.isdir(os.path.join(PRACTICES_DIR, d)) and d != 'README.md']
+    return [e.name for e in list_topic_entries(PRACTICES_DIR)]
 
 
 def normalize_slug(raw: str) -> str:
@@ -37,62 +51,204 @@ def normalize_slug(raw: str) -> str:
     return DASH_NORMALIZE_RE.sub('-', lowered).strip('-')
 
 
-def scan(apply: bool, fix: bool, add_py: bool) -> int:
-    topics = list_topic_dirs()
-    issues: List[str] = []
-    actions: List[str] = []
-    for topic in topics:
-        topic_path = os.path.join(PRACTICES_DIR, topic)
-        for entry in sorted(os.listdir(topic_path)):
-            slot_path = os.path.join(topic_path, entry)
-            if not (entry.isdigit() and os.path.isdir(slot_path)):
-                continue
-            md_files = [f for f in os.listdir(slot_path) if f.endswith('.md')]
-            py_files = [f for f in os.listdir(slot_path) if f.endswith('.py')]
+@dataclasses.dataclass
+class Action:
+    op: str  # 'rename' | 'create'
+    dst: str
+    src: Optional[str] = None  # rename source
+    content: Optional[str] = None  # created file content
+
+    def describe(self) -> str:
+        if self.op == 'rename':
+            return f'RENAME {self.src} -> {self.dst}'
+        return f'CREATE STUB {self.dst}'
+
+
+@dataclasses.dataclass
+class Plan:
+    """Everything a run would do, computed from one listing of the tree before touching it."""
+    root: str
+    issues: List[str] = dataclasses.field(default_factory=list)
+    actions: List[Action] = dataclasses.field(default_factory=list)
+    conflicts: List[str] = dataclasses.field(default_factory=list)  # actions dropped from the plan, with the reason
+
+    def to_json(self) -> Dict:
+        return {
+            'root': self.root,
+            'issues': self.issues,
+            'actions': [
+                {k: v for k, v in dataclasses.asdict(a).items() if v is not None}
+                for a in self.actions
+            ],
+            'conflicts': self.conflicts,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'Plan':
+        return cls(
+            root=data.get('root', PRACTICES_DIR),
+            issues=list(data.get('issues', [])),
+            actions=[Action(op=a['op'], dst=a['dst'], src=a.get('src'), content=a.get('content')) for a in data.get('actions', [])],
+            conflicts=list(data.get('conflicts', [])),
+        )
+
+
+def build_plan(tree: PracticeTree, fix: bool, add_py: bool) -> Plan:
+    """Issues plus the rename/create actions for the whole tree, conflicts removed."""
+    plan = Plan(root=tree.root)
+    candidates: List[Action] = []
+    existing: Set[str] = set()
+    duplicates: Dict[str, List[str]] = {}
+    for topic_dir in tree.topics.values():
+        for idx, extra in topic_dir.duplicate_slots.items():
+            duplicates[topic_dir.slots[idx].path] = sorted([topic_dir.slots[idx].path] + [sd.path for sd in extra])
+        for slot in topic_dir.iter_slot_dirs():
+            entry = slot.name
+            slot_path = slot.path
+            existing.update(os.path.join(slot_path, f) for f in slot.files)
+            md_files = slot.files_with_suffix('.md')
+            py_files = slot.files_with_suffix('.py')
             # Detect leftover test- files
             for f in md_files + py_files:
                 if f.startswith('test-'):
-                    issues.append(f'[LEFTOVER TEST PREFIX] {slot_path}/{f}')
+                    plan.issues.append(f'[LEFTOVER TEST PREFIX] {slot_path}/{f}')
             # Ensure exactly one markdown file
             if not md_files:
-                issues.append(f'[MISSING MD] {slot_path}')
+                plan.issues.append(f'[MISSING MD] {slot_path}')
             elif len(md_files) > 1:
-                issues.append(f'[MULTIPLE MD] {slot_path}: {md_files}')
+                plan.issues.append(f'[MULTIPLE MD] {slot_path}: {md_files}')
             # Normalize names
             for f in md_files + py_files:
                 m = SLUG_RE.match(f)
                 if not m:
-                    issues.append(f'[UNEXPECTED NAME] {slot_path}/{f}')
+                    plan.issues.append(f'[UNEXPECTED NAME] {slot_path}/{f}')
                     continue
                 raw_slug = m.group('slug')
                 norm_slug = normalize_slug(raw_slug)
                 if fix and raw_slug != norm_slug:
                     new_name = f.replace(raw_slug, norm_slug)
-                    src = os.path.join(slot_path, f)
-                    dst = os.path.join(slot_path, new_name)
-                    actions.append(f'RENAME {src} -> {dst}')
-                    if apply:
-                        os.replace(src, dst)
+                    candidates.append(Action('rename', dst=os.path.join(slot_path, new_name), src=os.path.join(slot_path, f)))
             # Add python stub if requested and missing
             if add_py and not py_files and md_files:
-                # Derive slug from first md
+                # Derive slug from first md (the name it will have after --fix)
                 m = SLUG_RE.match(md_files[0])
                 if m:
-                    slug = m.group('slug')
+                    slug = normalize_slug(m.group('slug')) if fix else m.group('slug')
                     py_name = f'practice-{slug}-{entry}.py'
-                    py_path = os.path.join(slot_path, py_name)
-                    actions.append(f'CREATE STUB {py_path}')
-                    if apply:
-                        with open(py_path, 'w', encoding='utf-8') as f:
-                            f.write('# TODO: Implement solution for this practice\n\n')
-    print('Normalization Issues Found:' if issues else 'No structural issues found.')
-    for i in issues:
+                    candidates.append(Action('create', dst=os.path.join(slot_path, py_name), content=STUB_CONTENT))
+    plan.actions, plan.conflicts = resolve_conflicts(candidates, existing, duplicates)
+    return plan
+
+
+def resolve_conflicts(candidates: List[Action], existing: Set[str],
+                      duplicate_slots: Optional[Dict[str, List[str]]] = None) -> Tuple[List[Action], List[str]]:
+    """Drop actions that would overwrite a file or each other (every action touching a contested target).
+
+    duplicate_slots maps a slot folder to every folder sharing its number
+    (e.g. '1' and '01'); each group is reported and actions inside those
+    folders are dropped until the folders are merged or renumbered by hand.
+    """
+    conflicts: List[str] = []
+    contested: Dict[str, List[str]] = {}
+    for group in (duplicate_slots or {}).values():
+        conflicts.append(f'DUPLICATE SLOT {", ".join(group)} (same slot number; merge or renumber by hand)')
+        contested.update((path, group) for path in group)
+    targets: Dict[str, List[Action]] = {}
+    for action in candidates:
+        targets.setdefault(action.dst, []).append(action)
+    sources = {a.src for a in candidates if a.src}
+    kept: List[Action] = []
+    for action in candidates:
+        if os.path.dirname(action.dst) in contested:
+            conflicts.append(f'{action.describe()} (slot folder shares its number with another folder)')
+        elif len(targets[action.dst]) > 1:
+            conflicts.append(f'{action.describe()} (target claimed by {len(targets[action.dst])} actions)')
+        elif action.dst in existing and action.dst != action.src:
+            conflicts.append(f'{action.describe()} (target exists)')
+        elif action.dst in sources:
+            conflicts.append(f'{action.describe()} (target is renamed by another action)')
+        else:
+            kept.append(action)
+    return kept, conflicts
+
+
+def revalidate(plan: Plan) -> Plan:
+    """A saved plan may be stale: keep only actions whose source exists and whose target does not."""
+    kept: List[Action] = []
+    for action in plan.actions:
+        if action.op == 'rename' and not os.path.exists(action.src or ''):
+            plan.conflicts.append(f'{action.describe()} (source missing)')
+        elif os.path.exists(action.dst) and not (action.src and os.path.samefile(action.src, action.dst)):
+            plan.conflicts.append(f'{action.describe()} (target exists)')
+        else:
+            kept.append(action)
+    plan.actions = kept
+    return plan
+
+
+def apply_action(action: Action) -> None:
+    if action.op == 'rename':
+        os.replace(action.src, action.dst)
+        return
+    tmp = f'{action.dst}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(action.content or '')
+    os.replace(tmp, action.dst)
+
+
+def apply_plan(plan: Plan, jobs: int = APPLY_WORKERS) -> List[str]:
+    """Perform the plan's actions with a bounded thread pool; returns error messages."""
+    errors: List[str] = []
+    if not plan.actions:
+        return errors
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(plan.actions)))) as pool:
+        futures = {pool.submit(apply_action, action): action for action in plan.actions}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except OSError as e:
+                errors.append(f'{futures[future].describe()}: {e}')
+    return sorted(errors)
+
+
+def print_plan(plan: Plan, apply: bool) -> None:
+    print('Normalization Issues Found:' if plan.issues else 'No structural issues found.')
+    for i in plan.issues:
         print(' -', i)
-    print('\nPlanned Actions:' if actions else '\nNo actions needed.')
-    for a in actions:
-        print(' -', a)
-    if not apply and actions:
+    print('\nPlanned Actions:' if plan.actions else '\nNo actions needed.')
+    for a in plan.actions:
+        print(' -', a.describe())
+    if plan.conflicts:
+        print('\nConflicting Actions (skipped):')
+        for c in plan.conflicts:
+            print(' -', c)
+    if not apply and plan.actions:
         print('\n(Re-run with --apply to perform actions)')
+
+
+def scan(apply: bool, fix: bool, add_py: bool, jobs: int = APPLY_WORKERS, plan_json: Optional[str] = None,
+         from_plan: Optional[str] = None) -> int:
+    if from_plan:
+        with open(from_plan, 'r', encoding='utf-8') as pf:
+            plan = revalidate(Plan.from_json(json.load(pf)))
+    else:
+        tree = scan_tree(PRACTICES_DIR) if os.path.isdir(PRACTICES_DIR) else PracticeTree(root=PRACTICES_DIR, topics={})
+        plan = build_plan(tree, fix=fix, add_py=add_py)
+    if plan_json:
+        payload = json.dumps(plan.to_json(), indent=2) + '\n'
+        if plan_json == '-':
+            sys.stdout.write(payload)
+            return 0
+        with open(plan_json, 'w', encoding='utf-8') as pf:
+            pf.write(payload)
+        print(f'[written] {plan_json}')
+    print_plan(plan, apply)
+    if apply:
+        errors = apply_plan(plan, jobs=jobs)
+        for e in errors:
+            print(f'[error] {e}', file=sys.stderr)
+        if errors:
+            return 1
     return 0
 
 
@@ -101,8 +257,11 @@ def main():
     ap.add_argument('--apply', action='store_true', help='Apply changes (default is read-only)')
     ap.add_argument('--fix', action='store_true', help='Attempt to fix slug inconsistencies')
     ap.add_argument('--add-py', action='store_true', help='Create missing python stub if markdown exists')
+    ap.add_argument('--jobs', type=int, default=APPLY_WORKERS, help=f'Threads used to apply the plan (default: {APPLY_WORKERS})')
+    ap.add_argument('--plan-json', default=None, help="Write the plan (issues, actions, conflicts) as JSON to this path; '-' prints it and exits")
+    ap.add_argument('--from-plan', default=None, help='Use a plan saved with --plan-json instead of scanning (stale actions are skipped)')
     args = ap.parse_args()
-    return scan(apply=args.apply, fix=args.fix, add_py=args.add_py)
+    return scan(apply=args.apply, fix=args.fix, add_py=args.add_py, jobs=args.jobs, plan_json=args.plan_json, from_plan=args.from_plan)
 
 if __name__ == '__main__':  # pragma: no cover
     raise SystemExit(main())
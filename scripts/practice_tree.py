@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Single-traversal walker for the practices tree (topic -> slot -> files).
+
+Shared by generate_progress.py and normalize_practices.py so both read the
+same directory layout the same way. Every directory is listed exactly once
+with os.scandir; file/dir classification comes from the cached DirEntry type
+information instead of separate os.path.isdir()/os.listdir() calls, which
+matters on large trees and on network filesystems.
+
+Layout:
+  <root>/<Topic>/<N>/<files>   where <N> is a numeric slot folder
+"""
+from __future__ import annotations
+
+import dataclasses
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+SLOT_DIR_RE = re.compile(r"^\d+$")
+
+@dataclasses.dataclass
+class SlotDir:
+    index: int
+    name: str  # folder name on disk (normally str(index))
+    path: str
+    files: List[str]  # sorted file names (directories excluded)
+    file_stats: Optional[Dict[str, Tuple[int, int]]] = None  # name -> (mtime_ns, size) when stat_files=True
+    mtime_ns: Optional[int] = None  # folder mtime when stat_files=True (changes when entries are added/removed)
+
+    def files_with_suffix(self, suffix: str) -> List[str]:
+        return [f for f in self.files if f.endswith(suffix)]
+
+@dataclasses.dataclass
+class TopicDir:
+    name: str
+    path: str
+    slots: Dict[int, SlotDir]  # ordered by index
+    scandir_calls: int = 0  # listings performed for this topic and its slots
+    mtime_ns: Optional[int] = None  # folder mtime when stat_files=True
+    duplicate_slots: Dict[int, List[SlotDir]] = dataclasses.field(default_factory=dict)  # other folders for a taken index, e.g. '01' next to '1'
+
+    @property
+    def capacity(self) -> int:
+        """Highest numbered slot folder (0 when the topic has none)."""
+        return max(self.slots) if self.slots else 0
+
+    def iter_slot_dirs(self) -> List[SlotDir]:
+        """Every slot folder on disk, duplicates included, sorted by folder name."""
+        dirs = list(self.slots.values())
+        for extra in self.duplicate_slots.values():
+            dirs.extend(extra)
+        return sorted(dirs, key=lambda sd: sd.name)
+
+@dataclasses.dataclass
+class PracticeTree:
+    root: str
+    topics: Dict[str, TopicDir]  # ordered by topic name
+    scandir_calls: int = 0
+
+    def iter_slots(self) -> Iterable[Tuple[TopicDir, SlotDir]]:
+        for topic in self.topics.values():
+            for slot in topic.slots.values():
+                yield topic, slot
+
+def _scandir(path: str) -> List[os.DirEntry]:
+    """Entries of a topic or slot folder; [] if it vanished or cannot be read mid-walk."""
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except OSError:
+        return []
+
+def _mtime_ns(entry: os.DirEntry) -> Optional[int]:
+    try:
+        return entry.stat().st_mtime_ns
+    except OSError:
+        return None
+
+def list_topic_entries(root: str) -> List[os.DirEntry]:
+    """Topic directories directly under root, sorted by name.
+
+    A missing or unreadable root raises OSError (unlike the folders below it):
+    a mistyped --tests-root must not pass for an empty tree.
+    """
+    with os.scandir(root) as it:
+        return sorted((e for e in it if e.name != 'README.md' and e.is_dir()), key=lambda e: e.name)
+
+def scan_tree(root: str, topics: Optional[Iterable[str]] = None, with_files: bool = True, stat_files: bool = False) -> PracticeTree:
+    """Build the in-memory tree in one pass.
+
+    topics:     restrict to these topic names (others are not descended into)
+    with_files: list slot contents (False = stop at slot folders)
+    stat_files: also record (mtime_ns, size) per file and the mtime of every topic
+                and slot folder; DirEntry.stat() is free on Windows and a
+                single stat() elsewhere
+    """
+    tree = PracticeTree(root=root, topics={}, scandir_calls=1)
+    for topic in iter_tree(root, topics=topics, with_files=with_files, stat_files=stat_files):
+        tree.topics[topic.name] = topic
+        tree.scandir_calls += topic.scandir_calls
+    return tree
+
+def iter_tree(root: str, topics: Optional[Iterable[str]] = None, with_files: bool = True, stat_files: bool = False) -> Iterator[TopicDir]:
+    """Lazily yield one fully populated TopicDir at a time (see scan_tree).
+
+    The root is listed once up front; each topic is descended into only when
+    the consumer asks for it, so callers can process arbitrarily large trees
+    topic by topic without holding the whole tree in memory.
+    """
+    wanted = set(topics) if topics is not None else None
+    for topic_entry in list_topic_entries(root):
+        if wanted is not None and topic_entry.name not in wanted:
+            continue
+        topic = TopicDir(name=topic_entry.name, path=os.path.join(root, topic_entry.name), slots={}, scandir_calls=1)
+        if stat_files:
+            topic.mtime_ns = _mtime_ns(topic_entry)
+        slot_entries = [e for e in _scandir(topic.path) if SLOT_DIR_RE.match(e.name) and e.is_dir()]
+        # The canonical folder name wins the index when e.g. both '1' and '01'
+        # exist; the others are kept in duplicate_slots for normalize to report
+        slot_entries.sort(key=lambda e: (int(e.name), e.name != str(int(e.name)), e.name))
+        for slot_entry in slot_entries:
+            idx = int(slot_entry.name)
+            slot = SlotDir(index=idx, name=slot_entry.name, path=os.path.join(topic.path, slot_entry.name), files=[])
+            if stat_files:
+                slot.mtime_ns = _mtime_ns(slot_entry)
+            if with_files:
+                topic.scandir_calls += 1
+                file_entries = sorted((e for e in _scandir(slot.path) if not e.is_dir()), key=lambda e: e.name)
+                slot.files = [e.name for e in file_entries]
+                if stat_files:
+                    slot.file_stats = {}
+                    for e in file_entries:
+                        try:
+                            st = e.stat()
+                        except OSError:
+                            continue
+                        slot.file_stats[e.name] = (st.st_mtime_ns, st.st_size)
+            if idx in topic.slots:
+                topic.duplicate_slots.setdefault(idx, []).append(slot)
+            else:
+                topic.slots[idx] = slot
+        yield topic
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Thin client for a resident `generate_progress.py --daemon`.
+
+Forwards its arguments to the daemon listening in the current directory and
+streams the daemon's stdout/stderr back, so editors and pre-commit hooks skip
+interpreter start-up, imports and the analysis cache load on every call:
+
+  python scripts/generate_progress.py --daemon &          # once, from the repo root
+  python scripts/progress_client.py --no-md --export-csv  # same flags as generate_progress.py
+  python scripts/progress_client.py --stop
+
+Client options (before any generate_progress arguments; `--` ends them):
+  --socket PATH   daemon socket (default: .progress_state/daemon.sock)
+  --ping          report whether a daemon is serving this directory
+  --stop          shut the daemon down
+  --no-fallback   fail instead of running generate_progress in-process when no daemon answers
+
+Only the standard library socket/json modules are imported on the fast path;
+generate_progress itself is imported only for the fallback.
+
+Wire format: one JSON request line ({"argv": [...], "cwd": ...} or
+{"command": "ping" | "stop"}), answered by JSON lines carrying "out"/"err" text
+and finally "exit" with the status code.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+DEFAULT_SOCKET = os.path.join('.progress_state', 'daemon.sock')  # generate_progress.DAEMON_SOCKET_PATH
+
+def connect(path: str) -> Optional[socket.socket]:
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:  # no socket file, or a stale one without a daemon behind it
+        sock.close()
+        return None
+    return sock
+
+def exchange(sock: socket.socket, request: Dict[str, Any]) -> int:
+    """Send one request and relay the answer frames as they arrive; returns the exit code."""
+    with sock, sock.makefile('rwb') as stream:
+        stream.write(json.dumps(request).encode('utf-8') + b'\n')
+        stream.flush()
+        for line in stream:
+            frame = json.loads(line)
+            for key, out in (('out', sys.stdout), ('err', sys.stderr)):
+                if key in frame:
+                    out.write(frame[key])
+                    out.flush()
+            if 'exit' in frame:
+                return frame['exit']
+    print('[error] Daemon closed the connection without an exit status', file=sys.stderr)
+    return 1
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    path, command, fallback = DEFAULT_SOCKET, 'run', True
+    while argv:
+        if argv[0] == '--socket' and len(argv) > 1:
+            path = argv[1]
+            del argv[:2]
+        elif argv[0] in ('--ping', '--stop'):
+            command = argv.pop(0)[2:]
+        elif argv[0] == '--no-fallback':
+            fallback = False
+            argv.pop(0)
+        elif argv[0] == '--':
+            argv.pop(0)
+            break
+        else:
+            break
+    sock = connect(path)
+    if sock is None:
+        if command != 'run':
+            print(f'[info] No daemon is listening on {path}', file=sys.stderr)
+            return 1
+        if not fallback:
+            print(f'[error] No daemon is listening on {path} (start one with generate_progress.py --daemon)', file=sys.stderr)
+            return 2
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        import generate_progress
+        return generate_progress.main(argv)
+    if command != 'run':
+        return exchange(sock, {"command": command})
+    return exchange(sock, {"argv": argv, "cwd": os.getcwd()})
+
+if __name__ == '__main__':  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""Compact binary snapshot of a progress JSON summary (standard library only).
+
+The JSON summary (progress/progressDD_MM_YYYY.json) is indented and repeats
+every key for every file record, which adds up across daily snapshots of many
+learners. A snapshot stores the same data column by column: fixed-width
+little-endian int32 columns (array/struct), one shared UTF-8 string table
+(paths, statuses and warnings are stored once and referenced by id), and the
+small top-level parts (date, totals, status breakdown, profile, ...) as a
+compact JSON blob. Conversion is lossless: to_json() returns exactly what
+build_json() produced, so `json.dumps(..., indent=2)` reproduces the report
+byte for byte.
+
+Snapshot.open() memory-maps the file. Looking up one topic or file reads a
+handful of column cells: lookups are binary searches over sorted row
+permutations, and each topic keeps the rows of its files, so nothing else is
+decoded.
+
+Layout (all integers little-endian, sections 8-byte aligned):
+  header     magic b'PROGSNAP', version (u16), reserved (u16), section count (u32)
+  directory  per section: tag (4 bytes), offset (u64), length (u64)
+  META  JSON: top-level keys in order, values of everything except topics/files
+  STRO  u32[strings + 1] offsets into STRB          STRB  UTF-8 string bytes
+  TOPC  int32 columns of len(topics) rows (TOPIC_COLUMNS)
+  TIDX  topic rows sorted by name                   FIDX  file rows sorted by path
+  TFOF  int32[topics + 1] offsets into TFIL         TFIL  file rows grouped by topic
+  FILE  int32 columns of len(files) rows (FILE_COLUMNS)
+  WOFF  u32[files + 1] offsets into WARN            WARN  warning string ids
+  SMOK  int32 columns (SMOKE_COLUMNS), only when some file has a smoke record
+
+Percentages are stored in hundredths and smoke durations in 1e-4 s, the
+precision the JSON rounds them to; values that would not round-trip exactly
+are rejected rather than silently altered.
+
+  python scripts/progress_snapshot.py from-json progress/progress01_09_2025.json
+  python scripts/progress_snapshot.py show progress/progress01_09_2025.snap --topic Arrays
+  python scripts/progress_snapshot.py to-json progress/progress01_09_2025.snap -o restored.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+MAGIC = b'PROGSNAP'
+VERSION = 1
+SNAPSHOT_SUFFIX = '.snap'
+
+_HEADER = struct.Struct('<8sHHI')
+_ENTRY = struct.Struct('<4sQQ')
+_ALIGN = 8
+_LITTLE = sys.byteorder == 'little'
+NONE = -1  # stored for None / absent values
+
+TOPIC_COLUMNS = ('topic', 'capacity', 'created', 'python_files', 'resolved', 'validated', 'remaining',
+                 'percent_created', 'percent_python', 'percent_resolved', 'percent_validated')
+TOPIC_STRINGS = frozenset({'topic'})
+TOPIC_PERCENTS = frozenset({'percent_created', 'percent_python', 'percent_resolved', 'percent_validated'})
+FILE_COLUMNS = ('path', 'status', 'meaningful_loc')
+FILE_KEYS = ('path', 'status', 'meaningful_loc', 'warnings')  # plus an optional trailing 'smoke'
+SMOKE_COLUMNS = ('ok', 'duration_s', 'peak_rss_kb', 'error_type')  # ok: NONE when the file has no smoke record
+
+if array('i').itemsize != 4 or array('I').itemsize != 4:  # pragma: no cover - no mainstream platform
+    raise ImportError('progress_snapshot needs 4-byte C ints')
+
+class SnapshotError(ValueError):
+    """Not a snapshot, an unsupported version, or JSON that cannot be stored losslessly."""
+
+# ------------------------------ Encoding ------------------------------------- #
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def add(self, s: Optional[str]) -> int:
+        if s is None:
+            return NONE
+        sid = self.ids.get(s)
+        if sid is None:
+            sid = self.ids[s] = len(self.strings)
+            self.strings.append(s)
+        return sid
+
+    def sections(self) -> Tuple[bytes, bytes]:
+        blob = bytearray()
+        offsets = array('I', [0])
+        for s in self.strings:
+            blob += s.encode('utf-8')
+            offsets.append(len(blob))
+        return _pack(offsets), bytes(blob)
+
+def _pack(values: array) -> bytes:
+    if not _LITTLE:  # pragma: no cover - big-endian hosts
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _scaled(value: Any, scale: int, what: str) -> int:
+    """Fixed-point integer for a JSON number rounded to 1/scale (exact round-trip or SnapshotError)."""
+    n = int(round(value * scale))
+    if n / scale != value:
+        raise SnapshotError(f'{what}={value!r} is not a multiple of 1/{scale}')
+    return n
+
+def _topic_of(path: str) -> str:
+    """<root>/<Topic>/<N>/<file> -> Topic ('' when the path is shorter)."""
+    parts = path.replace('\\', '/').split('/')
+    return parts[-3] if len(parts) >= 3 else ''
+
+def encode(data: Dict[str, Any]) -> bytes:
+    """Snapshot bytes for a JSON summary as produced by build_json() (or read back from its file)."""
+    strings = _StringTable()
+    topics: List[Dict[str, Any]] = data.get('topics') or []
+    files: List[Dict[str, Any]] = data.get('files') or []
+    meta = {"keys": list(data), "values": {k: v for k, v in data.items() if k not in ('topics', 'files')}}
+
+    topic_cols = [array('i') for _ in TOPIC_COLUMNS]
+    topic_rows: Dict[str, int] = {}
+    for row, rec in enumerate(topics):
+        if tuple(rec) != TOPIC_COLUMNS:
+            raise SnapshotError(f'unsupported topic record keys: {list(rec)}')
+        for col, name in zip(topic_cols, TOPIC_COLUMNS):
+            value = rec[name]
+            if name in TOPIC_STRINGS:
+                col.append(strings.add(value))
+            elif name in TOPIC_PERCENTS:
+                col.append(_scaled(value, 100, f'{rec["topic"]}.{name}'))
+            else:
+                col.append(value)
+        topic_rows.setdefault(rec['topic'], row)
+
+    file_cols = [array('i') for _ in FILE_COLUMNS]
+    smoke_cols = [array('i') for _ in SMOKE_COLUMNS]
+    warn_offsets = array('I', [0])
+    warnings = array('i')
+    groups: List[List[int]] = [[] for _ in topics]
+    any_smoke = False
+    for row, rec in enumerate(files):
+        keys = tuple(rec)
+        if keys != FILE_KEYS and keys != FILE_KEYS + ('smoke',):
+            raise SnapshotError(f'unsupported file record keys: {list(rec)}')
+        file_cols[0].append(strings.add(rec['path']))
+        file_cols[1].append(strings.add(rec['status']))
+        file_cols[2].append(rec['meaningful_loc'])
+        warnings.extend(strings.add(w) for w in rec['warnings'])
+        warn_offsets.append(len(warnings))
+        smoke = rec.get('smoke')
+        if smoke is None:
+            for col in smoke_cols:
+                col.append(NONE)
+        else:
+            if tuple(smoke) != SMOKE_COLUMNS:
+                raise SnapshotError(f'unsupported smoke record keys: {list(smoke)}')
+            any_smoke = True
+            smoke_cols[0].append(int(bool(smoke['ok'])))
+            smoke_cols[1].append(_scaled(smoke['duration_s'], 10000, f'{rec["path"]}.smoke.duration_s'))
+            smoke_cols[2].append(NONE if smoke['peak_rss_kb'] is None else smoke['peak_rss_kb'])
+            smoke_cols[3].append(strings.add(smoke['error_type']))
+        topic_row = topic_rows.get(_topic_of(rec['path']))
+        if topic_row is not None:
+            groups[topic_row].append(row)
+
+    group_offsets = array('i', [0])
+    group_rows = array('i')
+    for rows in groups:
+        group_rows.extend(rows)
+        group_offsets.append(len(group_rows))
+    topic_order = array('i', sorted(range(len(topics)), key=lambda r: topics[r]['topic']))
+    file_order = array('i', sorted(range(len(files)), key=lambda r: files[r]['path']))
+
+    str_offsets, str_blob = strings.sections()
+    sections: List[Tuple[bytes, bytes]] = [
+        (b'META', json.dumps(meta, separators=(',', ':'), ensure_ascii=False).encode('utf-8')),
+        (b'STRO', str_offsets),
+        (b'STRB', str_blob),
+        (b'TOPC', b''.join(_pack(col) for col in topic_cols)),
+        (b'TIDX', _pack(topic_order)),
+        (b'TFOF', _pack(group_offsets)),
+        (b'TFIL', _pack(group_rows)),
+        (b'FILE', b''.join(_pack(col) for col in file_cols)),
+        (b'FIDX', _pack(file_order)),
+        (b'WOFF', _pack(warn_offsets)),
+        (b'WARN', _pack(warnings)),
+    ]
+    if any_smoke:
+        sections.append((b'SMOK', b''.join(_pack(col) for col in smoke_cols)))
+
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, 0, len(sections)))
+    offset = _align(len(out) + _ENTRY.size * len(sections))
+    placed = []
+    for tag, payload in sections:
+        placed.append((tag, offset, payload))
+        out += _ENTRY.pack(tag, offset, len(payload))
+        offset = _align(offset + len(payload))
+    for _, offset, payload in placed:
+        out += b'\0' * (offset - len(out))
+        out += payload
+    return bytes(out)
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+def write_snapshot(data: Dict[str, Any], path: str) -> None:
+    """Encode data and replace path atomically."""
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(encode(data))
+    os.replace(tmp, path)
+
+# ------------------------------ Reading -------------------------------------- #
+
+class Snapshot:
+    """Random-access reader over snapshot bytes (normally a read-only mmap, see Snapshot.open)."""
+
+    def __init__(self, buf: Union[bytes, bytearray, mmap.mmap], _file: Any = None):
+        self._buf = buf
+        self._file = _file
+        self._base = memoryview(buf)
+        self._views: List[memoryview] = [self._base]
+        if len(buf) < _HEADER.size:
+            raise SnapshotError('truncated snapshot header')
+        magic, version, _, count = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise SnapshotError('not a progress snapshot')
+        if version != VERSION:
+            raise SnapshotError(f'unsupported snapshot version {version} (expected {VERSION})')
+        self._sections: Dict[bytes, Tuple[int, int]] = {}
+        for i in range(count):
+            tag, offset, length = _ENTRY.unpack_from(buf, _HEADER.size + i * _ENTRY.size)
+            if offset + length > len(buf):
+                raise SnapshotError(f'section {tag!r} runs past the end of the snapshot')
+            self._sections[tag] = (offset, length)
+        self.meta: Dict[str, Any] = json.loads(str(self._raw(b'META'), 'utf-8'))
+        self._str_offsets = self._ints(b'STRO', 'I')
+        self._str_blob = self._raw(b'STRB')
+        self.topic_count = self._rows(b'TOPC', len(TOPIC_COLUMNS))
+        self.file_count = self._rows(b'FILE', len(FILE_COLUMNS))
+        self._topics = self._ints(b'TOPC')
+        self._files = self._ints(b'FILE')
+        self._topic_order = self._ints(b'TIDX')
+        self._file_order = self._ints(b'FIDX')
+        self._group_offsets = self._ints(b'TFOF')
+        self._group_rows = self._ints(b'TFIL')
+        self._warn_offsets = self._ints(b'WOFF', 'I')
+        self._warnings = self._ints(b'WARN')
+        self._smoke = self._ints(b'SMOK') if b'SMOK' in self._sections else None
+
+    @classmethod
+    def open(cls, path: str) -> 'Snapshot':
+        f = open(path, 'rb')
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            f.close()
+            raise SnapshotError(f'{path}: empty file') from None
+        except BaseException:
+            f.close()
+            raise
+        return cls(buf, _file=f)
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.file_count
+
+    # -- raw access --
+
+    def _raw(self, tag: bytes) -> memoryview:
+        if tag not in self._sections:
+            raise SnapshotError(f'missing section {tag.decode("ascii", "replace")}')
+        offset, length = self._sections[tag]
+        view = self._base[offset:offset + length]
+        self._views.append(view)
+        return view
+
+    def _ints(self, tag: bytes, typecode: str = 'i') -> Sequence[int]:
+        raw = self._raw(tag)
+        if len(raw) % 4:
+            raise SnapshotError(f'section {tag.decode("ascii", "replace")} is not a whole number of int32 values')
+        if _LITTLE:
+            view = raw.cast(typecode)  # zero-copy over the mapping
+            self._views.append(view)
+            return view
+        values = array(typecode, raw)  # pragma: no cover - big-endian hosts
+        values.byteswap()  # pragma: no cover
+        return values  # pragma: no cover
+
+    def _rows(self, tag: bytes, columns: int) -> int:
+        return self._sections[tag][1] // (4 * columns) if tag in self._sections else 0
+
+    def string(self, sid: int) -> Optional[str]:
+        if sid == NONE:
+            return None
+        return str(self._str_blob[self._str_offsets[sid]:self._str_offsets[sid + 1]], 'utf-8')
+
+    # -- top-level --
+
+    @property
+    def date(self) -> Optional[str]:
+        return self.meta["values"].get('date')
+
+    @property
+    def totals(self) -> Dict[str, Any]:
+        return self.meta["values"].get('totals', {})
+
+    @property
+    def status_breakdown(self) -> Dict[str, int]:
+        return self.meta["values"].get('status_breakdown', {})
+
+    # -- topics --
+
+    def topic_names(self) -> List[str]:
+        n = self.topic_count
+        return [self.string(self._topics[row]) for row in range(n)]  # type: ignore[misc]
+
+    def topic_record(self, row: int) -> Dict[str, Any]:
+        n = self.topic_count
+        rec: Dict[str, Any] = {}
+        for k, name in enumerate(TOPIC_COLUMNS):
+            value = self._topics[k * n + row]
+            if name in TOPIC_STRINGS:
+                rec[name] = self.string(value)
+            elif name in TOPIC_PERCENTS:
+                rec[name] = value / 100
+            else:
+                rec[name] = value
+        return rec
+
+    def topic(self, name: str) -> Optional[Dict[str, Any]]:
+        """The topic's JSON record, found by binary search (None if absent)."""
+        row = self._find(self._topic_order, self._topics, name)
+        return None if row is None else self.topic_record(row)
+
+    # -- files --
+
+    def file_record(self, row: int) -> Dict[str, Any]:
+        n = self.file_count
+        lo, hi = self._warn_offsets[row], self._warn_offsets[row + 1]
+        rec: Dict[str, Any] = {
+            "path": self.string(self._files[row]),
+            "status": self.string(self._files[n + row]),
+            "meaningful_loc": self._files[2 * n + row],
+            "warnings": [self.string(self._warnings[i]) for i in range(lo, hi)],
+        }
+        smoke = self._smoke
+        if smoke is not None and smoke[row] != NONE:
+            rss = smoke[2 * n + row]
+            rec["smoke"] = {
+                "ok": bool(smoke[row]),
+                "duration_s": smoke[n + row] / 10000,
+                "peak_rss_kb": None if rss == NONE else rss,
+                "error_type": self.string(smoke[3 * n + row]),
+            }
+        return rec
+
+    def file(self, path: str) -> Optional[Dict[str, Any]]:
+        """One file's JSON record by path, found by binary search (None if absent)."""
+        row = self._find(self._file_order, self._files, path)
+        return None if row is None else self.file_record(row)
+
+    def files(self, topic: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """File records in report order, optionally only those of one topic."""
+        if topic is None:
+            rows: Sequence[int] = range(self.file_count)
+        else:
+            trow = self._find(self._topic_order, self._topics, topic)
+            if trow is None:
+                return
+            rows = self._group_rows[self._group_offsets[trow]:self._group_offsets[trow + 1]]
+        for row in rows:
+            yield self.file_record(row)
+
+    def _find(self, order: Sequence[int], column: Sequence[int], key: str) -> Optional[int]:
+        """Row whose string id in column (the key column comes first) equals key."""
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = self.string(column[order[mid]])
+            if value < key:  # type: ignore[operator]
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(order) and self.string(column[order[lo]]) == key:
+            return order[lo]
+        return None
+
+    # -- conversion --
+
+    def to_json(self) -> Dict[str, Any]:
+        """The JSON summary this snapshot was encoded from (same keys, order and values)."""
+        values = self.meta["values"]
+        data: Dict[str, Any] = {}
+        for key in self.meta["keys"]:
+            if key == 'topics':
+                data[key] = [self.topic_record(row) for row in range(self.topic_count)]
+            elif key == 'files':
+                data[key] = list(self.files())
+            else:
+                data[key] = values[key]
+        return data
+
+def snapshot_path(json_path: str) -> str:
+    """progress/progressDD_MM_YYYY.json -> progress/progressDD_MM_YYYY.snap"""
+    return os.path.splitext(json_path)[0] + SNAPSHOT_SUFFIX
+
+def json_to_snapshot(json_path: str, out_path: Optional[str] = None) -> str:
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    out_path = out_path or snapshot_path(json_path)
+    write_snapshot(data, out_path)
+    return out_path
+
+def snapshot_to_json(snap_path: str, out_path: Optional[str] = None) -> str:
+    """Write the JSON summary back in the report's own format (indent=2), byte-identical to the original."""
+    with Snapshot.open(snap_path) as snap:
+        data = snap.to_json()
+    out_path = out_path or os.path.splitext(snap_path)[0] + '.json'
+    tmp = f'{out_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+    os.replace(tmp, out_path)
+    return out_path
+
+# ------------------------------ CLI ------------------------------------------ #
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Convert progress JSON summaries to compact snapshots and back, or query a snapshot.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_from = sub.add_parser('from-json', help='JSON summary -> snapshot (default: same name with .snap)')
+    p_from.add_argument('paths', nargs='+', help='JSON summaries to convert')
+    p_from.add_argument('-o', '--output', default=None, help='Output path (only with a single input)')
+    p_to = sub.add_parser('to-json', help='Snapshot -> JSON summary, identical to the original report')
+    p_to.add_argument('paths', nargs='+', help='Snapshots to convert')
+    p_to.add_argument('-o', '--output', default=None, help="Output path (only with a single input; '-' prints it)")
+    p_show = sub.add_parser('show', help='Print totals, one topic or one file from a snapshot without decoding the rest')
+    p_show.add_argument('path', help='Snapshot to read')
+    p_show.add_argument('--topic', default=None, help='Print this topic and its file records')
+    p_show.add_argument('--file', default=None, help='Print the record of this file path')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'show':
+            with Snapshot.open(args.path) as snap:
+                if args.file:
+                    result: Any = snap.file(args.file)
+                elif args.topic:
+                    result = snap.topic(args.topic)
+                    if result is not None:
+                        result = dict(result, files=list(snap.files(args.topic)))
+                else:
+                    result = {"date": snap.date, "totals": snap.totals, "status_breakdown": snap.status_breakdown,
+                              "topics": snap.topic_count, "files": snap.file_count}
+            if result is None:
+                print(f'[error] Not in {args.path}: {args.file or args.topic}', file=sys.stderr)
+                return 1
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+            return 0
+        if args.output and len(args.paths) > 1:
+            parser.error('--output needs a single input')
+        for path in args.paths:
+            if args.command == 'from-json':
+                out = json_to_snapshot(path, args.output)
+                print(f'[written] {out} ({os.path.getsize(out)} bytes, JSON {os.path.getsize(path)} bytes)')
+            elif args.output == '-':
+                with Snapshot.open(path) as snap:
+                    print(json.dumps(snap.to_json(), indent=2, ensure_ascii=False))
+            else:
+                print(f'[written] {snapshot_to_json(path, args.output)}')
+    except (OSError, SnapshotError, ValueError) as e:
+        print(f'[error] {e}', file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+"""Append-only store of resolved practices (when each `<Topic>/<N>` was first seen resolved).
+
+The record of truth is `resolved_history.jsonl`, a git-tracked text log with
+one {"id", "first_seen"} object per line, so the history travels with the
+repository and concurrent branches merge by concatenation. A run only appends
+the items it adds; nothing is rewritten.
+
+Lookups, reports and range queries go through a local SQLite index
+(`resolved_history.sqlite3`, gitignored) built from the log. The index records
+the log's size and mtime after each update it makes itself; when the log was
+changed any other way (fresh clone, pull, checkout, merge) the index is
+rebuilt from it on open.
+
+Dates keep the report format (DD-MM-YYYY, used verbatim in the Markdown
+artifacts) next to an ISO copy (YYYY-MM-DD) used for range and velocity
+queries. A legacy `resolved_history.json` ({id: "DD-MM-YYYY"}) is folded into
+the log once and removed.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+HISTORY_LOG_PATH = os.path.join('.progress_state', 'resolved_history.jsonl')
+HISTORY_DB_PATH = os.path.join('.progress_state', 'resolved_history.sqlite3')
+LEGACY_HISTORY_PATH = os.path.join('.progress_state', 'resolved_history.json')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resolved (
+    id         TEXT PRIMARY KEY,  -- "<Topic>/<N>"
+    topic      TEXT NOT NULL,
+    slot       INTEGER NOT NULL,
+    first_seen TEXT NOT NULL,     -- DD-MM-YYYY as shown in reports
+    seen_iso   TEXT NOT NULL      -- YYYY-MM-DD for range queries
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resolved_report_order ON resolved (first_seen, id);
+CREATE INDEX IF NOT EXISTS resolved_by_date ON resolved (seen_iso, topic);
+CREATE TABLE IF NOT EXISTS log_state (
+    key   TEXT PRIMARY KEY,       -- 'size' | 'mtime_ns' of the log the index was built from
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+def to_iso(date_str: str) -> str:
+    """DD-MM-YYYY -> YYYY-MM-DD (unparseable values are kept as-is)."""
+    try:
+        return _dt.datetime.strptime(date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
+    except ValueError:
+        return date_str
+
+def split_id(ident: str) -> Tuple[str, int]:
+    topic, _, slot = ident.rpartition('/')
+    return topic, int(slot) if slot.isdigit() else 0
+
+def format_entry(ident: str, date_str: str) -> str:
+    return json.dumps({"id": ident, "first_seen": date_str}) + '\n'
+
+class ResolvedHistory:
+    """Indexed first-seen log of resolved practices."""
+
+    def __init__(self, path: str = HISTORY_LOG_PATH, db_path: str = HISTORY_DB_PATH):
+        self.path = path
+        self.db_path = db_path
+        for directory in {os.path.dirname(path), os.path.dirname(db_path)}:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+        self._sync()
+
+    def __enter__(self) -> 'ResolvedHistory':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM resolved').fetchone()[0]
+
+    # -- log <-> index -----------------------------------------------------------
+
+    def _log_stamp(self) -> Tuple[int, int]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return 0, 0
+        return st.st_size, st.st_mtime_ns
+
+    def _indexed_stamp(self) -> Tuple[int, int]:
+        state = dict(self.conn.execute('SELECT key, value FROM log_state'))
+        return int(state.get('size', 0)), int(state.get('mtime_ns', 0))
+
+    def _sync(self) -> None:
+        """Rebuild the index when the log changed outside this class (clone, pull, checkout, merge, hand edit)."""
+        if self._log_stamp() == self._indexed_stamp():
+            return
+        entries: List[Tuple[str, str]] = []
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as lf:
+                for line in lf:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries.append((entry['id'], entry['first_seen']))
+        with self.conn:
+            self.conn.execute('DELETE FROM resolved')
+            self._insert(entries)
+
+    def _append(self, items: List[Tuple[str, str]]) -> None:
+        """Append entries to the log and index them (the index stays valid only if it matched the log before)."""
+        in_sync = self._log_stamp() == self._indexed_stamp()
+        with open(self.path, 'ab+') as lf:
+            if lf.seek(0, os.SEEK_END):
+                lf.seek(-1, os.SEEK_END)
+                if lf.read(1) != b'\n':  # hand-edited log without a trailing newline
+                    lf.write(b'\n')
+            lf.write(''.join(format_entry(ident, date_str) for ident, date_str in items).encode('utf-8'))
+        if in_sync:
+            with self.conn:
+                self._insert(items)
+        else:
+            self._sync()
+
+    def _insert(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Index entries (first occurrence of an id wins) and stamp the index with the log's current size/mtime."""
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO resolved (id, topic, slot, first_seen, seen_iso) VALUES (?, ?, ?, ?, ?)',
+            ((ident, *split_id(ident), date_str, to_iso(date_str)) for ident, date_str in items),
+        )
+        size, mtime_ns = self._log_stamp()
+        self.conn.executemany('INSERT OR REPLACE INTO log_state (key, value) VALUES (?, ?)',
+                              (('size', str(size)), ('mtime_ns', str(mtime_ns))))
+
+    # -- updates -------------------------------------------------------------------
+
+    def migrate_json(self, legacy_path: str = LEGACY_HISTORY_PATH) -> Optional[int]:
+        """Fold a legacy JSON history into the log once and remove it; returns the entries added (None if absent)."""
+        if not os.path.exists(legacy_path):
+            return None
+        with open(legacy_path, 'r', encoding='utf-8') as hf:
+            data: Dict[str, str] = json.load(hf)
+        new_items = self.unseen(data)
+        if new_items:
+            self._append([(ident, data[ident]) for ident in new_items])
+        os.remove(legacy_path)
+        return len(new_items)
+
+    def unseen(self, idents: Iterable[str]) -> List[str]:
+        """The given identifiers that are not in the history yet, sorted (one set-difference query)."""
+        with self.conn:
+            self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS candidate (id TEXT PRIMARY KEY) WITHOUT ROWID')
+            self.conn.execute('DELETE FROM candidate')
+            self.conn.executemany('INSERT OR IGNORE INTO candidate (id) VALUES (?)', ((ident,) for ident in idents))
+        return [row[0] for row in self.conn.execute('SELECT id FROM candidate EXCEPT SELECT id FROM resolved ORDER BY id')]
+
+    def record(self, idents: Iterable[str], date_str: str) -> List[str]:
+        """Append identifiers not seen before with first_seen=date_str; returns the new ones (sorted)."""
+        new_items = self.unseen(idents)
+        if new_items:
+            self._append([(ident, date_str) for ident in new_items])
+        return new_items
+
+    # -- queries -------------------------------------------------------------------
+
+    def iter_report_order(self) -> Iterator[Tuple[str, str]]:
+        """(id, first_seen) ordered like completed_all.md: by first_seen text, then id."""
+        yield from self.conn.execute('SELECT id, first_seen FROM resolved ORDER BY first_seen, id')
+
+    def between(self, start: str, end: str) -> List[Tuple[str, str]]:
+        """(id, first_seen) first seen within [start, end] (DD-MM-YYYY, inclusive), chronologically."""
+        return self.conn.execute(
+            'SELECT id, first_seen FROM resolved WHERE seen_iso BETWEEN ? AND ? ORDER BY seen_iso, id',
+            (to_iso(start), to_iso(end)),
+        ).fetchall()
+
+    def velocity(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, object]]:
+        """Per-topic resolved counts and items/week over each topic's active span (optionally date-bounded)."""
+        rows = self.conn.execute(
+            'SELECT topic, COUNT(*), MIN(seen_iso), MAX(seen_iso) FROM resolved '
+            'WHERE seen_iso BETWEEN ? AND ? GROUP BY topic ORDER BY topic',
+            (to_iso(start) if start else '', to_iso(end) if end else '9999-12-31'),
+        ).fetchall()
+        result: List[Dict[str, object]] = []
+        for topic, count, first, last in rows:
+            try:
+                days = (_dt.date.fromisoformat(last) - _dt.date.fromisoformat(first)).days + 1
+            except ValueError:
+                days = 7
+            result.append({
+                "topic": topic,
+                "resolved": count,
+                "first": first,
+                "last": last,
+                "per_week": round(count / max(days / 7, 1), 2),
+            })
+        return result
@@ -16,6 +16,9 @@ Safety:
 Caveats:
   - If additional manual edits occurred after forward migration, perfect reversal cannot be guaranteed.
   - JSON historical field practices_per_topic is left as-is; we only restore tests_per_topic label usage for backward compatibility.
+
+Replacement tables are compiled into single alternations (text_rewriter.MultiRewriter) and files are
+rewritten in parallel with --jobs.
 """
 from __future__ import annotations
 
@@ -25,6 +28,8 @@ import argparse
 import shutil
 from typing import List
 
+from text_rewriter import MultiRewriter, map_files, read_text, write_text
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
 PRACTICE_WORD_REPLACEMENTS = [
@@ -42,6 +47,9 @@ PATH_REPLACEMENTS = [
     (re.compile(r'tests/'), 'tests/'),
 ]
 
+WORD_REWRITER = MultiRewriter(PRACTICE_WORD_REPLACEMENTS)
+PATH_REWRITER = MultiRewriter(PATH_REPLACEMENTS)
+
 TEXT_FILE_EXTS = {'.md', '.py', '.txt', '.json', '.yml', '.yaml', '.csv'}
 
 def is_text(path: str) -> bool:
@@ -80,76 +88,56 @@ def rename_files(dry_run: bool, report: List[str]):
             if not dry_run:
                 os.replace(path, new_path)
 
-def update_content(dry_run: bool, report: List[str]):
+def rewrite_practice_text(original: str) -> str:
+    # Skip any line containing 'Test Cases' so we don't corrupt structure
+    updated = WORD_REWRITER.rewrite_lines(original, skip='Test Cases')
+    return PATH_REWRITER.sub(updated)
+
+def _rewrite(path: str, transform, dry_run: bool) -> bool:
+    original = read_text(path)
+    if original is None:
+        return False
+    updated = transform(original)
+    if updated == original:
+        return False
+    if not dry_run:
+        write_text(path, updated)
+    return True
+
+# Module-level workers (picklable for the process pool)
+def _content_dry(path: str) -> bool:
+    return _rewrite(path, rewrite_practice_text, True)
+
+def _content_apply(path: str) -> bool:
+    return _rewrite(path, rewrite_practice_text, False)
+
+def _paths_dry(path: str) -> bool:
+    return _rewrite(path, PATH_REWRITER.sub, True)
+
+def _paths_apply(path: str) -> bool:
+    return _rewrite(path, PATH_REWRITER.sub, False)
+
+def update_content(dry_run: bool, report: List[str], jobs: int = 1):
     # After root rename, operate under tests/
-    for path in walk(os.path.join(ROOT, 'tests')):
-        if not is_text(path):
-            continue
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                original = f.read()
-        except Exception:
-            continue
-        updated = original
-        changed = False
-        for rx, repl in PRACTICE_WORD_REPLACEMENTS:
-            # Skip any line containing 'Test Cases' so we don't corrupt structure
-            new_lines = []
-            local_change = False
-            for ln in updated.splitlines():
-                if 'Test Cases' in ln:
-                    new_lines.append(ln)
-                    continue
-                new_ln = rx.sub(repl, ln)
-                if new_ln != ln:
-                    local_change = True
-                new_lines.append(new_ln)
-            if local_change:
-                updated = '\n'.join(new_lines)
-                changed = True
-        for rx, repl in PATH_REPLACEMENTS:
-            new_updated = rx.sub(repl, updated)
-            if new_updated != updated:
-                updated = new_updated
-                changed = True
-        if changed and updated != original:
-            report.append(f'UPDATE content {path}')
-            if not dry_run:
-                with open(path, 'w', encoding='utf-8') as f:
-                    f.write(updated)
+    paths = [p for p in walk(os.path.join(ROOT, 'tests')) if is_text(p)]
+    changed = map_files(_content_dry if dry_run else _content_apply, paths, jobs=jobs)
+    report.extend(f'UPDATE content {path}' for path, did_change in zip(paths, changed) if did_change)
     # Also handle docs & scripts outside tests
     for extra in ['doc', 'scripts']:
-        base = os.path.join(ROOT, extra)
-        for path in walk(base):
-            if not is_text(path):
-                continue
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    orig = f.read()
-            except Exception:
-                continue
-            upd = orig
-            changed_any = False
-            for rx, repl in PATH_REPLACEMENTS:
-                n = rx.sub(repl, upd)
-                if n != upd:
-                    upd = n
-                    changed_any = True
-            if changed_any and upd != orig:
-                report.append(f'UPDATE path refs {path}')
-                if not dry_run:
-                    with open(path, 'w', encoding='utf-8') as f:
-                        f.write(upd)
+        paths = [p for p in walk(os.path.join(ROOT, extra)) if is_text(p)]
+        changed = map_files(_paths_dry if dry_run else _paths_apply, paths, jobs=jobs)
+        report.extend(f'UPDATE path refs {path}' for path, did_change in zip(paths, changed) if did_change)
 
 def main():
     p = argparse.ArgumentParser(description='Rollback practices->tests migration.')
     p.add_argument('--dry-run', action='store_true', help='Preview actions only')
+    p.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Processes used to rewrite file contents (default: CPU count)')
     args = p.parse_args()
 
     report: List[str] = []
     rename_root(args.dry_run, report)
     rename_files(args.dry_run, report)
-    update_content(args.dry_run, report)
+    update_content(args.dry_run, report, jobs=args.jobs)
 
     print('\nRollback Plan:' if args.dry_run else '\nRollback Actions:')
     for r in report:
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Single-pass multi-pattern text rewriting for the migrate/rollback scripts.
+
+An ordered table of (regex, replacement) rules is compiled into one
+alternation with one capturing group per rule plus a dispatch table from
+group number to replacement, so a line is scanned once instead of once per
+rule. At any position the first rule in table order that matches wins, which
+is how the ordered tables are written (longer phrases before the bare words
+they start with). The one difference from applying the rules
+one after another is that text produced by a replacement is never rescanned.
+Replacements are literal strings or callables taking the match. When every
+rule starts with a literal character (after \b/^), the alternation is
+guarded by a lookahead on those characters: Python's regex engine cannot
+skip ahead through an alternation of \b-prefixed branches by itself, and
+the guard makes the scan several times faster.
+
+Line rewriting keeps line endings intact and can skip lines containing a
+protected phrase ('Test Cases'). map_files() runs a per-file worker over a
+process pool so large trees use every core.
+"""
+from __future__ import annotations
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Pattern, Sequence, Tuple, TypeVar, Union
+
+Replacement = Union[str, Callable[['re.Match[str]'], str]]
+Rule = Tuple[Union[str, Pattern[str]], Replacement]
+T = TypeVar('T')
+
+PARALLEL_MIN_FILES = 64  # below this a process pool costs more than it saves
+
+_INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+
+_ZERO_WIDTH_PREFIXES = ('\\b', '\\A', '^')
+_META = set('\\.[](){}*+?|^$')
+
+def _first_chars(rx: Pattern[str]) -> Optional[str]:
+    """The literal first character of a rule (None when it cannot be read off the pattern)."""
+    if rx.flags & re.VERBOSE:
+        return None
+    p = rx.pattern
+    stripped = True
+    while stripped:
+        stripped = False
+        for prefix in _ZERO_WIDTH_PREFIXES:
+            if p.startswith(prefix):
+                p, stripped = p[len(prefix):], True
+    if not p or p[0] in _META or p[1:2] in ('*', '?', '{'):
+        return None
+    return p[0]
+
+def _guard(rules: Sequence[Tuple[Pattern[str], Replacement]]) -> str:
+    """Lookahead on the possible first characters of any rule ('' if some rule has no literal start)."""
+    exact: List[str] = []
+    folded: List[str] = []
+    for rx, _ in rules:
+        ch = _first_chars(rx)
+        if ch is None:
+            return ''
+        (folded if rx.flags & re.IGNORECASE else exact).append(ch)
+    classes = []
+    if exact:
+        classes.append('[' + ''.join(re.escape(c) for c in sorted(set(exact))) + ']')
+    if folded:
+        classes.append('(?i:[' + ''.join(re.escape(c) for c in sorted(set(folded))) + '])')
+    return '(?=' + '|'.join(classes) + ')'
+
+def _scoped(rx: Pattern[str]) -> str:
+    """The rule's pattern with its compile flags turned into a scoped inline group."""
+    flags = ''.join(letter for flag, letter in _INLINE_FLAGS if rx.flags & flag)
+    return f'(?{flags}:{rx.pattern})' if flags else f'(?:{rx.pattern})'
+
+class MultiRewriter:
+    """Ordered rule table compiled into one alternation plus a group -> replacement dispatch table."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = [(re.compile(rx) if isinstance(rx, str) else rx, repl) for rx, repl in rules]
+        parts: List[str] = []
+        self.dispatch: Dict[int, Replacement] = {}
+        group = 1
+        for rx, repl in self.rules:
+            parts.append(f'({_scoped(rx)})')
+            self.dispatch[group] = repl
+            group += 1 + rx.groups  # the rule's own groups are numbered inside ours
+        self.pattern: Optional[Pattern[str]] = re.compile(_guard(self.rules) + '(?:' + '|'.join(parts) + ')') if parts else None
+
+    def _replace(self, m: 're.Match[str]') -> str:
+        repl = self.dispatch[m.lastindex]  # the outer group closes last, so lastindex is the rule's group
+        return repl if isinstance(repl, str) else repl(m)
+
+    def sub(self, text: str) -> str:
+        return self.pattern.sub(self._replace, text) if self.pattern is not None else text
+
+    def rewrite_lines(self, text: str, skip: Optional[str] = None,
+                      before: Optional[Callable[[str], str]] = None) -> str:
+        """Apply the table line by line (line endings kept).
+
+        before runs first on every line (e.g. heading rules); lines that then
+        contain skip are left as they are.
+        """
+        if self.pattern is None and before is None:
+            return text
+        out: List[str] = []
+        for line in text.splitlines(keepends=True):
+            if before is not None:
+                line = before(line)
+            if skip is None or skip not in line:
+                line = self.sub(line)
+            out.append(line)
+        return ''.join(out)
+
+def read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def write_text(path: str, content: str) -> None:
+    """Replace path atomically (temp file in the same directory + os.replace)."""
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+def map_files(worker: Callable[[str], T], paths: List[str], jobs: int = 1) -> List[T]:
+    """worker(path) for every path, in order; uses a process pool when jobs > 1 and the batch is large.
+
+    worker must be a module-level function so it can be sent to pool processes.
+    """
+    if jobs <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        return [worker(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(worker, paths, chunksize=max(1, len(paths) // (jobs * 8))))